@@ -0,0 +1,108 @@
+"""
+Measures the latency ``DeleteMessageManager.add_message`` adds to every ``ctx.send``.
+
+Run from the repository root against a Redis server:
+
+    python -m benchmarks.delete_messages [redis url]
+
+or against fakeredis served over local TCP, so every command still pays a real round trip:
+
+    python -m benchmarks.delete_messages --fake
+"""
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import threading
+import time
+
+import redis.asyncio as aioredis
+
+from core.cache_manager import DeleteMessageManager
+
+SENDS = 2000
+CONCURRENCY = 50
+
+
+async def legacy(redis: aioredis.Redis, message_id: int, reply_id: int) -> None:
+    key = f'bench_delete_messages:{message_id}'
+
+    await redis.lpush(key, reply_id)
+    await redis.expire(key, 86400)
+
+
+async def pipelined(redis: aioredis.Redis, message_id: int, reply_id: int) -> None:
+    key = f'bench_delete_messages:{message_id}'
+
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.lpush(key, reply_id)
+        pipe.expire(key, 86400)
+
+        await pipe.execute()
+
+
+async def measure(add, flush) -> tuple[float, float, float]:
+    timings: list[float] = []
+    start = time.perf_counter()
+
+    async def worker(offset: int) -> None:
+        for i in range(offset, SENDS, CONCURRENCY):
+            start = time.perf_counter()
+            await add(i % 500, i)
+            timings.append((time.perf_counter() - start) * 1e3)
+
+    await asyncio.gather(*(worker(i) for i in range(CONCURRENCY)))
+    # Until every write has reached Redis, not only until every send returned.
+    await flush()
+    total = (time.perf_counter() - start) * 1e3
+    timings.sort()
+
+    return statistics.median(timings), timings[int(len(timings) * 0.99)], total
+
+
+def start_fake_server() -> str:
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(('127.0.0.1', 0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    host, port = server.server_address[:2]
+
+    return f'redis://{host}:{port}'
+
+
+async def main() -> None:
+    url = sys.argv[1] if len(sys.argv) > 1 else 'redis://localhost'
+
+    if url == '--fake':
+        url = start_fake_server()
+
+    redis = aioredis.from_url(url, decode_responses=True)
+    manager = DeleteMessageManager(redis)
+
+    strategies = {
+        'LPUSH + EXPIRE': lambda m, r: legacy(redis, m, r),
+        'pipelined': lambda m, r: pipelined(redis, m, r),
+        'buffered': manager.add_message,
+    }
+
+    print(f'{SENDS} sends, {CONCURRENCY} at a time\n')
+    print(f'{"strategy":<16}{"p50":>10}{"p99":>10}{"total":>12}')
+
+    for name, add in strategies.items():
+        p50, p99, total = await measure(add, manager.flush)
+
+        print(f'{name:<16}{p50:>8.3f}ms{p99:>8.3f}ms{total:>10.1f}ms')
+
+    await manager.close()
+
+    # Message IDs below 500 are never real snowflakes, so only benchmark keys are removed.
+    for prefix in ('bench_delete_messages', 'delete_messages'):
+        await redis.delete(*(f'{prefix}:{i}' for i in range(500)))
+
+    await redis.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+Measures how many gateway events per second ``Listeners.on_socket_event_type`` can count,
+comparing the old lock-and-append listener against the ``Counter`` one.
+
+Run from the repository root:
+
+    python -m benchmarks.event_counter
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import Counter
+
+# Roughly the mix a chunked bot sees.
+EVENT_TYPES = (
+    ('PRESENCE_UPDATE', 60),
+    ('GUILD_MEMBERS_CHUNK', 5),
+    ('MESSAGE_CREATE', 15),
+    ('TYPING_START', 10),
+    ('MESSAGE_UPDATE', 4),
+    ('GUILD_MEMBER_UPDATE', 3),
+    ('VOICE_STATE_UPDATE', 2),
+    ('MESSAGE_REACTION_ADD', 1),
+)
+EVENTS = 500_000
+
+
+class LockedList:
+    def __init__(self) -> None:
+        self._events_lock = asyncio.Lock()
+        self._events_to_send: list[str] = []
+
+    async def on_socket_event_type(self, event: str) -> None:
+        async with self._events_lock:
+            self._events_to_send.append(event)
+
+    def commands_per_flush(self) -> int:
+        return len(self._events_to_send)
+
+
+class Counted:
+    def __init__(self) -> None:
+        self._event_counts: Counter[str] = Counter()
+
+    async def on_socket_event_type(self, event: str) -> None:
+        self._event_counts[event] += 1
+
+    def commands_per_flush(self) -> int:
+        return len(self._event_counts)
+
+
+async def run(listener: LockedList | Counted, events: list[str]) -> float:
+    start = time.perf_counter()
+
+    for event in events:
+        await listener.on_socket_event_type(event)
+
+    return len(events) / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    names, weights = zip(*EVENT_TYPES)
+    events = random.choices(names, weights, k=EVENTS)
+
+    print(f'{"listener":<12}{"events/sec":>16}{"HINCRBYs per flush":>22}')
+
+    for listener in (LockedList(), Counted()):
+        rate = await run(listener, events)
+
+        print(f'{type(listener).__name__:<12}{rate:>16,.0f}{listener.commands_per_flush():>22,}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+"""
+Measures what ``BoboBot.get_context`` costs per message with the old hardcoded prefix,
+with per-guild prefixes from ``PrefixManager`` and with a prefix lookup that awaits once,
+the least any Redis or Postgres lookup would cost.
+
+Needs discord.py but no connection. Run from the repository root:
+
+    python -m benchmarks.prefixes [guilds]
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import time
+from typing import Any, Callable
+
+import discord
+from discord.ext import commands
+
+from core.bot import BoboBot
+from core.constants import BETA_ID
+from core.prefixes import PrefixManager
+
+GUILDS = 100_000
+MESSAGES = 50_000
+# Most messages are not commands at all.
+COMMAND_RATIO = 0.1
+
+
+def hardcoded(bot: Any, message: discord.Message) -> str:
+    if not bot.user or bot.user.id == BETA_ID:
+        return 'bobo '
+
+    return 'bobob '
+
+
+async def awaited(bot: Any, message: discord.Message) -> str | tuple[str, ...]:
+    await asyncio.sleep(0)
+
+    return BoboBot._get_prefix(bot, message)
+
+
+def make_bot(command_prefix: Callable[..., Any], prefixes: PrefixManager) -> commands.Bot:
+    bot: Any = commands.Bot(command_prefix=command_prefix, intents=discord.Intents.none())
+    bot.prefixes = prefixes
+    bot.default_prefix = lambda: 'bobo '
+
+    state = bot._connection
+    state.user = discord.ClientUser(
+        state=state,
+        data={'id': BETA_ID, 'username': 'Bobo', 'discriminator': '0', 'avatar': None},
+    )
+
+    @bot.command()
+    async def ping(ctx: commands.Context[Any]) -> None:
+        ...
+
+    return bot
+
+
+def make_messages(bot: commands.Bot, guilds: int) -> list[discord.Message]:
+    state = bot._connection
+    channels = []
+
+    # A few guilds with their own prefixes and a few using the default.
+    for guild_id in (1, 2, guilds + 1, guilds + 2):
+        guild = discord.Guild(data={'id': guild_id, 'name': 'Guild'}, state=state)
+        channels.append(
+            discord.TextChannel(
+                state=state,
+                guild=guild,
+                data={'id': guild_id, 'name': 'general', 'type': 0, 'position': 0},
+            )
+        )
+
+    messages = []
+
+    for message_id in range(MESSAGES):
+        channel = random.choice(channels)
+        custom = channel.guild.id <= guilds
+
+        if random.random() < COMMAND_RATIO:
+            content = ('b!' if custom else 'bobo ') + 'ping'
+        else:
+            content = 'just chatting about something'
+
+        messages.append(
+            discord.Message(
+                state=state,
+                channel=channel,
+                data={
+                    'id': message_id,
+                    'channel_id': channel.id,
+                    'author': {'id': 1, 'username': 'User', 'discriminator': '0', 'avatar': None},
+                    'content': content,
+                    'timestamp': '2024-01-01T00:00:00+00:00',
+                    'edited_timestamp': None,
+                    'tts': False,
+                    'mention_everyone': False,
+                    'mentions': [],
+                    'mention_roles': [],
+                    'attachments': [],
+                    'embeds': [],
+                    'pinned': False,
+                    'type': 0,
+                },
+            )
+        )
+
+    return messages
+
+
+async def run(bot: commands.Bot, messages: list[discord.Message]) -> tuple[float, int]:
+    valid = 0
+    start = time.perf_counter()
+
+    for message in messages:
+        ctx = await bot.get_context(message)
+        valid += ctx.valid
+
+    return (time.perf_counter() - start) / len(messages) * 1_000_000, valid
+
+
+async def main() -> None:
+    guilds = int(sys.argv[1]) if len(sys.argv) > 1 else GUILDS
+
+    prefixes = PrefixManager(None, None)  # type: ignore
+
+    for guild_id in range(1, guilds + 1):
+        prefixes._set(guild_id, ('b!', 'bobo '))
+
+    print(f'{guilds:,} guilds with custom prefixes, {MESSAGES:,} messages\n')
+    print(f'{"resolver":<16}{"us/message":>12}{"commands":>10}')
+
+    for name, command_prefix in (
+        ('hardcoded', hardcoded),
+        ('prefix table', BoboBot._get_prefix),
+        ('awaited lookup', awaited),
+    ):
+        random.seed(0)
+
+        bot = make_bot(command_prefix, prefixes)
+        messages = make_messages(bot, guilds)
+
+        per_message, valid = await run(bot, messages)
+
+        print(f'{name:<16}{per_message:>12.2f}{valid:>10,}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
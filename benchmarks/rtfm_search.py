@@ -0,0 +1,80 @@
+"""
+Compares ``core.utils.finder`` against ``core.search.SearchIndex`` on a real Sphinx inventory.
+
+Run from the repository root:
+
+    python -m benchmarks.rtfm_search [inventory base url]
+"""
+from __future__ import annotations
+
+import sys
+import time
+import urllib.request
+
+from core.search import SearchIndex
+from core.sphinx import SphinxInventoryParser
+from core.utils import finder
+
+QUERIES = (
+    'str',
+    'asyncio.gather',
+    'os.path.join',
+    'dict',
+    'label:tut',
+    're.sub',
+    'collections.abc',
+    'zzzz',
+)
+ROUNDS = 50
+
+
+def timeit(func, *args) -> float:
+    start = time.perf_counter()
+
+    for _ in range(ROUNDS):
+        func(*args)
+
+    return (time.perf_counter() - start) / ROUNDS * 1e3
+
+
+def main() -> None:
+    url = sys.argv[1] if len(sys.argv) > 1 else 'https://docs.python.org/3/'
+
+    parser = SphinxInventoryParser(url)
+
+    with urllib.request.urlopen(url + 'objects.inv') as resp:
+        inventory = dict(parser.feed(resp.read()))
+
+    inventory.update(parser.close())
+
+    items = list(inventory.items())
+
+    start = time.perf_counter()
+    index = SearchIndex.from_dict(inventory)
+    print(f'{len(items)} entries, index built in {(time.perf_counter() - start) * 1e3:.2f}ms\n')
+
+    print(f'{"query":<20}{"finder":>12}{"index (cold)":>16}{"index (warm)":>16}{"prefix":>12}')
+
+    for query in QUERIES:
+        expected = finder(query, items, key=lambda x: x[0], lazy=False)
+        assert index.search(query) == expected, query
+
+        finder_ms = timeit(
+            lambda: finder(query, items, key=lambda x: x[0], lazy=False)
+        )
+
+        cold = SearchIndex.from_dict(inventory)
+        start = time.perf_counter()
+        cold.search(query)
+        cold_ms = (time.perf_counter() - start) * 1e3
+
+        warm_ms = timeit(index.search, query)
+        prefix_ms = timeit(index.prefix, query)
+
+        print(
+            f'{query:<20}{finder_ms:>10.3f}ms{cold_ms:>14.3f}ms{warm_ms:>14.3f}ms{prefix_ms:>10.3f}ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Compares peak memory and wall time of the previous whole-file ``objects.inv`` parser
+against ``core.sphinx.SphinxInventoryParser``.
+
+Run from the repository root:
+
+    python -m benchmarks.sphinx_inventory
+"""
+from __future__ import annotations
+
+import os
+import time
+import tracemalloc
+import urllib.request
+import zlib
+from typing import Callable
+
+from core.constants import Regexs
+from core.sphinx import SphinxInventoryParser
+
+INVENTORIES = (
+    'https://docs.python.org/3/',
+    'https://discordpy.readthedocs.io/en/latest/',
+    'https://magicstack.github.io/asyncpg/current/',
+)
+CHUNK_SIZE = 16 * 1024
+
+
+def legacy_parse(raw: bytes, base_url: str) -> dict[str, str]:
+    # The previous implementation: decompress everything, join, then split.
+    data = {}
+    _, _, _, _, compressed = raw.split(b'\n', 4)
+    decompressor = zlib.decompressobj()
+
+    text = ''.join(
+        decompressor.decompress(compressed[i : i + CHUNK_SIZE]).decode('utf-8')
+        for i in range(0, len(compressed), CHUNK_SIZE)
+    )
+
+    for line in text.split('\n'):
+        match = Regexs.SPHINX_ENTRY_REGEX.match(line)
+
+        if not match:
+            continue
+
+        name, directive, _, location, display = match.groups()
+        domain, _, subdirective = directive.partition(':')
+
+        if directive == 'std:doc':
+            subdirective = 'label'
+
+        if location.endswith('$'):
+            location = location[:-1] + name
+
+        key = name if display == '-' else display
+        prefix = f'{subdirective}:' if domain == 'std' else ''
+
+        data[f'{prefix}{key}'] = os.path.join(base_url, location)
+
+    return data
+
+
+def streaming_parse(raw: bytes, base_url: str) -> dict[str, str]:
+    parser = SphinxInventoryParser(base_url)
+    data = {}
+
+    for i in range(0, len(raw), CHUNK_SIZE):
+        data.update(parser.feed(raw[i : i + CHUNK_SIZE]))
+
+    data.update(parser.close())
+
+    return data
+
+
+def measure(
+    func: Callable[[bytes, str], dict[str, str]], raw: bytes, url: str
+) -> tuple[dict[str, str], float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    result = func(raw, url)
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, elapsed * 1e3, peak / 1024 / 1024
+
+
+def main() -> None:
+    for url in INVENTORIES:
+        with urllib.request.urlopen(url + 'objects.inv') as resp:
+            raw = resp.read()
+
+        legacy, legacy_ms, legacy_mib = measure(legacy_parse, raw, url)
+        streaming, streaming_ms, streaming_mib = measure(streaming_parse, raw, url)
+
+        assert legacy == streaming, url
+
+        print(f'{url} ({len(raw) / 1024:.0f} KiB compressed, {len(legacy)} entries)')
+        print(f'    legacy:    {legacy_ms:8.2f}ms  peak {legacy_mib:6.2f} MiB')
+        print(f'    streaming: {streaming_ms:8.2f}ms  peak {streaming_mib:6.2f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -133,12 +133,16 @@ class ImageResolver:
         except PartialEmojiConversionFailure:
             pass
 
-        try:
-            user = await UserConverter().convert(ctx, content)
+        if match := Regexs.USER_ID_REGEX.match(content):
+            if user := await ctx.bot.getch('user', int(match[1] or match[2])):
+                return self.to_avatar(user)
+        else:
+            try:
+                user = await UserConverter().convert(ctx, content)
 
-            return self.to_avatar(user)
-        except UserNotFound:
-            pass
+                return self.to_avatar(user)
+            except UserNotFound:
+                pass
 
         content = content.strip('<>')
 
@@ -151,8 +155,8 @@ class ImageResolver:
         if ref := self.ctx.message.reference:
             message = ref.resolved
 
-            if isinstance(message, DeletedReferencedMessage) and ref.message_id:
-                message = await self.ctx.channel.fetch_message(ref.message_id)
+            if (message is None or isinstance(message, DeletedReferencedMessage)) and ref.message_id:
+                message = await self.ctx.bot.object_cache.message(self.ctx.channel, ref.message_id)
 
             if message and not isinstance(message, DeletedReferencedMessage):
                 if res := await self.check_attachments(message):
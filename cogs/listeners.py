@@ -1,37 +1,67 @@
 import asyncio
-from datetime import datetime
+import time
+from collections import Counter
 
 import discord
+from discord import app_commands
+from discord.ext import commands
 from discord.ext.tasks import loop
 
+import config
 from core import Cog
 from core.context import BoboContext
 
 
 class Listeners(Cog):
     ignore = True
+
+    # Seconds an edited message must stay unchanged before its command is re-run.
+    EDIT_DEBOUNCE: float = getattr(config, 'edit_debounce', 1.0)
+
     async def cog_load(self):
-        self._events_lock = asyncio.Lock()
-        self._events_to_send = []
+        self._event_counts: Counter[str] = Counter()
+        self._edit_tasks: dict[int, asyncio.Task[None]] = {}
+        self._running_edits: set[int] = set()
+        self.edit_stats: Counter[str] = Counter()
 
-        if not await self.bot.redis.get('events_start_time'):
-            await self.bot.redis.set('events_start_time', datetime.now().timestamp())
+        await self.bot.gateway_events.ensure_total()
 
     @loop(seconds=1)
     async def send_events(self):
         await self.bot.wait_until_ready()
 
-        if not self._events_to_send:
+        if not self._event_counts:
             return
-        
-        async with self._events_lock:
+
+        # Swapped without awaiting in between, so no event is counted twice or lost.
+        counts, self._event_counts = self._event_counts, Counter()
+
+        try:
+            # A MULTI/EXEC pipeline, so readers never see the total out of step with the hash.
             async with self.bot.redis.pipeline() as pipe:
-                for event in self._events_to_send:
-                    pipe.hincrby('events', event, 1)
-                
+                self.bot.gateway_events.add_to(pipe, counts)
+
                 await pipe.execute()
-            
-            self._events_to_send.clear()
+        except Exception as e:
+            self._event_counts.update(counts)
+            self.bot.logger.warning(f'Failed to send gateway event counts: {e}')
+
+    async def delete_replies(self, channel_id: int, messages: list[int]) -> None:
+        # Discord only bulk deletes 2 to 100 messages at a time.
+        for start in range(0, len(messages), 100):
+            chunk = messages[start : start + 100]
+
+            try:
+                if len(chunk) == 1:
+                    await self.bot.http.delete_message(channel_id, chunk[0])
+                else:
+                    await self.bot.http.delete_messages(channel_id, chunk)
+            except (discord.Forbidden, discord.NotFound):
+                for m in chunk:
+                    try:
+                        await self.bot.http.delete_message(channel_id, m)
+                    except (discord.Forbidden, discord.NotFound):
+                        pass
 
     @Cog.listener()
     async def on_raw_message_delete(
@@ -40,35 +70,32 @@ class Listeners(Cog):
         if messages := await self.bot.delete_message_manager.get_messages(
             payload.message_id
         ):
-            try:
-                await self.bot.http.delete_messages(
-                    payload.channel_id, messages
-                )  # Well if someone were to edit their message 100 times then uhh idk.
-            except (discord.Forbidden, discord.NotFound):
-                for m in messages:
-                    try:
-                        await self.bot.http.delete_message(payload.channel_id, m)
-                    except (discord.Forbidden, discord.NotFound):
-                        pass
-
+            await self.delete_replies(payload.channel_id, messages)
             await self.bot.delete_message_manager.delete_messages(payload.message_id)
 
     @Cog.listener()
     async def on_raw_bulk_message_delete(
         self, payload: discord.RawBulkMessageDeleteEvent
     ) -> None:
-        for message in payload.message_ids:
-            if messages := await self.bot.delete_message_manager.get_messages(message):
-                try:
-                    await self.bot.http.delete_messages(payload.channel_id, messages)
-                except (discord.Forbidden, discord.NotFound):
-                    for m in messages:
-                        try:
-                            await self.bot.http.delete_message(payload.channel_id, m)
-                        except (discord.Forbidden, discord.NotFound):
-                            pass
-
-                await self.bot.delete_message_manager.delete_messages(message)
+        manager = self.bot.delete_message_manager
+
+        if not (replies := await manager.get_many(payload.message_ids)):
+            return
+
+        # Replies that were purged together with their commands are already gone.
+        messages = list(
+            {
+                m: None
+                for messages in replies.values()
+                for m in messages
+                if m not in payload.message_ids
+            }
+        )
+
+        if messages:
+            await self.delete_replies(payload.channel_id, messages)
+
+        await manager.delete_many(replies)
 
     @Cog.listener()
     async def on_message_edit(self, old: discord.Message, new: discord.Message) -> None:
@@ -78,20 +105,83 @@ class Listeners(Cog):
         if old.content == new.content:
             return
 
-        await self.bot.process_commands(new)
+        if (previous := self._edit_tasks.get(new.id)) and not previous.done():
+            # Only the latest content of a message is worth running.
+            self.edit_stats[
+                'cancelled' if new.id in self._running_edits else 'debounced'
+            ] += 1
+            previous.cancel()
+
+        self.edit_stats['scheduled'] += 1
+
+        task = asyncio.create_task(self.rerun_edited(new))
+        self._edit_tasks[new.id] = task
+        task.add_done_callback(lambda t: self._forget_edit(new.id, t))
+
+    def _forget_edit(self, message_id: int, task: asyncio.Task[None]) -> None:
+        if self._edit_tasks.get(message_id) is task:
+            del self._edit_tasks[message_id]
+
+    async def rerun_edited(self, message: discord.Message) -> None:
+        await asyncio.sleep(self.EDIT_DEBOUNCE)
+
+        self._running_edits.add(message.id)
+        self.edit_stats['executed'] += 1
+
+        try:
+            await self.bot.process_commands(message)
+        finally:
+            self._running_edits.discard(message.id)
+
+    async def unload(self) -> None:
+        for task in self._edit_tasks.values():
+            task.cancel()
 
     @Cog.listener()
     async def on_socket_event_type(self, event: str) -> None:
-        if not hasattr(self, '_events_to_send') or not hasattr(self, '_events_lock'):
+        if not hasattr(self, '_event_counts'):
             return
 
-        async with self._events_lock:
-            self._events_to_send.append(event)
+        self._event_counts[event] += 1
+
+    def record_invocation(self, ctx: BoboContext, *, failed: bool) -> None:
+        if not ctx.command or ctx.started_at is None:
+            return
+
+        self.bot.command_usage.record_invocation(
+            ctx.command.qualified_name,
+            guild_id=ctx.guild and ctx.guild.id,
+            latency=(time.perf_counter() - ctx.started_at) * 1000,
+            failed=failed,
+        )
+
+    @Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.bot.chunker.forget(guild)
+
+    @Cog.listener()
+    async def on_command(self, ctx: BoboContext):
+        ctx.started_at = time.perf_counter()
+
+        if ctx.guild:
+            self.bot.chunker.touch(ctx.guild)
 
     @Cog.listener()
     async def on_command_completion(self, ctx: BoboContext):
         if ctx.invoked_with:
-            await ctx.inicrease_command_usage(ctx.invoked_with)
+            self.bot.command_usage.record(ctx.invoked_with)
+
+        self.record_invocation(ctx, failed=False)
+
+    @Cog.listener()
+    async def on_command_error(self, ctx: BoboContext, error: Exception):
+        # Only errors raised by the command itself, not rejections by checks,
+        # cooldowns, max concurrency or argument parsing.
+        if isinstance(error, commands.CommandInvokeError) or (
+            isinstance(error, commands.HybridCommandError)
+            and isinstance(error.original, app_commands.CommandInvokeError)
+        ):
+            self.record_invocation(ctx, failed=True)
 
 
 setup = Listeners.setup
@@ -3,14 +3,14 @@ from __future__ import annotations
 import json
 from asyncio import to_thread
 from asyncio.subprocess import DEVNULL, PIPE, create_subprocess_exec
-from datetime import datetime
+from datetime import datetime, timedelta
 from textwrap import dedent
 from typing import TYPE_CHECKING
 from platform import node
 import psutil
 import humanize
 
-from core import Cog, command
+from core import Cog, command, sparkline
 
 if TYPE_CHECKING:
     from core import BoboContext
@@ -18,21 +18,25 @@ if TYPE_CHECKING:
 
 
 class Misc(Cog):
-    async def cog_load(self) -> None:
-        with open('./events.lua', 'r') as f:
-            self.get_event_counts = self.bot.redis.register_script(f.read())
-
     @command()
     async def ping(self, ctx: BoboContext) -> str:
         """Pong!"""
-        res = await self.bot.self_test()
+        summary = self.bot.latency_summary()
+
+        def format_latency(name: str) -> str:
+            if not (percentiles := summary.get(name)):
+                return 'N/A'
+
+            return ' / '.join(f'{v}ms' for v in percentiles)
 
         return dedent(
             f"""
-            PostgreSQL latency: {res.postgres}ms
-            Redis latency: {res.redis}ms
-            Discord REST latency: {res.discord_rest}ms
-            Discord WS latency: {res.discord_ws}ms
+            Latency p50 / p95 / p99 over the last 10 minutes:
+
+            PostgreSQL: {format_latency('postgres')}
+            Redis: {format_latency('redis')}
+            Discord REST: {format_latency('discord_rest')}
+            Discord WS: {format_latency('discord_ws')}
         """
         )
 
@@ -136,20 +140,35 @@ class Misc(Cog):
 
     @command()
     async def events(self, ctx: BoboContext) -> str:
-        """Shows the number of events since the bot was started."""
-        events_count = await self.get_event_counts()
+        """Shows the current rate of gateway events and command uses."""
+        stats = self.bot.gateway_events
+        events_count = await stats.total()
 
-        time_difference = (
-            float(datetime.now().timestamp())
-            - float(await self.bot.redis.get('events_start_time'))
-        ) / 60
+        rates = await stats.rates()
+        peaks = await stats.peaks()
+        series = await stats.series()
 
-        return dedent(
-            f"""
-            Total WS Events: {events_count}
-            Average WS Events per minute: {events_count // time_difference}
-        """
-        )
+        lines = [f'{"Event":<24}{"1m/s":>8}{"5m/s":>8}{"1h/s":>8}{"Peak/min":>10}']
+
+        for event, rate in list(rates.items())[:11]:
+            lines.append(
+                f'{"All events" if event == "*" else event:<24}'
+                f'{rate.one_minute:>8.2f}{rate.five_minutes:>8.2f}{rate.one_hour:>8.2f}'
+                f'{peaks.get(event, (0, 0))[1]:>10,}'
+            )
 
+        analytics = self.bot.command_analytics
+        command_rate = await analytics.rate(timedelta(hours=1))
+        top_commands = await analytics.top_commands(3, window=timedelta(days=1))
+
+        table = '\n'.join(lines)
+
+        return (
+            f'Total WS Events: {events_count:,}\n'
+            f'Last hour: {sparkline(series)}\n'
+            f'```\n{table}\n```\n'
+            f'Commands per minute (last hour): {command_rate:.2f}\n'
+            f'Top commands (last day): {", ".join(f"{name} ({uses})" for name, uses in top_commands) or "None"}'
+        )
 
 setup = Misc.setup
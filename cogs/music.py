@@ -74,10 +74,10 @@ class MusicController(BaseView):
 
         self.player = player
     
-    def make_embed(self) -> Embed:
+    async def make_embed(self) -> Embed:
         embed = self.player.ctx.embed()
         
-        guild = self.player.bot.get_guild(self.player.guild_id)
+        guild = await self.player.bot.getch('guild', self.player.guild_id)
         channel = self.player.channel
 
         assert guild is not None
@@ -106,7 +106,7 @@ class MusicController(BaseView):
 
         await self.player.set_volume(volume)
 
-        await interaction.edit_original_message(embed=self.make_embed())
+        await interaction.edit_original_message(embed=await self.make_embed())
     
     @button(label='Loop Type', emoji='🔁', style=ButtonStyle.primary)
     async def set_loop_type(self, interaction: Interaction, button: Button) -> None:
@@ -129,26 +129,26 @@ class MusicController(BaseView):
         
         self.player.queue.loop_type = loop_type
 
-        await interaction.edit_original_message(embed=self.make_embed(), view=self)
+        await interaction.edit_original_message(embed=await self.make_embed(), view=self)
     
     @button(label='Toggle Pause', emoji='⏸', style=ButtonStyle.primary)
     async def toggle_pause(self, interaction: Interaction, button: Button) -> None:
         await self.player.toggle_pause()
 
-        await interaction.response.edit_message(embed=self.make_embed())
+        await interaction.response.edit_message(embed=await self.make_embed())
     
     @button(label='Skip', emoji='⏭', style=ButtonStyle.primary)
     async def skip(self, interaction: Interaction, button: Button) -> None:
         await self.player.stop()
 
-        await interaction.response.edit_message(embed=self.make_embed())
+        await interaction.response.edit_message(embed=await self.make_embed())
     
     @button(label='Leave', emoji='⏹', style=ButtonStyle.danger)
     async def leave(self, interaction: Interaction, button: Button) -> None:
         await self.player.disconnect()
 
         self._disable_all()
-        await interaction.response.edit_message(embed=self.make_embed(), view=self)
+        await interaction.response.edit_message(embed=await self.make_embed(), view=self)
 
         self.stop()
 
@@ -163,7 +163,7 @@ class MusicControllerInvoke(BaseView):
     async def invoke(self, interaction: Interaction, button: Button) -> None:
         controller = MusicController(self.player, interaction.user.id)
 
-        await interaction.response.send_message(view=controller, embed=controller.make_embed(), ephemeral=True)
+        await interaction.response.send_message(view=controller, embed=await controller.make_embed(), ephemeral=True)
 
 
 class Player(_Player['BoboBot']):
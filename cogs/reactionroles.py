@@ -14,12 +14,22 @@ from core.paginator import EmbedListPageSource, ViewMenuPages
 class ReactionRoles(Cog):
     async def cog_load(self) -> None:
         self.cache = ReactionRoleManager(self.bot.redis)
+        await self.cache.start()
+
         self.locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
 
+        # The cache lives in Redis, every other cluster reads what the primary one wrote.
+        if not self.bot.primary:
+            return
+
         reaction_roles = await self.bot.db.fetch("SELECT * FROM reaction_roles")
 
-        for rr in reaction_roles:
-            await self.cache.add(rr['message_id'], rr['role_id'], rr['emoji'])
+        await self.cache.add_many(
+            [(rr['message_id'], rr['role_id'], rr['emoji']) for rr in reaction_roles]
+        )
+
+    async def unload(self) -> None:
+        await self.cache.close()
 
     @Cog.listener()
     async def on_raw_reaction_add(
@@ -200,12 +210,22 @@ class ReactionRoles(Cog):
 
             return role.mention
 
+        async def get_emoji(_emoji: str) -> str:
+            assert ctx.guild is not None
+
+            if not _emoji.isnumeric():
+                return _emoji
+
+            return str(await self.bot.object_cache.emoji(ctx.guild, int(_emoji)) or 'Emoji not found')
+
+        emojis = await asyncio.gather(*(get_emoji(emoji) for _, _, emoji, _ in reaction_roles))
+
         formatted = [
             (
-                f'Message ID: {message_id} and emoji: {emoji if not emoji.isnumeric() else str(self.bot.get_emoji(emoji))}'
+                f'Message ID: {message_id} and emoji: {emoji}'
                 f' for role: {get_role_mention(role)}\n'
             )
-            for _, message_id, emoji, role in reaction_roles
+            for (_, message_id, _, role), emoji in zip(reaction_roles, emojis)
         ]
 
         source = EmbedListPageSource(formatted, title='Reaction Roles in this server.')
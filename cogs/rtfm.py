@@ -1,25 +1,38 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import math
 import os
-from urllib.parse import quote
-import zlib
+import tempfile
 from asyncio import to_thread
-from io import BytesIO
-from typing import Iterator, NamedTuple
+from collections import Counter, OrderedDict, defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 import discord
+from discord.app_commands import Choice
 from discord.ext.menus import ListPageSource
+from discord.ext.tasks import loop
 from discord.ext.menus.views import ViewMenuPages
 
-from core import Cog, Regexs, RTFMCacheManager, finder
-from core.command import group
+from core import (
+    Cog,
+    Instant,
+    LatencySamples,
+    RTFMCacheManager,
+    RustdocClient,
+    SearchIndex,
+    SingleFlight,
+    SphinxInventoryParser,
+    UnsupportedRustdocFormat,
+    fuzzy_score,
+)
+from core.command import hybrid_group
 from core.types import PossibleRTFMSources
 
-
-class RustDocParsedResult(NamedTuple):
-    title: str
-    signature: str
-    description: str
+if TYPE_CHECKING:
+    from discord import Interaction
 
 
 class RTFMMenuSource(ListPageSource):
@@ -44,96 +57,297 @@ class RTFMMenuSource(ListPageSource):
 
 
 class RTFM(Cog):
+    CHUNK_SIZE = 16 * 1024
+    AUTOCOMPLETE_CACHE_SIZE = 32
+    AUTOCOMPLETE_USERS = 1024
+    SEARCH_TIMEOUT = 3.0
+    MERGE_LIMIT = 50
+    RUST_STD_URL = 'https://doc.rust-lang.org/std/'
+    UNSUPPORTED_RUSTDOC = (
+        'These docs were built by a rustdoc version whose search index is not supported yet.'
+    )
+    SNAPSHOT_DIR = Path('./cache/rtfm')
+    source_to_url_map: dict[PossibleRTFMSources, str] = {
+        'python': 'https://docs.python.org/3/',
+        'asyncpg': 'https://magicstack.github.io/asyncpg/current/',
+        'discordpy': 'https://discordpy.readthedocs.io/en/latest/',
+        'discordpy_master': 'https://discordpy.readthedocs.io/en/master/',
+    }
+
     async def cog_load(self):
         self.cache = RTFMCacheManager(self.bot.redis)
+        await self.cache.start()
+
+        self.rustdoc = RustdocClient(self.bot.session)
+        self.indexes: dict[PossibleRTFMSources, SearchIndex] = {}
+        self.validators: dict[PossibleRTFMSources, dict[str, str]] = {}
+        self._index_flight: SingleFlight[SearchIndex] = SingleFlight()
+        self.latencies: defaultdict[PossibleRTFMSources, LatencySamples] = defaultdict(
+            LatencySamples
+        )
+        self.timeouts: Counter[PossibleRTFMSources] = Counter()
+        self.autocomplete_cache: OrderedDict[
+            int, OrderedDict[tuple[str, str], list[Choice[str]]]
+        ] = OrderedDict()
+
+        self.SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+
+        for source in self.source_to_url_map:
+            try:
+                await self.load_snapshot(source)
+            except Exception as e:
+                self.bot.logger.warning(
+                    f'Unable to load RTFM snapshot for {source}, ignoring. Exception: {e}'
+                )
+
+    async def unload(self) -> None:
+        await self.cache.close()
+
+    @loop(hours=1)
+    async def refresh_inventories(self) -> None:
+        await self.bot.wait_until_ready()
+
+        for source in self.source_to_url_map:
+            try:
+                await self.refresh_inventory(source)
+            except Exception as e:
+                self.bot.logger.warning(
+                    f'Unable to refresh RTFM inventory for {source}. Exception: {e}'
+                )
+
+    def snapshot_path(self, source: PossibleRTFMSources) -> Path:
+        return self.SNAPSHOT_DIR / f'{source}.inv'
 
     @staticmethod
-    def parse_sphinx_object_inv(stream: BytesIO, base_url: str) -> dict[str, str]:
+    def _read_snapshot(path: Path, url: str) -> dict[str, str]:
+        parser = SphinxInventoryParser(url)
+        results = {}
+
+        with path.open('rb') as f:
+            while chunk := f.read(RTFM.CHUNK_SIZE):
+                results.update(parser.feed(chunk))
+
+        results.update(parser.close())
+
+        return results
+
+    async def load_snapshot(self, source: PossibleRTFMSources) -> None:
         """
-        Parses Sphinx object inventory file.
+        Builds the index of a source from its on-disk snapshot, if there is one.
         """
-        data = {}
+        path = self.snapshot_path(source)
 
-        sphinx_version = stream.readline().rstrip()[2:]  # To strip \n
+        if not path.exists():
+            return
 
-        if sphinx_version != b'Sphinx inventory version 2':
-            raise RuntimeError(f'Unsupported Sphinx version: {sphinx_version.decode()}')
+        results = await to_thread(
+            self._read_snapshot, path, self.source_to_url_map[source]
+        )
+        index = await to_thread(SearchIndex.from_dict, results)
 
-        stream.readline()
-        stream.readline()
+        try:
+            self.validators[source] = json.loads(path.with_suffix('.json').read_text())
+        except (OSError, ValueError):
+            pass
 
-        if b'zlib' not in stream.readline():
-            raise RuntimeError('Unsupported compression method')
+        self.indexes[source] = index
 
-        decompressor = zlib.decompressobj()
+    async def refresh_inventory(
+        self, source: PossibleRTFMSources, *, force: bool = False
+    ) -> SearchIndex | None:
+        """
+        Revalidates the inventory of a source, swapping in a new index if it changed.
 
-        def yield_decompressed_bytes(data: BytesIO) -> Iterator[str]:
-            while True:
-                chunk = data.read(16 * 1024)
-                if not chunk:
-                    break
+        Returns ``None`` if the upstream inventory has not changed.
+        """
+        results = await self.fetch_sphinx_inventory(source, conditional=not force)
 
-                decompressed_line = decompressor.decompress(chunk)
+        if results is None:
+            return None
 
-                yield decompressed_line.decode('utf-8')
+        index = await to_thread(SearchIndex.from_dict, results)
 
-        _data = ''.join(yield_decompressed_bytes(stream))
+        # Readers only ever see a fully built index.
+        self.indexes[source] = index
 
-        for line in _data.split('\n'):
-            match = Regexs.SPHINX_ENTRY_REGEX.match(line)
+        await self.cache.add(
+            source, '', results
+        )  # Set query to '' because we are caching the entire object
 
-            if not match:
-                continue
+        return index
+
+    async def get_sphinx_index(self, source: PossibleRTFMSources) -> SearchIndex:
+        if (index := self.indexes.get(source)) is not None:
+            # The cached inventory is refreshed before it expires while the source is in use.
+            self.cache.refresh_early(source, '', lambda: self._fetch_sphinx_index(source))
+
+            return index
+
+        # Concurrent queries for a cold source share one download and index build.
+        return await self._index_flight.do(
+            source, lambda: self._build_sphinx_index(source)
+        )
+
+    async def _fetch_sphinx_index(self, source: PossibleRTFMSources) -> dict[str, str]:
+        results = await self.fetch_sphinx_inventory(source)
+        assert results is not None
+
+        # Readers only ever see a fully built index.
+        self.indexes[source] = await to_thread(SearchIndex.from_dict, results)
+
+        return results
 
-            name, directive, _, location, display = match.groups()
+    async def _build_sphinx_index(self, source: PossibleRTFMSources) -> SearchIndex:
+        results = await self.cache.get_or_fetch(
+            source, '', lambda: self._fetch_sphinx_index(source)
+        )  # Set query to '' because we are caching the entire object
 
-            domain, _, subdirective = directive.partition(':')
+        # Only built here if the inventory came from the cache, not a fetch.
+        if (index := self.indexes.get(source)) is None:
+            index = await to_thread(SearchIndex.from_dict, results)
+            self.indexes[source] = index
 
-            if directive == 'std:doc':
-                subdirective = 'label'
+        return index
+
+    async def fetch_sphinx_inventory(
+        self, source: PossibleRTFMSources, *, conditional: bool = False
+    ) -> dict[str, str] | None:
+        """
+        Streams and parses a Sphinx object inventory file, writing it to the source's
+        snapshot as it arrives.
+
+        Returns ``None`` if ``conditional`` is set and the inventory has not changed.
+        """
+        url = self.source_to_url_map[source]
+        path = self.snapshot_path(source)
+
+        headers = {}
+        validators = self.validators.get(source, {})
+
+        if conditional:
+            if etag := validators.get('etag'):
+                headers['If-None-Match'] = etag
+
+            if last_modified := validators.get('last_modified'):
+                headers['If-Modified-Since'] = last_modified
+
+        parser = SphinxInventoryParser(url)
+        results = {}
+
+        # Unique per call, the hourly refresh and a search can fetch the same source at once.
+        fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f'{path.name}.', suffix='.tmp')
+        temp_path = Path(temp_name)
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                async with self.bot.session.get(url + 'objects.inv', headers=headers) as resp:
+                    if resp.status == 304:
+                        return None
+
+                    resp.raise_for_status()
+
+                    async for chunk in resp.content.iter_chunked(self.CHUNK_SIZE):
+                        f.write(chunk)
+                        results.update(parser.feed(chunk))
+
+                    results.update(parser.close())
+
+                    validators = {
+                        key: value
+                        for key, value in (
+                            ('etag', resp.headers.get('ETag')),
+                            ('last_modified', resp.headers.get('Last-Modified')),
+                        )
+                        if value
+                    }
+
+            os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+        path.with_suffix('.json').write_text(json.dumps(validators))
+        self.validators[source] = validators
+
+        return results
+
+    async def search_source(
+        self, source: PossibleRTFMSources, query: str
+    ) -> list[tuple[str, str]]:
+        with Instant() as instant:
+            if source == 'rust':
+                results = await self.rustdoc.search(
+                    self.RUST_STD_URL, query, preferred_crate='std'
+                )
+            else:
+                results = (await self.get_sphinx_index(source)).search(query)
+
+        self.latencies[source].record(instant.elapsed.as_millis())
+
+        return results or []
+
+    async def _search_source_with_timeout(
+        self, source: PossibleRTFMSources, query: str
+    ) -> list[tuple[str, str]]:
+        task = asyncio.create_task(self.search_source(source, query))
+        # Keep the search alive past the timeout so it still warms the caches.
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), self.SEARCH_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.timeouts[source] += 1
+        except Exception as e:
+            self.bot.logger.warning(f'RTFM search of {source} failed. Exception: {e}')
+
+        return []
+
+    async def search_all(self, query: str) -> list[tuple[str, str]]:
+        """
+        Searches every source concurrently, merging the results by how closely
+        their keys match the query.
+        """
+        sources: tuple[PossibleRTFMSources, ...] = (*self.source_to_url_map, 'rust')
+
+        results = await asyncio.gather(
+            *(self._search_source_with_timeout(source, query) for source in sources)
+        )
+
+        merged = []
+
+        for order, (source, entries) in enumerate(zip(sources, results)):
+            for rank, (key, url) in enumerate(entries[: self.MERGE_LIMIT]):
+                score = fuzzy_score(query, key) or (math.inf, math.inf)
+                merged.append((score, rank, order, key, url, source))
+
+        merged.sort(key=lambda entry: entry[:3])
+
+        seen = set()
+        matches = []
+
+        for *_, key, url, source in merged:
+            if key in seen:
+                continue
 
-            if location.endswith('$'):
-                location = location[:-1] + name
+            seen.add(key)
 
-            key = name if display == '-' else display
-            prefix = f'{subdirective}:' if domain == 'std' else ''
+            if source == 'rust':
+                key = self.escape_rust_key(key)
 
-            data[f'{prefix}{key}'] = os.path.join(base_url, location)
+            matches.append((f'{key} ({source})', url))
 
-        return data
+        return matches
 
     async def sphinx_rtfm(
         self, ctx, source: PossibleRTFMSources, query: str | None
     ) -> None:
-        source_to_url_map = {
-            'python': 'https://docs.python.org/3/',
-            'asyncpg': 'https://magicstack.github.io/asyncpg/current/',
-            'discordpy': 'https://discordpy.readthedocs.io/en/latest/',
-            'discordpy_master': 'https://discordpy.readthedocs.io/en/master/',
-        }
-
-        url = source_to_url_map[source]
+        url = self.source_to_url_map[source]
 
         if not query:
             await ctx.send(url)
 
             return
 
-        if results := await self.cache.get(source, ''):
-            ...
-        else:
-
-            async with self.bot.session.get(url + 'objects.inv') as resp:
-                results = await to_thread(
-                    self.parse_sphinx_object_inv, BytesIO(await resp.read()), url
-                )
-
-            await self.cache.add(
-                source, '', results
-            )  # Set query to '' because we are caching the entire object
-
-        # matches = self.fuzzy_finder(query, results)
-        matches = finder(query, list(results.items()), key=lambda x: x[0], lazy=False)
+        matches = await self.search_source(source, query)
 
         if not matches:
             await ctx.send(f'No results found for your query.')
@@ -144,7 +358,7 @@ class RTFM(Cog):
 
         await pages.start(ctx)
 
-    @group()
+    @hybrid_group()
     async def rtfm(self, ctx) -> None:
         """
         Query documentations.
@@ -179,45 +393,46 @@ class RTFM(Cog):
         """
         await self.sphinx_rtfm(ctx, 'discordpy_master', query)
     
-    async def parse_rust_doc(self, url: str, *, query: str, crate: str | None = None) -> list[tuple[str, str]] | None:
-        resp = await self.bot.html_session.get(f'{url}/{crate if crate else "std"}/?search={query}')
-        await resp.html.arender()
+    @staticmethod
+    def escape_rust_key(key: str) -> str:
+        return key.replace(':', r'\:')
 
-        try:
-            a = resp.html.find('.search-results')[0].find('a')
-        except IndexError:
-            return
+    @rtfm.command(name='all')
+    async def all_(self, ctx, *, query: str) -> str | None:
+        """
+        Search every documentation at once.
+        """
+        matches = await self.search_all(query)
 
-        results = {}
+        if not matches:
+            return 'No results found for your query.'
 
-        for element in a:
-            try:
-                div = element.find('.result-name')[0]
-            except IndexError:
-                div = element
+        pages = ViewMenuPages(source=RTFMMenuSource(matches, 'All Documentations'))
 
-            key = ''.join(e.text for e in div.find('span')).replace(':', r'\:')
+        await pages.start(ctx)
 
-            results[key] = url + element.attrs[
-                'href'
-            ].replace('..', '')
+    @rtfm.command()
+    async def stats(self, ctx) -> str:
+        """
+        Shows search latency of each documentation.
+        """
+        lines = []
 
-        if crate:
-            await self.cache.add('crates', f'{crate}:{query}', results)
-        else:
-            await self.cache.add('rust', query, results)
-        
-        return list(results.items())
-    
-    async def parse_rust_struct(self, url: str) -> RustDocParsedResult:
-        resp = await self.bot.html_session.get(url)
-        await resp.html.arender()
+        for source, samples in self.latencies.items():
+            p50, p99 = samples.percentile(50), samples.percentile(99)
 
-        title = resp.html.find('.fqn')[0].full_text
-        signature = resp.html.find('code')[0].text
-        description = resp.html.find('p')[0].full_text
+            if p50 is None or p99 is None:
+                continue
 
-        return RustDocParsedResult(title, signature, description)
+            lines.append(
+                f'{source}: p50 {p50:.2f}ms | p99 {p99:.2f}ms '
+                f'({len(samples)} samples, {self.timeouts[source]} timeouts)'
+            )
+
+        if not lines:
+            return 'No searches recorded yet.'
+
+        return '```\n' + '\n'.join(lines) + '\n```'
 
     @rtfm.command()
     async def rust(self, ctx, *, query: str | None = None) -> str | None:
@@ -229,24 +444,19 @@ class RTFM(Cog):
         if not query:
             return base_url + '/std'
 
-        query = quote(query.lower())
-
-        if cached := await self.cache.get('rust', query):
-            pages = ViewMenuPages(
-                source=RTFMMenuSource(list(cached.items()), 'Rust Standard Library')
-            )
-
-            await pages.start(ctx)
-
-            return
-
-        res = await self.parse_rust_doc(base_url, query=query)
+        try:
+            res = await self.search_source('rust', query)
+        except UnsupportedRustdocFormat:
+            return self.UNSUPPORTED_RUSTDOC
 
         if not res:
             return 'No results found for your query.'
 
         pages = ViewMenuPages(
-            source=RTFMMenuSource(res, 'Rust Standard Library')
+            source=RTFMMenuSource(
+                [(self.escape_rust_key(key), url) for key, url in res],
+                'Rust Standard Library',
+            )
         )
 
         await pages.start(ctx)
@@ -265,24 +475,99 @@ class RTFM(Cog):
                     return 'Crate not found.'
 
             return crate_url
-        
-        query = quote(query.lower())
 
-        if cached := await self.cache.get('crates', f'{crate}:{query}'):
-            pages = ViewMenuPages(source=RTFMMenuSource(list(cached.items()), crate))
+        module = crate.replace('-', '_')
 
-            await pages.start(ctx)
+        try:
+            res = await self.rustdoc.search(
+                f'{base_url}/{crate}/latest/{module}/', query, preferred_crate=module
+            )
+        except UnsupportedRustdocFormat:
+            return self.UNSUPPORTED_RUSTDOC
 
-            return
-        
-        res = await self.parse_rust_doc(base_url, query=query, crate=crate)
+        if res is None:
+            return 'Crate not found.'
 
         if not res:
             return 'No results found for your query.'
 
-        pages = ViewMenuPages(source=RTFMMenuSource(res, crate))
+        pages = ViewMenuPages(
+            source=RTFMMenuSource(
+                [(self.escape_rust_key(key), url) for key, url in res], crate
+            )
+        )
 
         await pages.start(ctx)
 
+    def get_prefix_index(
+        self, interaction: Interaction, source: str
+    ) -> SearchIndex | None:
+        if source == 'rust':
+            page_url = self.RUST_STD_URL
+        elif source == 'crates':
+            if not (crate := getattr(interaction.namespace, 'crate', None)):
+                return None
+
+            page_url = f'https://docs.rs/{crate}/latest/{crate.replace("-", "_")}/'
+        else:
+            return self.indexes.get(source)  # type: ignore
+
+        if (index := self.rustdoc.get_cached_index(page_url)) is not None:
+            return index.paths
+
+        return None
+
+    @python.autocomplete('query')
+    @asyncpg.autocomplete('query')
+    @discordpy.autocomplete('query')
+    @discordpy_master.autocomplete('query')
+    @rust.autocomplete('query')
+    @crates.autocomplete('query')
+    async def query_autocomplete(
+        self, interaction: Interaction, current: str
+    ) -> list[Choice[str]]:
+        # Only ever answers from memory, Discord gives us 3 seconds at most.
+        if not current or not interaction.command:
+            return []
+
+        source = interaction.command.name
+        scope = source
+
+        if source == 'crates':
+            scope = f'crates:{getattr(interaction.namespace, "crate", "")}'
+
+        key = (scope, current.lower())
+
+        user_cache = self.autocomplete_cache.get(interaction.user.id)
+
+        if user_cache is None:
+            user_cache = self.autocomplete_cache[interaction.user.id] = OrderedDict()
+
+            if len(self.autocomplete_cache) > self.AUTOCOMPLETE_USERS:
+                self.autocomplete_cache.popitem(last=False)
+        else:
+            self.autocomplete_cache.move_to_end(interaction.user.id)
+
+        if (choices := user_cache.get(key)) is not None:
+            user_cache.move_to_end(key)
+
+            return choices
+
+        if (index := self.get_prefix_index(interaction, source)) is None:
+            return []
+
+        choices = [
+            Choice(name=name, value=name)
+            for name, _ in index.prefix(current)
+            if len(name) <= 100
+        ]
+
+        user_cache[key] = choices
+
+        if len(user_cache) > self.AUTOCOMPLETE_CACHE_SIZE:
+            user_cache.popitem(last=False)
+
+        return choices
+
 
 setup = RTFM.setup
@@ -3,12 +3,14 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 import discord
+from discord.ext import commands
 from discord.ext.commands import param, Author
 
 from textwrap import dedent
 from jishaku.codeblocks import codeblock_converter
 
-from core import Cog, command
+from core import Cog, command, needs_members
+from core.command import group
 from core.constants import SAFE_SEND, Constant
 
 if TYPE_CHECKING:
@@ -17,6 +19,7 @@ if TYPE_CHECKING:
 
 class Utility(Cog):
     @command(aliases=['ui'])
+    @needs_members()
     async def userinfo(
         self, ctx: BoboContext, user: discord.Member | discord.User = Author
     ) -> discord.Embed:
@@ -137,5 +140,77 @@ class Utility(Cog):
                 SAFE_SEND,
             )
 
+    @group(aliases=['prefixes'])
+    @commands.guild_only()
+    async def prefix(self, ctx: BoboContext) -> str:
+        """
+        List the prefixes of this server.
+        """
+        assert ctx.guild is not None
+
+        prefixes = self.bot.prefixes.get(ctx.guild.id) or (self.bot.default_prefix(),)
+
+        return 'Prefixes in this server: ' + ', '.join(f'`{p}`' for p in prefixes)
+
+    @prefix.command(name='add')
+    @commands.guild_only()
+    @commands.has_guild_permissions(manage_guild=True)
+    async def prefix_add(self, ctx: BoboContext, prefix: str) -> str:
+        """
+        Add a prefix to this server, the default prefix stops working once there is one.
+
+        Quote the prefix to end it with a space, e.g. `"bobo "`.
+        """
+        assert ctx.guild is not None
+
+        prefixes = self.bot.prefixes.get(ctx.guild.id) or ()
+
+        # An empty prefix would make every message in the server a command.
+        if not prefix.strip():
+            return 'Prefixes can not be empty or only whitespace.'
+
+        if len(prefix) > self.bot.prefixes.MAX_LENGTH:
+            return f'Prefixes can be at most {self.bot.prefixes.MAX_LENGTH} characters long.'
+
+        if prefix in prefixes:
+            return f'`{prefix}` is already a prefix.'
+
+        if len(prefixes) >= self.bot.prefixes.MAX_PREFIXES:
+            return f'A server can have at most {self.bot.prefixes.MAX_PREFIXES} prefixes.'
+
+        await self.bot.prefixes.add(ctx.guild.id, prefix)
+
+        return f'Added `{prefix}` as a prefix.'
+
+    @prefix.command(name='remove')
+    @commands.guild_only()
+    @commands.has_guild_permissions(manage_guild=True)
+    async def prefix_remove(self, ctx: BoboContext, prefix: str) -> str:
+        """
+        Remove a prefix from this server.
+        """
+        assert ctx.guild is not None
+
+        if prefix not in (self.bot.prefixes.get(ctx.guild.id) or ()):
+            return f'`{prefix}` is not a prefix.'
+
+        if not await self.bot.prefixes.remove(ctx.guild.id, prefix):
+            return f'Removed `{prefix}`, the prefix is `{self.bot.default_prefix()}` again.'
+
+        return f'Removed `{prefix}` from the prefixes.'
+
+    @prefix.command(name='reset')
+    @commands.guild_only()
+    @commands.has_guild_permissions(manage_guild=True)
+    async def prefix_reset(self, ctx: BoboContext) -> str:
+        """
+        Remove every prefix of this server, going back to the default one.
+        """
+        assert ctx.guild is not None
+
+        await self.bot.prefixes.reset(ctx.guild.id)
+
+        return f'The prefix is `{self.bot.default_prefix()}` again.'
+
 
 setup = Utility.setup
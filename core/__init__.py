@@ -1,10 +1,21 @@
 from .bot import *
 from .button import *
 from .cache_manager import *
+from .chunker import *
+from .cluster import *
 from .cog import *
 from .command import *
 from .constants import *
 from .context import *
+from .events import *
+from .getch import *
+from .metrics import *
+from .prefixes import *
+from .ratelimit import *
+from .rustdoc import *
+from .search import *
+from .sphinx import *
 from .types import *
+from .usage import *
 from .utils import *
 from .view import *
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import ast
 import asyncio
+import graphlib
 import logging
+import math
 import os
 import sys
-from typing import TYPE_CHECKING, NamedTuple, Type
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, ClassVar, NamedTuple, Type
 
 import aiohttp
 import redis.asyncio as aioredis
@@ -14,10 +18,15 @@ import jishaku
 import mystbin
 from discord.utils import MISSING
 from discord.ext import commands
-from discord.ext.commands.cooldowns import MaxConcurrency
-from requests_html import AsyncHTMLSession
 
 from core.cache_manager import DeleteMessageManager
+from core.chunker import GuildChunker
+from core.events import GatewayEventStats
+from core.getch import ObjectCache
+from core.metrics import LatencyHistogram, LatencyPercentiles
+from core.prefixes import PrefixManager
+from core.ratelimit import RateLimiter, RedisCooldownMapping, RedisMaxConcurrency
+from core.usage import CommandAnalytics, CommandUsageRecorder
 from core.utils import Instant
 from core.cdn import CDNClient
 from core.constants import BETA_ID, PROD_ID
@@ -25,6 +34,7 @@ from core.constants import BETA_ID, PROD_ID
 jishaku.Flags.NO_UNDERSCORE = True
 jishaku.Flags.NO_DM_TRACEBACK = True
 
+import config
 from config import DbConnectionDetails, token, prod_token
 
 from .context import BoboContext
@@ -41,21 +51,64 @@ __all__ = ('BoboBot',)
 
 
 class SelfTestResult(NamedTuple):
-    postgres: float
-    redis: float
-    discord_rest: float
-    discord_ws: float
+    postgres: float | None
+    redis: float | None
+    discord_rest: float | None
+    discord_ws: float | None
+
+
+DEFAULT_COOLDOWN = commands.Cooldown(1, 2)
+
+
+def _read_requires(path: str) -> tuple[str, ...]:
+    # Read without importing, so the load order is known before anything loads.
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and any(isinstance(t, ast.Name) and t.id == '__requires__' for t in node.targets)
+        ):
+            return tuple(ast.literal_eval(node.value))
+
+    return ()
 
 
 class BoboBot(commands.Bot):
     if TYPE_CHECKING:
         magmatic_node: Node
 
-    def __init__(self) -> None:
+    # Only one process serves the web API when the bot runs as several clusters.
+    serves_web: bool = True
+    # Only one process seeds state shared through Redis, such as the reaction role cache.
+    primary: bool = True
+
+    # Seconds between background self tests, and how long each probe may take.
+    PROBE_INTERVAL: ClassVar[float] = getattr(config, 'probe_interval', 30)
+    PROBE_TIMEOUT: ClassVar[float] = 5
+    # Seconds startup waits for extensions before leaving the rest to load in the background.
+    EXTENSION_TIMEOUT: ClassVar[float] = getattr(config, 'extension_timeout', 10)
+    # Skip startup chunking, guilds are only chunked when a command needs their members.
+    LAZY_CHUNKING: ClassVar[bool] = getattr(config, 'lazy_chunking', False)
+
+    def __init__(self, **options: Any) -> None:
         self.logger = __log__
 
         intents = discord.Intents.all()
 
+        # e.g. {'joined': True, 'voice': True}, see discord.MemberCacheFlags.
+        if (flags := getattr(config, 'member_cache_flags', None)) is not None:
+            options.setdefault('member_cache_flags', discord.MemberCacheFlags(**flags))
+
+        member_cache_flags = options.get(
+            'member_cache_flags', discord.MemberCacheFlags.from_intents(intents)
+        )
+
+        # Chunked members are only cached with joined, every command would chunk again.
+        if self.LAZY_CHUNKING and not member_cache_flags.joined:
+            raise RuntimeError('lazy_chunking needs member_cache_flags with joined enabled')
+
         super().__init__(
             command_prefix=self._get_prefix,
             intents=intents,
@@ -64,50 +117,108 @@ class BoboBot(commands.Bot):
             case_insensitive=True,
             allowed_mentions=discord.AllowedMentions.none(),
             strip_after_prefix=True,
+            **options,
         )
-    
-    @staticmethod
-    def _get_prefix(bot: BoboBot, message: Message) -> str:
-        if not bot.user or bot.user.id == BETA_ID:
+
+        # Set here, close() uses them even if setup_hook failed before creating them.
+        self.latency_task: asyncio.Task[None] | None = None
+        self.extension_load_times: dict[str, float] = {}
+        self.pending_extensions: set[asyncio.Task[bool]] = set()
+        # Created by setup_hook, close() skips what is still MISSING.
+        self.session: aiohttp.ClientSession = MISSING
+        self.redis: aioredis.Redis = MISSING
+        self.delete_message_manager: DeleteMessageManager = MISSING
+        self.ratelimiter: RateLimiter = MISSING
+        self.db: asyncpg.Pool = MISSING
+        self.command_usage: CommandUsageRecorder = MISSING
+        self.chunker: GuildChunker = MISSING
+        self.prefixes: PrefixManager = MISSING
+        self.web_task: asyncio.Task[None] = MISSING
+
+    def default_prefix(self) -> str:
+        if not self.user or self.user.id == BETA_ID:
             return 'bobo '
 
         return 'bobob '
 
-    async def self_test(self) -> SelfTestResult:
-        with Instant() as postgres_instant:
-            await self.db.execute('SELECT 1')
+    @staticmethod
+    def _get_prefix(bot: BoboBot, message: Message) -> str | tuple[str, ...]:
+        # Runs for every message, so this is only ever a dict lookup.
+        if message.guild and (prefixes := bot.prefixes.get(message.guild.id)):
+            return prefixes
+
+        return bot.default_prefix()
+
+    async def _probe(self, name: str, probe: Awaitable[Any]) -> float | None:
+        try:
+            with Instant() as instant:
+                await asyncio.wait_for(probe, self.PROBE_TIMEOUT)
+        except asyncio.TimeoutError:
+            # Recorded as the timeout, so a hanging service shows in the tail percentiles.
+            self.latencies[name].record(self.PROBE_TIMEOUT * 1000)
+            self.logger.warning(f'{name} probe timed out after {self.PROBE_TIMEOUT}s')
 
-        with Instant() as redis_instant:
-            await self.redis.ping()
+            return None
+        except Exception as e:
+            # A service that is down fails fast, it must not look healthier than a slow one.
+            self.latencies[name].record(self.PROBE_TIMEOUT * 1000)
+            self.logger.warning(f'{name} probe failed: {e}')
 
-        with Instant() as discord_rest_instant:
-            async with self.session.get('https://discord.com/api/v10') as resp:
-                ...
+            return None
 
-        r = lambda x: round(x, 3)
+        millis = instant.elapsed.as_millis()
+        self.latencies[name].record(millis)
 
-        return SelfTestResult(
-            r(postgres_instant.elapsed.as_millis()),
-            r(redis_instant.elapsed.as_millis()),
-            r(discord_rest_instant.elapsed.as_millis()),
-            r(float(self.latency) * 1000),
+        return round(millis, 3)
+
+    async def _discord_rest(self) -> None:
+        async with self.session.get('https://discord.com/api/v10'):
+            ...
+
+    async def self_test(self) -> SelfTestResult:
+        """
+        Probes every service at once and records the results into :attr:`latencies`.
+        """
+        postgres, redis, discord_rest = await asyncio.gather(
+            self._probe('postgres', self.db.execute('SELECT 1')),
+            self._probe('redis', self.redis.ping()),
+            self._probe('discord_rest', self._discord_rest()),
         )
 
-    async def getch(self, object_: str, id_: int) -> discord.abc.Snowflake:
-        get = getattr(self, f'get_{object_}')
-        fetch = getattr(self, f'fetch_{object_}')
+        discord_ws = None
+
+        if math.isfinite(self.latency):
+            discord_ws = round(self.latency * 1000, 3)
+            self.latencies['discord_ws'].record(discord_ws)
 
-        obj = await get(id_)
+        return SelfTestResult(postgres, redis, discord_rest, discord_ws)
 
-        if not obj:
-            obj = await fetch(id_)
+    async def sample_latencies(self) -> None:
+        while True:
+            try:
+                await self.self_test()
+            except Exception as e:
+                self.logger.warning(f'Latency sampling failed: {e}')
 
-        return obj
+            await asyncio.sleep(self.PROBE_INTERVAL)
+
+    def latency_summary(self) -> dict[str, LatencyPercentiles | None]:
+        """
+        Returns p50/p95/p99 of each probe over the last ten minutes, without probing.
+        """
+        return {name: histogram.summary() for name, histogram in self.latencies.items()}
+
+    async def getch(self, object_: str, id_: int) -> Any:
+        """
+        Gets a user, channel or guild by ID, fetching it if it is not cached.
+        Returns ``None`` if it does not exist.
+        """
+        return await getattr(self.object_cache, object_)(id_)
 
     def initialize_libaries(self) -> None:
         self.context = BoboContext
+        self.object_cache = ObjectCache(self)
         self.mystbin = mystbin.Client(session=self.session)
-        self.html_session = AsyncHTMLSession()
         self.cdn = CDNClient(self)
 
     async def initialize_constants(self) -> None:
@@ -117,6 +228,13 @@ class BoboBot(commands.Bot):
             'unix:///var/run/redis/redis-server.sock', decode_responses=True
         )
         self.delete_message_manager = DeleteMessageManager(self.redis)
+        await self.delete_message_manager.start()
+        self.gateway_events = GatewayEventStats(self.redis)
+        self.ratelimiter = RateLimiter(self.redis)
+        await self.ratelimiter.start()
+        self.latencies: dict[str, LatencyHistogram] = {
+            name: LatencyHistogram() for name in SelfTestResult._fields
+        }
 
         self.ready_once = False
 
@@ -124,7 +242,27 @@ class BoboBot(commands.Bot):
         if message.author.id == 590323594744168494:
             return
 
-        return commands.Cooldown(1, 2)
+        return DEFAULT_COOLDOWN
+
+    async def check_cooldown(self, ctx: BoboContext) -> None:
+        # A before invoke hook, so like cooldown_after_parsing it runs after the
+        # checks and argument parsing, and a failure releases max concurrency.
+        if not ctx.command or not isinstance(
+            mapping := ctx.command._buckets, RedisCooldownMapping
+        ):
+            return
+
+        if not (cooldown := mapping.cooldown_for(ctx.message)):
+            return
+
+        retry_after = await self.ratelimiter.hit(
+            f'{ctx.command.qualified_name}:{mapping.key_for(ctx.message)}',
+            cooldown.rate,
+            cooldown.per,
+        )
+
+        if retry_after is not None:
+            raise commands.CommandOnCooldown(cooldown, retry_after, mapping.type)
 
     def add_command(self, command: Command) -> None:
         ignore_list = ('help',)
@@ -132,17 +270,24 @@ class BoboBot(commands.Bot):
         super().add_command(command)
         command.cooldown_after_parsing = True
 
-        if not getattr(command._buckets, '_cooldown', None):
-            command._buckets = commands.DynamicCooldownMapping(
-                self.get_cooldown, commands.BucketType.user
+        # Cooldowns and concurrency are enforced through Redis, so they hold across processes.
+        if cooldown := getattr(command._buckets, '_cooldown', None):
+            command._buckets = RedisCooldownMapping(cooldown, command._buckets.type)
+        else:
+            command._buckets = RedisCooldownMapping(
+                None, commands.BucketType.user, self.get_cooldown
             )
 
         if (
             command._max_concurrency is None
             and command.qualified_name not in ignore_list
         ):
-            command._max_concurrency = MaxConcurrency(
-                2, per=commands.BucketType.user, wait=False
+            command._max_concurrency = RedisMaxConcurrency(
+                2,
+                per=commands.BucketType.user,
+                wait=False,
+                limiter=self.ratelimiter,
+                name=command.qualified_name,
             )
 
     async def _async_setup_hook(self) -> None:
@@ -160,19 +305,23 @@ class BoboBot(commands.Bot):
         self.dispatch('ready_once')
 
     async def on_ready_once(self) -> None:
-        chunk_tasks = []
+        if self.LAZY_CHUNKING:
+            return
 
-        for guild in self.guilds:
-            if not guild.chunked:
-                chunk_tasks.append(guild.chunk())
+        try:
+            uses = dict(await self.command_analytics.top_guilds())
+        except Exception as e:
+            self.logger.warning(f'Unable to load guild priorities, chunking unordered: {e}')
+            uses = {}
 
-        await asyncio.gather(*chunk_tasks)
+        self.chunker.schedule(self.guilds, uses)
 
     async def setup_hook(self) -> None:
         from core.web import app
 
         await self.initialize_constants()
         self.initialize_libaries()
+        self.before_invoke(self.check_cooldown)
 
         self.db = await asyncpg.create_pool(
             host=DbConnectionDetails.host,
@@ -180,25 +329,108 @@ class BoboBot(commands.Bot):
             password=DbConnectionDetails.password,
             database=DbConnectionDetails.database,
         )
+        self.command_usage = CommandUsageRecorder(self.db)
+        self.command_usage.start()
+        self.command_analytics = CommandAnalytics(self.db)
+        self.chunker = GuildChunker(self)
+        self.prefixes = PrefixManager(self.db, self.redis)
+        await self.prefixes.load()
+        await self.prefixes.start()
 
         await self.load_all_extensions()
 
-        self.web = app
+        self.latency_task = self.loop.create_task(self.sample_latencies())
 
-        app.bot = self
+        if self.serves_web:
+            self.web = app
 
-        self.web_task = self.loop.create_task(app.run_task(host='0.0.0.0', port=8082, use_reloader=False))
+            app.bot = self
+
+            self.web_task = self.loop.create_task(app.run_task(host='0.0.0.0', port=8082, use_reloader=False))
+
+    async def get_counts(self) -> dict[str, int]:
+        """
+        Returns the guild, user and channel counts of the whole bot.
+        """
+        return {
+            'guilds': len(self.guilds),
+            'users': len(self.users),
+            'channels': sum(1 for _ in self.get_all_channels()),
+        }
 
     async def load_all_extensions(self) -> None:
-        for file in os.listdir('./cogs'):
-            if file.endswith('.py'):
-                try:
-                    await self.load_extension(f'cogs.{file[:-3]}')
-                except Exception as e:
+        """
+        Loads every cog in ``./cogs`` and jishaku concurrently, then logs how long each took.
+
+        A cog loads after the extensions named in its module level ``__requires__``.
+        Extensions still loading after ``EXTENSION_TIMEOUT`` seconds finish in the
+        background, so one slow service does not hold up startup.
+        """
+        requires: dict[str, tuple[str, ...]] = {
+            f'cogs.{file[:-3]}': _read_requires(f'./cogs/{file}')
+            for file in sorted(os.listdir('./cogs'))
+            if file.endswith('.py')
+        }
+        requires['jishaku'] = ()
+
+        # Raises CycleError before anything loads, instead of hanging on a cycle.
+        graphlib.TopologicalSorter(requires).prepare()
+
+        loads: dict[str, asyncio.Task[bool]] = {}
+
+        async def load(name: str) -> bool:
+            for dependency in requires[name]:
+                if dependency not in loads or not await asyncio.shield(loads[dependency]):
                     self.logger.critical(
-                        f'Unable to load extension: {file}, ignoring. Exception: {e}'
+                        f'Unable to load extension: {name}, it requires {dependency} which did not load.'
                     )
-        await self.load_extension('jishaku')
+
+                    return False
+
+            start = time.perf_counter()
+
+            try:
+                await self.load_extension(name)
+            except Exception as e:
+                self.logger.critical(
+                    f'Unable to load extension: {name}, ignoring. Exception: {e}'
+                )
+
+                return False
+            finally:
+                self.extension_load_times[name] = round(
+                    (time.perf_counter() - start) * 1000, 2
+                )
+
+            return True
+
+        for name in requires:
+            loads[name] = asyncio.create_task(load(name))
+
+        start = time.perf_counter()
+        _, pending = await asyncio.wait(loads.values(), timeout=self.EXTENSION_TIMEOUT)
+
+        breakdown = '\n'.join(
+            f'    {name}: {millis}ms'
+            for name, millis in sorted(
+                self.extension_load_times.items(), key=lambda item: item[1], reverse=True
+            )
+        )
+        self.logger.info(
+            f'{len(loads) - len(pending)}/{len(loads)} extensions done in '
+            f'{(time.perf_counter() - start) * 1000:.2f}ms:\n{breakdown}'
+        )
+
+        for name, task in loads.items():
+            if task in pending:
+                self.logger.warning(f'{name} is still loading, continuing in the background.')
+                task.add_done_callback(
+                    lambda _, name=name: self.logger.info(
+                        f'{name} finished loading in {self.extension_load_times.get(name)}ms.'
+                    )
+                )
+                self.pending_extensions.add(task)
+                task.add_done_callback(self.pending_extensions.discard)
 
     async def get_context(
         self, origin: Message | Interaction, *, cls: Type[ContextT] = MISSING
@@ -206,38 +438,63 @@ class BoboBot(commands.Bot):
         return await super().get_context(origin, cls=self.context)
 
     async def unload_all_extensions(self):
-        for file in os.listdir('./cogs'):
-            if file.endswith('.py'):
-                try:
-                    await self.unload_extension(f'cogs.{file[:-3]}')
-                except Exception as e:
-                    self.logger.critical(
-                        f'Unable to unload extension: {file}, ignoring. Exception: {e}'
-                    )
-
-        await self.unload_extension('jishaku')
+        # Only what actually loaded, newest first, so cogs unload before what they require.
+        for name in reversed(list(self.extensions)):
+            try:
+                await self.unload_extension(name)
+            except Exception as e:
+                self.logger.critical(
+                    f'Unable to unload extension: {name}, ignoring. Exception: {e}'
+                )
 
     async def close(self) -> None:
+        if self.latency_task:
+            self.latency_task.cancel()
+
+        for task in self.pending_extensions:
+            task.cancel()
+
+        if self.command_usage is not MISSING:
+            try:
+                await self.command_usage.close()
+            except Exception as e:
+                self.logger.critical(f'Unable to flush command usage: {e}')
+
+        # Before Redis closes, so pending rate limit writes land.
+        if self.ratelimiter is not MISSING:
+            await self.ratelimiter.close()
+
+        # Also before Redis closes, cogs close their caches on unload and the
+        # delete message manager flushes its buffered writes last.
+        await self.unload_all_extensions()
+
+        for manager in (self.prefixes, self.delete_message_manager):
+            if manager is not MISSING:
+                await manager.close()
+
         tasks = [
-            self.unload_all_extensions(),
-            self.db.close(),
-            self.session.close(),
-            self.redis.close(),
-            self.html_session.close(),
-            self.web.shutdown(),
+            resource.close()
+            for resource in (self.chunker, self.db, self.session, self.redis)
+            if resource is not MISSING
         ]
 
+        if self.web_task is not MISSING:
+            tasks.append(self.web.shutdown())
+
         await asyncio.gather(*tasks)
-        await self.web_task
+
+        if self.web_task is not MISSING:
+            await self.web_task
 
         await super().close()
 
-    def run(self) -> None:
-        try:
-            mode = sys.argv[1]
-        except IndexError:
-            mode = 'dev'
-        
+    def run(self, mode: str | None = None) -> None:
+        if mode is None:
+            try:
+                mode = sys.argv[1]
+            except IndexError:
+                mode = 'dev'
+
         if mode == 'dev':
             super().run(token=token)
         else:
@@ -1,15 +1,78 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import sys
+import time
+import uuid
 from abc import ABC
-from typing import TYPE_CHECKING
+from collections import Counter, OrderedDict
+from copy import copy
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, ClassVar, Iterable, TypeVar
+from weakref import WeakSet
+
+from .utils import SingleFlight, should_refresh_early
 
 if TYPE_CHECKING:
-    from redis.asyncio.client import Redis
+    from redis.asyncio.client import Pipeline, PubSub, Redis
     from discord.types.snowflake import SnowflakeList
 
     from .types import PossibleRTFMSources
 
-__all__ = ('DeleteMessageManager', 'RTFMCacheManager', 'ReactionRoleManager')
+__all__ = (
+    'CacheStats',
+    'TwoTierCacheManager',
+    'DeleteMessageManager',
+    'RTFMCacheManager',
+    'ReactionRoleManager',
+)
+__log__ = logging.getLogger('BoboBot')
+
+T = TypeVar('T')
+
+_MISSING: Any = object()
+
+
+def _sizeof(value: Any) -> int:
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        size += sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_sizeof(v) for v in value)
+
+    return size
+
+
+class CacheStats:
+    __slots__ = ('hits', 'misses', 'evictions', 'invalidations')
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __repr__(self) -> str:
+        return (
+            f'<CacheStats hits={self.hits} misses={self.misses} '
+            f'evictions={self.evictions} invalidations={self.invalidations}>'
+        )
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, int | float]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_ratio': round(self.hit_ratio, 4),
+        }
 
 
 class CacheManager(ABC):
@@ -23,62 +86,545 @@ class RedisCacheManager(CacheManager):
         self.redis = redis
 
 
-class DeleteMessageManager(RedisCacheManager):
-    __slots__ = ()
+class TwoTierCacheManager(RedisCacheManager):
+    """
+    A Redis cache with a bounded in-process LRU in front of it.
+
+    Local entries expire after :attr:`TTL` seconds and the whole local tier is kept
+    under :attr:`MAX_BYTES`. Writes publish the key they touched on a Redis channel
+    so other processes drop their stale local copy, call :meth:`start` to listen.
+
+    Every write bumps the key's generation, and a load only fills the local tier
+    if no write happened while it was waiting on Redis.
+    """
+
+    __slots__ = (
+        '_local',
+        '_size',
+        '_generations',
+        '_loads',
+        '_id',
+        '_pubsub',
+        '_listener',
+        'stats',
+        '__weakref__',
+    )
+
+    CHANNEL: ClassVar[str] = 'cache_invalidation'
+    TTL: ClassVar[float] = 60
+    MAX_BYTES: ClassVar[int] = 4 * 1024 * 1024
+
+    instances: ClassVar[WeakSet[TwoTierCacheManager]] = WeakSet()
+
+    def __init__(self, redis: Redis) -> None:
+        super().__init__(redis)
+
+        self._local: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._size = 0
+        # Only tracked while a load of the key is in flight.
+        self._generations: dict[str, int] = {}
+        self._loads: Counter[str] = Counter()
+        self._id = uuid.uuid4().hex
+        self._pubsub: PubSub | None = None
+        self._listener: asyncio.Task[None] | None = None
+
+        self.stats = CacheStats()
+        self.instances.add(self)
+
+    @property
+    def size(self) -> int:
+        """The approximate number of bytes held by the local tier."""
+        return self._size
+
+    async def start(self) -> None:
+        """
+        Subscribes to invalidations published by other processes.
+        """
+        if self._listener:
+            return
+
+        self._pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.CHANNEL)
+
+        self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+
+        if self._pubsub:
+            await self._pubsub.close()
+            self._pubsub = None
+
+    async def _listen(self) -> None:
+        assert self._pubsub is not None
+
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    origin, _, key = str(message['data']).partition(':')
+
+                    if origin != self._id:
+                        self._drop_local(key)
+                        self._written(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                __log__.warning(f'{type(self).__name__} invalidation listener failed: {e}')
+
+                await asyncio.sleep(1)
+
+    def _get_local(self, key: str) -> Any:
+        try:
+            expires_at, _, value = self._local[key]
+        except KeyError:
+            self.stats.misses += 1
+
+            return _MISSING
+
+        if expires_at < time.monotonic():
+            self._drop_local(key)
+            self.stats.misses += 1
+
+            return _MISSING
+
+        self._local.move_to_end(key)
+        self.stats.hits += 1
+
+        return value
+
+    def _peek_local(self, key: str) -> Any:
+        # Like _get_local, for writers updating an entry in place, so stats and order are untouched.
+        entry = self._local.get(key)
+
+        if entry is None or entry[0] < time.monotonic():
+            return _MISSING
+
+        return entry[2]
+
+    def _set_local(self, key: str, value: Any) -> None:
+        size = _sizeof(key) + _sizeof(value)
+
+        if size > self.MAX_BYTES:
+            return
+
+        self._drop_local(key)
+
+        self._local[key] = (time.monotonic() + self.TTL, size, value)
+        self._size += size
+
+        while self._size > self.MAX_BYTES:
+            _, (_, evicted_size, _) = self._local.popitem(last=False)
+            self._size -= evicted_size
+            self.stats.evictions += 1
+
+    def _drop_local(self, key: str) -> None:
+        if entry := self._local.pop(key, None):
+            self._size -= entry[1]
+
+    def _written(self, *keys: str) -> None:
+        # Call once the write is done, loads that started earlier may have read the old value.
+        for key in keys:
+            if key in self._generations:
+                self._generations[key] += 1
+
+    def _start_load(self, key: str) -> int:
+        self._loads[key] += 1
+
+        return self._generations.setdefault(key, 0)
+
+    def _finish_load(self, key: str, generation: int) -> bool:
+        # Whether nothing was written to the key since the load started.
+        current = self._generations[key]
+        self._loads[key] -= 1
+
+        if not self._loads[key]:
+            del self._loads[key]
+            del self._generations[key]
+
+        return current == generation
+
+    async def _get_or_load(self, key: str, loader: Callable[[], Awaitable[T]]) -> T:
+        # Copies, so callers can't change what other callers get from the local tier.
+        if (value := self._get_local(key)) is not _MISSING:
+            return copy(value)
+
+        generation = self._start_load(key)
+
+        try:
+            value = await loader()
+        finally:
+            fresh = self._finish_load(key, generation)
+
+        if fresh:
+            self._set_local(key, value)
+
+        return copy(value)
+
+    def _invalidate_in(self, pipe: Pipeline, key: str) -> None:
+        # Same as invalidate, but rides along with a pipeline the caller executes.
+        # The caller calls _written once it has.
+        self._drop_local(key)
+        self._publish_in(pipe, key)
+
+    def _publish_in(self, pipe: Pipeline, key: str) -> None:
+        # Invalidates only other processes, for writers that updated their local copy.
+        self.stats.invalidations += 1
+
+        pipe.publish(self.CHANNEL, f'{self._id}:{key}')
+
+    async def invalidate(self, key: str) -> None:
+        """
+        Drops a key from the local tier of every process.
+        """
+        self._drop_local(key)
+        self._written(key)
+        self.stats.invalidations += 1
+
+        await self.redis.publish(self.CHANNEL, f'{self._id}:{key}')
+
+
+class DeleteMessageManager(TwoTierCacheManager):
+    """
+    Remembers which replies belong to which command message.
+
+    :meth:`add_message` is on the hot path of every send, so it only buffers the
+    write. Everything buffered during one event loop tick is written in a single
+    pipeline, and reads or deletes of a key wait for its pending write first.
+
+    Writes also keep the local tier up to date instead of invalidating it, so
+    re-running an edited command usually does not touch Redis.
+    """
+
+    __slots__ = ('_buffer', '_flushing', '_flush_task')
+
+    TTL = 900
+    EXPIRY = 86400
+
+    def __init__(self, redis: Redis) -> None:
+        super().__init__(redis)
+
+        self._buffer: dict[str, list[int]] = {}
+        self._flushing: dict[str, list[int]] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+
+    async def close(self) -> None:
+        await self.flush()
+        await super().close()
+
+    async def flush(self) -> None:
+        """
+        Waits until every buffered write has been sent to Redis.
+        """
+        while self._flush_task:
+            await asyncio.shield(self._flush_task)
+
+    async def _wait_for(self, key: str) -> None:
+        if key in self._buffer or key in self._flushing:
+            await self.flush()
+
+    def _schedule_flush(self) -> None:
+        if not self._flush_task:
+            self._flush_task = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        try:
+            # Let every send of this tick add to the buffer before writing it.
+            await asyncio.sleep(0)
+
+            while self._buffer:
+                self._flushing, self._buffer = self._buffer, {}
+
+                try:
+                    async with self.redis.pipeline(transaction=False) as pipe:
+                        for key, messages in self._flushing.items():
+                            pipe.lpush(key, *messages)
+                            pipe.expire(key, self.EXPIRY)
+                            self._publish_in(pipe, key)
+
+                        await pipe.execute()
+
+                    self._written(*self._flushing)
+                except Exception as e:
+                    __log__.warning(
+                        f'Failed to write {len(self._flushing)} delete message entries: {e}'
+                    )
+                finally:
+                    self._flushing = {}
+        finally:
+            self._flush_task = None
 
     async def get_messages(
         self, message_id: int, one_only: bool = False
     ) -> SnowflakeList:
-        return [
-            int(i)
-            for i in await self.redis.lrange(
-                f'delete_messages:{message_id}', 0, 0 if one_only else -1
-            )
-        ]
+        key = f'delete_messages:{message_id}'
+
+        async def load() -> SnowflakeList:
+            await self._wait_for(key)
+
+            return [int(i) for i in await self.redis.lrange(key, 0, -1)]
+
+        messages = await self._get_or_load(key, load)
+
+        return messages[:1] if one_only else messages
+
+    async def get_many(self, message_ids: Iterable[int]) -> dict[int, SnowflakeList]:
+        """
+        Returns the replies of every message that has any, reading the ones
+        missing from the local tier in a single pipeline.
+        """
+        found: dict[int, SnowflakeList] = {}
+        missing: list[int] = []
+
+        for message_id in message_ids:
+            messages = self._get_local(f'delete_messages:{message_id}')
+
+            if messages is _MISSING:
+                missing.append(message_id)
+            elif messages:
+                found[message_id] = messages.copy()
+
+        if not missing:
+            return found
 
-    async def add_message(self, message_id: int, message_maybe_delete: int) -> None:
-        await self.redis.lpush(f'delete_messages:{message_id}', message_maybe_delete)
+        if any(f'delete_messages:{m}' in self._buffer for m in missing) or self._flushing:
+            await self.flush()
 
-        await self.redis.expire(f'delete_messages:{message_id}', 86400)
+        keys = [f'delete_messages:{message_id}' for message_id in missing]
+        generations = [self._start_load(key) for key in keys]
+
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.lrange(key, 0, -1)
+
+                results = await pipe.execute()
+        finally:
+            fresh = [
+                self._finish_load(key, generation) for key, generation in zip(keys, generations)
+            ]
+
+        for message_id, key, is_fresh, result in zip(missing, keys, fresh, results):
+            messages = [int(i) for i in result]
+
+            if is_fresh:
+                self._set_local(key, messages.copy())
+
+            if messages:
+                found[message_id] = messages
+
+        return found
+
+    async def delete_many(self, message_ids: Iterable[int]) -> None:
+        keys = [f'delete_messages:{message_id}' for message_id in message_ids]
+
+        if not keys:
+            return
+
+        if any(key in self._buffer for key in keys) or self._flushing:
+            await self.flush()
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys)
+
+            for key in keys:
+                self._invalidate_in(pipe, key)
+
+            await pipe.execute()
+
+        self._written(*keys)
+
+        for key in keys:
+            self._set_local(key, [])
+
+    async def add_message(
+        self, message_id: int, message_maybe_delete: int, *, first: bool = False
+    ) -> None:
+        """
+        Records a reply to ``message_id``, pass ``first`` if it is known to be the
+        first reply, so the local copy can be created without reading Redis.
+        """
+        key = f'delete_messages:{message_id}'
+
+        self._buffer.setdefault(key, []).append(message_maybe_delete)
+        self._schedule_flush()
+        # A load already reading Redis would not see this message.
+        self._written(key)
+
+        if first:
+            self._set_local(key, [message_maybe_delete])
+        elif (messages := self._peek_local(key)) is not _MISSING:
+            self._set_local(key, [message_maybe_delete, *messages])
+        else:
+            # Only part of the list is known, readers wait for the write and load it.
+            self._drop_local(key)
 
     async def remove_message(self, message_id: int, message_to_delete: int) -> None:
-        await self.redis.lrem(f'delete_messages:{message_id}', 0, message_to_delete)
+        key = f'delete_messages:{message_id}'
+
+        await self._wait_for(key)
+        await self.redis.lrem(key, 0, message_to_delete)
+
+        messages = self._peek_local(key)
+        await self.invalidate(key)
+
+        if messages is not _MISSING:
+            self._set_local(key, [m for m in messages if m != message_to_delete])
 
     async def delete_messages(self, message_id: int) -> None:
-        await self.redis.delete(f'delete_messages:{message_id}')
+        key = f'delete_messages:{message_id}'
 
+        await self._wait_for(key)
+        await self.redis.delete(key)
+        await self.invalidate(key)
 
-class RTFMCacheManager(RedisCacheManager):
-    __slots__ = ()
+        # Known to be empty now, e.g. for a later bulk delete including the message.
+        self._set_local(key, [])
+
+
+class RTFMCacheManager(TwoTierCacheManager):
+    """
+    Caches RTFM results, coalescing concurrent misses for the same key into a single
+    fetch and refreshing hot keys shortly before they expire.
+    """
+
+    __slots__ = ('_flight', '_expiries', '_deltas')
+
+    TTL = 3600
+    MAX_BYTES = 32 * 1024 * 1024
+    EXPIRY = 86400
+
+    def __init__(self, redis: Redis) -> None:
+        super().__init__(redis)
+
+        self._flight: SingleFlight[dict[str, str]] = SingleFlight()
+        self._expiries: dict[str, float] = {}
+        self._deltas: dict[str, float] = {}
 
     async def add(
         self, source: PossibleRTFMSources, query: str, nodes: dict[str, str]
     ) -> None:
-        await self.redis.hmset(f'rtfm:{source}:{query}', nodes)
+        key = f'rtfm:{source}:{query}'
 
-        await self.redis.expire(f'rtfm:{source}:{query}', 86400)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=nodes)
+            pipe.expire(key, self.EXPIRY)
+            self._invalidate_in(pipe, key)
+
+            await pipe.execute()
+
+        self._written(key)
+        self._expiries[key] = time.time() + self.EXPIRY
 
     async def get(
         self, source: PossibleRTFMSources, query: str
     ) -> dict[str, str] | None:
+        key = f'rtfm:{source}:{query}'
+
+        async def load() -> dict[str, str]:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hgetall(key)
+                pipe.ttl(key)
+
+                nodes, ttl = await pipe.execute()
+
+            if ttl > 0:
+                self._expiries[key] = time.time() + ttl
+
+            return nodes
+
         return (
-            await self.redis.hgetall(f'rtfm:{source}:{query}')
+            await self._get_or_load(key, load)
         ) or None  # If it returns empty Dict, returns None.
 
+    async def _fetch_and_add(
+        self,
+        source: PossibleRTFMSources,
+        query: str,
+        fetch: Callable[[], Awaitable[dict[str, str]]],
+    ) -> dict[str, str]:
+        start = time.perf_counter()
+        nodes = await fetch()
+
+        self._deltas[f'rtfm:{source}:{query}'] = time.perf_counter() - start
+
+        if nodes:
+            await self.add(source, query, nodes)
 
-class ReactionRoleManager(RedisCacheManager):
+        return nodes
+
+    async def get_or_fetch(
+        self,
+        source: PossibleRTFMSources,
+        query: str,
+        fetch: Callable[[], Awaitable[dict[str, str]]],
+    ) -> dict[str, str]:
+        """
+        Returns the cached nodes, calling ``fetch`` and caching its result on a miss.
+
+        Concurrent misses for the same key share one ``fetch``, and a hit close to
+        expiring may start a background refresh.
+        """
+        if nodes := await self.get(source, query):
+            self.refresh_early(source, query, fetch)
+
+            return nodes
+
+        return await self._flight.do(
+            f'rtfm:{source}:{query}', lambda: self._fetch_and_add(source, query, fetch)
+        )
+
+    def refresh_early(
+        self,
+        source: PossibleRTFMSources,
+        query: str,
+        fetch: Callable[[], Awaitable[dict[str, str]]],
+    ) -> None:
+        """
+        Starts refreshing the key in the background if it is close to expiring,
+        for callers that keep what :meth:`get_or_fetch` returned in memory.
+        """
+        key = f'rtfm:{source}:{query}'
+        expires_at = self._expiries.get(key)
+
+        if expires_at and should_refresh_early(expires_at, self._deltas.get(key, 1.0)):
+            self._flight.start(key, lambda: self._fetch_and_add(source, query, fetch))
+
+
+class ReactionRoleManager(TwoTierCacheManager):
     __slots__ = ()
 
+    TTL = 600
+
     async def add(self, message_id: int, role_id: int, emoji: str) -> None:
         await self.redis.hset(f'reaction_roles:{message_id}', emoji, role_id)
+        await self.invalidate(f'reaction_roles:{message_id}')
+
+    async def add_many(self, reaction_roles: list[tuple[int, int, str]]) -> None:
+        """
+        Adds ``(message_id, role_id, emoji)`` entries in a single round trip.
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for message_id, role_id, emoji in reaction_roles:
+                key = f'reaction_roles:{message_id}'
+
+                pipe.hset(key, emoji, role_id)
+                self._invalidate_in(pipe, key)
+
+            await pipe.execute()
+
+        self._written(*(f'reaction_roles:{message_id}' for message_id, _, _ in reaction_roles))
 
     async def get_message(self, message_id: int) -> dict[str, int]:
-        return {
-            k: int(v)
-            for k, v in (
-                await self.redis.hgetall(f'reaction_roles:{message_id}')
-            ).items()
-        }
+        key = f'reaction_roles:{message_id}'
+
+        async def load() -> dict[str, int]:
+            return {k: int(v) for k, v in (await self.redis.hgetall(key)).items()}
+
+        # Most reactions are not on reaction role messages, so empty results are cached too.
+        return await self._get_or_load(key, load)
 
     async def delete(self, message_id: int) -> None:
         await self.redis.delete(f'reaction_roles:{message_id}')
+        await self.invalidate(f'reaction_roles:{message_id}')
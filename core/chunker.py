@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, ClassVar, Iterable
+
+import config
+
+if TYPE_CHECKING:
+    from discord import Guild
+
+    from .bot import BoboBot
+
+__all__ = ('GuildChunker',)
+__log__ = logging.getLogger('BoboBot')
+
+
+class GuildChunker:
+    """
+    Requests guild members in the background, a few guilds at a time.
+
+    Guilds are chunked in priority order, busiest first, with at most
+    :attr:`CONCURRENCY` requests in flight and :attr:`REQUESTS_PER_MINUTE`
+    requests per shard, leaving the rest of the gateway rate limit to
+    heartbeats and presences. :meth:`ensure` moves a guild to the front.
+
+    With ``member_cache_guilds`` set in the config, only that many guilds keep
+    their members. The least recently used guild loses them, except for the bot
+    itself and members in voice, and is chunked again on its next use.
+
+    Which guilds are chunked is tracked here rather than read from ``Guild.chunked``,
+    which turns false whenever the member count drifts from the cache.
+    """
+
+    __slots__ = (
+        'bot',
+        '_queue',
+        '_futures',
+        '_in_progress',
+        '_next_request',
+        '_counter',
+        '_workers',
+        '_recent',
+        '_chunked',
+        'total',
+        'done',
+        'failed',
+        'started_at',
+        'finished_at',
+        'evicted',
+    )
+
+    CONCURRENCY: ClassVar[int] = 2
+    REQUESTS_PER_MINUTE: ClassVar[int] = 60
+    TIMEOUT: ClassVar[float] = 60
+    MAX_GUILDS: ClassVar[int | None] = getattr(config, 'member_cache_guilds', None)
+
+    def __init__(self, bot: BoboBot) -> None:
+        self.bot = bot
+
+        self._queue: asyncio.PriorityQueue[tuple[tuple[float, int], int, int]] = (
+            asyncio.PriorityQueue()
+        )
+        self._futures: dict[int, asyncio.Future[None]] = {}
+        # ensure queues a guild again, so the same guild can be dequeued twice.
+        self._in_progress: set[int] = set()
+        self._next_request: dict[int, float] = {}
+        self._counter = itertools.count()
+        self._workers: list[asyncio.Task[None]] = []
+        self._recent: OrderedDict[int, None] = OrderedDict()
+        self._chunked: set[int] = set()
+
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.evicted = 0
+
+    def _future_for(self, guild_id: int) -> asyncio.Future[None]:
+        if (future := self._futures.get(guild_id)) is None:
+            future = self._futures[guild_id] = asyncio.get_running_loop().create_future()
+
+        return future
+
+    def _put(self, guild: Guild, priority: tuple[float, int]) -> None:
+        self._queue.put_nowait((priority, next(self._counter), guild.id))
+
+    def schedule(self, guilds: Iterable[Guild], uses: dict[int, int]) -> None:
+        """
+        Queues every guild that is not chunked yet, ordered by ``uses``,
+        the recent command uses per guild ID, then by member count.
+
+        Only the first ``MAX_GUILDS`` are queued when that limit is set.
+        """
+        if self.MAX_GUILDS is not None:
+            guilds = sorted(
+                guilds, key=lambda g: (-uses.get(g.id, 0), g.member_count or 0)
+            )[: self.MAX_GUILDS]
+
+        for guild in guilds:
+            if self.is_chunked(guild) or guild.id in self._futures:
+                continue
+
+            self._future_for(guild.id)
+            self._put(guild, (-uses.get(guild.id, 0), guild.member_count or 0))
+            self.total += 1
+
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+
+        self.start()
+
+    async def ensure(self, guild: Guild) -> None:
+        """
+        Chunks ``guild`` before anything else that is queued, and waits for it.
+        """
+        if self.is_chunked(guild):
+            self.touch(guild)
+
+            return
+
+        if guild.id not in self._futures:
+            self.total += 1
+
+        future = self._future_for(guild.id)
+        self._put(guild, (float('-inf'), 0))
+        self.start()
+
+        await asyncio.shield(future)
+
+    def start(self) -> None:
+        if self._workers:
+            return
+
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.CONCURRENCY)
+        ]
+
+    async def close(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+
+        self._workers = []
+
+    async def _wait_for_slot(self, shard_id: int) -> None:
+        # Slots are reserved before sleeping, so concurrent workers never share one.
+        now = time.monotonic()
+        slot = max(now, self._next_request.get(shard_id, now))
+        self._next_request[shard_id] = slot + 60 / self.REQUESTS_PER_MINUTE
+
+        await asyncio.sleep(slot - now)
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, guild_id = await self._queue.get()
+
+            future = self._futures.get(guild_id)
+
+            if future is None or guild_id in self._in_progress:
+                continue
+
+            if not (guild := self.bot.get_guild(guild_id)) or self.is_chunked(guild):
+                self._finish(guild_id, future)
+
+                continue
+
+            self._in_progress.add(guild_id)
+
+            try:
+                await self._wait_for_slot(guild.shard_id)
+                await asyncio.wait_for(guild.chunk(), self.TIMEOUT)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                __log__.warning(f'Failed to chunk guild {guild_id}: {e}')
+            else:
+                self._chunked.add(guild_id)
+                self.touch(guild)
+            finally:
+                self._in_progress.discard(guild_id)
+
+            self._finish(guild_id, future)
+
+    def is_chunked(self, guild: Guild) -> bool:
+        """
+        Whether the members of ``guild`` were requested and not evicted since.
+        """
+        return guild.id in self._chunked or guild.chunked
+
+    def forget(self, guild: Guild) -> None:
+        """
+        Drops what is known about ``guild``, for when the bot leaves it.
+        """
+        self._chunked.discard(guild.id)
+        self._recent.pop(guild.id, None)
+
+    def touch(self, guild: Guild) -> None:
+        """
+        Marks the members of ``guild`` as recently used, evicting idle guilds over the limit.
+        """
+        if self.MAX_GUILDS is None or not self.is_chunked(guild):
+            return
+
+        self._recent[guild.id] = None
+        self._recent.move_to_end(guild.id)
+
+        while len(self._recent) > self.MAX_GUILDS:
+            guild_id, _ = self._recent.popitem(last=False)
+
+            idle = self.bot.get_guild(guild_id)
+
+            if idle and guild_id not in self._in_progress:
+                self._evict(idle)
+
+    def _evict(self, guild: Guild) -> None:
+        keep = {self.bot.user and self.bot.user.id}
+        keep.update(member.id for member in guild.members if member.voice)
+
+        # The same removal discord.py does when a member leaves, so its caches stay consistent.
+        for member in guild.members:
+            if member.id not in keep:
+                guild._remove_member(member)
+
+        # Chunked again the next time it is needed.
+        self._chunked.discard(guild.id)
+        self.evicted += 1
+
+    def member_cache(self) -> dict[str, Any]:
+        return {
+            'members': sum(len(guild._members) for guild in self.bot.guilds),
+            'users': len(self.bot.users),
+            'chunked_guilds': sum(1 for guild in self.bot.guilds if self.is_chunked(guild)),
+            'guild_limit': self.MAX_GUILDS,
+            'evicted': self.evicted,
+        }
+
+    def _finish(self, guild_id: int, future: asyncio.Future[None]) -> None:
+        self.done += 1
+        del self._futures[guild_id]
+        future.set_result(None)
+
+        if not self._futures:
+            self.finished_at = time.monotonic()
+
+    def progress(self) -> dict[str, Any]:
+        """
+        Returns how many guilds are done, failures included, and the estimated seconds left.
+        """
+        remaining = self.total - self.done
+        eta = None
+
+        if self.started_at is not None and self.done and remaining:
+            elapsed = time.monotonic() - self.started_at
+            eta = round(remaining * elapsed / self.done, 1)
+
+        return {
+            'total': self.total,
+            'done': self.done,
+            'failed': self.failed,
+            'remaining': remaining,
+            'eta_seconds': eta,
+            'finished_in': (
+                round(self.finished_at - self.started_at, 1)
+                if self.finished_at is not None and self.started_at is not None
+                else None
+            ),
+        }
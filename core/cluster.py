@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import urllib.request
+import uuid
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, ClassVar
+
+from discord.ext import commands
+
+from config import prod_token, token
+
+from .bot import BoboBot
+
+if TYPE_CHECKING:
+    from redis.asyncio.client import PubSub, Redis
+
+__all__ = ('ClusterIPC', 'ClusteredBoboBot', 'launch_clusters')
+__log__ = logging.getLogger('BoboBot')
+
+Handler = Callable[[], Awaitable[Any]]
+
+
+class ClusterIPC:
+    """
+    Request/response between clusters over Redis pub/sub.
+
+    A request is broadcast to every cluster, each one answers on the
+    requester's own channel, and :meth:`request` returns the answers that
+    arrived before the timeout.
+    """
+
+    __slots__ = (
+        'redis',
+        'cluster_id',
+        'cluster_count',
+        '_handlers',
+        '_pending',
+        '_pubsub',
+        '_listener',
+        '_answering',
+    )
+
+    CHANNEL: ClassVar[str] = 'cluster:ipc'
+
+    def __init__(self, redis: Redis, cluster_id: int, cluster_count: int) -> None:
+        self.redis = redis
+        self.cluster_id = cluster_id
+        self.cluster_count = cluster_count
+
+        self._handlers: dict[str, Handler] = {}
+        # Per request: the future set once every cluster replied, the answers, and who replied.
+        self._pending: dict[
+            str, tuple[asyncio.Future[None], dict[int, Any], set[int]]
+        ] = {}
+        self._pubsub: PubSub | None = None
+        self._listener: asyncio.Task[None] | None = None
+        # The loop only keeps weak references to tasks, these could be collected mid-answer.
+        self._answering: set[asyncio.Task[None]] = set()
+
+    def add_handler(self, endpoint: str, handler: Handler) -> None:
+        self._handlers[endpoint] = handler
+
+    async def start(self) -> None:
+        if self._listener:
+            return
+
+        self._pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.CHANNEL, f'{self.CHANNEL}:{self.cluster_id}')
+
+        self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+
+        for task in self._answering:
+            task.cancel()
+
+        if self._pubsub:
+            await self._pubsub.close()
+            self._pubsub = None
+
+    async def _listen(self) -> None:
+        assert self._pubsub is not None
+
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    payload = json.loads(message['data'])
+
+                    if message['channel'] == self.CHANNEL:
+                        task = asyncio.create_task(self._answer(payload))
+                        self._answering.add(task)
+                        task.add_done_callback(self._answering.discard)
+                    else:
+                        self._receive(payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                __log__.warning(f'Cluster {self.cluster_id} IPC listener failed: {e}')
+
+                await asyncio.sleep(1)
+
+    async def _answer(self, payload: dict[str, Any]) -> None:
+        if not (handler := self._handlers.get(payload['endpoint'])):
+            return
+
+        try:
+            data, error = await handler(), None
+        except Exception as e:
+            data, error = None, f'{type(e).__name__}: {e}'
+
+        await self.redis.publish(
+            f'{self.CHANNEL}:{payload["reply_to"]}',
+            json.dumps(
+                {
+                    'nonce': payload['nonce'],
+                    'cluster_id': self.cluster_id,
+                    'data': data,
+                    'error': error,
+                }
+            ),
+        )
+
+    def _receive(self, payload: dict[str, Any]) -> None:
+        if not (pending := self._pending.get(payload['nonce'])):
+            return
+
+        done, responses, replied = pending
+        replied.add(payload['cluster_id'])
+
+        if payload['error']:
+            __log__.warning(
+                f'Cluster {payload["cluster_id"]} failed to answer: {payload["error"]}'
+            )
+        else:
+            responses[payload['cluster_id']] = payload['data']
+
+        # A failed answer still counts, waiting for it would only run into the timeout.
+        if len(replied) >= self.cluster_count and not done.done():
+            done.set_result(None)
+
+    async def request(self, endpoint: str, *, timeout: float = 2.0) -> dict[int, Any]:
+        """
+        Asks every cluster, including this one, and returns their answers by cluster ID.
+        """
+        nonce = uuid.uuid4().hex
+        done: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        responses: dict[int, Any] = {}
+
+        self._pending[nonce] = (done, responses, set())
+
+        try:
+            await self.redis.publish(
+                self.CHANNEL,
+                json.dumps(
+                    {'nonce': nonce, 'endpoint': endpoint, 'reply_to': self.cluster_id}
+                ),
+            )
+
+            try:
+                await asyncio.wait_for(done, timeout)
+            except asyncio.TimeoutError:
+                __log__.warning(
+                    f'{endpoint} IPC request got {len(responses)}/{self.cluster_count} answers'
+                )
+        finally:
+            del self._pending[nonce]
+
+        return responses
+
+
+class ClusteredBoboBot(BoboBot, commands.AutoShardedBot):
+    """
+    A :class:`BoboBot` running a range of shards as one of several clusters.
+    """
+
+    def __init__(
+        self,
+        *,
+        cluster_id: int,
+        cluster_count: int,
+        shard_ids: list[int],
+        shard_count: int,
+    ) -> None:
+        self.cluster_id = cluster_id
+        self.cluster_count = cluster_count
+        self.ipc: ClusterIPC | None = None
+
+        super().__init__(shard_ids=shard_ids, shard_count=shard_count)
+
+    @property
+    def serves_web(self) -> bool:  # type: ignore
+        return self.cluster_id == 0
+
+    @property
+    def primary(self) -> bool:  # type: ignore
+        return self.cluster_id == 0
+
+    async def initialize_constants(self) -> None:
+        await super().initialize_constants()
+
+        self.ipc = ClusterIPC(self.redis, self.cluster_id, self.cluster_count)
+        self.ipc.add_handler('counts', super().get_counts)
+        await self.ipc.start()
+
+    async def get_counts(self) -> dict[str, int]:
+        assert self.ipc is not None
+
+        totals = {'guilds': 0, 'users': 0, 'channels': 0}
+
+        # Users in guilds of several clusters are counted once per cluster.
+        for counts in (await self.ipc.request('counts')).values():
+            for key in totals:
+                totals[key] += counts[key]
+
+        return totals
+
+    async def close(self) -> None:
+        # Closing before initialize_constants ran, e.g. on a failed login.
+        if self.ipc:
+            await self.ipc.close()
+
+        await super().close()
+
+
+def recommended_shard_count(bot_token: str) -> int:
+    request = urllib.request.Request(
+        'https://discord.com/api/v10/gateway/bot',
+        headers={'Authorization': f'Bot {bot_token}', 'User-Agent': 'BoboBot'},
+    )
+
+    with urllib.request.urlopen(request) as resp:
+        return json.load(resp)['shards']
+
+
+def _run_cluster(
+    mode: str,
+    cluster_id: int,
+    cluster_count: int,
+    shard_ids: list[int],
+    shard_count: int,
+) -> None:
+    import uvloop
+
+    uvloop.install()
+
+    ClusteredBoboBot(
+        cluster_id=cluster_id,
+        cluster_count=cluster_count,
+        shard_ids=shard_ids,
+        shard_count=shard_count,
+    ).run(mode)
+
+
+def launch_clusters(mode: str, clusters: int, shard_count: int | None = None) -> None:
+    """
+    Splits the shards into ``clusters`` contiguous ranges and runs each one in its own process.
+    """
+    if shard_count is None:
+        shard_count = recommended_shard_count(token if mode == 'dev' else prod_token)
+
+    shard_count = max(shard_count, clusters)
+    per_cluster, extra = divmod(shard_count, clusters)
+
+    # Spawned, so no process inherits another's event loop or sockets.
+    context = multiprocessing.get_context('spawn')
+    processes = []
+    start = 0
+
+    for cluster_id in range(clusters):
+        end = start + per_cluster + (cluster_id < extra)
+        shard_ids = list(range(start, end))
+        start = end
+
+        process = context.Process(
+            target=_run_cluster,
+            args=(mode, cluster_id, clusters, shard_ids, shard_count),
+            name=f'Cluster {cluster_id}',
+        )
+        process.start()
+        processes.append(process)
+
+        __log__.info(f'Started cluster {cluster_id} with shards {shard_ids[0]}-{shard_ids[-1]}')
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+        for process in processes:
+            process.join()
@@ -24,7 +24,12 @@ if TYPE_CHECKING:
     T = TypeVar('T')
 
 
-__all__ = ('user_permissions_predicate', 'bot_permissions_predicate', 'command')
+__all__ = (
+    'user_permissions_predicate',
+    'bot_permissions_predicate',
+    'needs_members',
+    'command',
+)
 
 
 def user_permissions_predicate(ctx: BoboContext) -> bool:
@@ -74,6 +79,22 @@ def bot_permissions_predicate(ctx: BoboContext) -> bool:
     raise commands.BotMissingPermissions(missing)
 
 
+def needs_members() -> Callable[[T], T]:
+    """
+    Chunks the guild before the callback runs, for commands that read its member list.
+
+    Not a check, so help and other ``can_run`` callers never chunk, and it waits until
+    checks, argument parsing and cooldowns have passed. Goes below ``@command``.
+    """
+
+    def decorator(func: T) -> T:
+        func.__needs_members__ = True  # type: ignore
+
+        return func
+
+    return decorator
+
+
 async def process_output(ctx: BoboContext, output: OutputType | None) -> None:
     if output is None:
         return
@@ -125,8 +146,13 @@ async def _command_callback(
 def command_callback(
     func: Callable[..., Awaitable[OutputType] | AsyncGenerator[OutputType, Any]]
 ) -> Callable[..., Awaitable[OutputType] | AsyncGenerator[OutputType, Any]]:
+    needs_members = getattr(func, '__needs_members__', False)
+
     @functools.wraps(func)
     async def wrapper(self: Cog, ctx: BoboContext, *args: Any, **kwargs: Any) -> None:
+        if needs_members and ctx.guild:
+            await ctx.bot.chunker.ensure(ctx.guild)
+
         await _command_callback(ctx, func(self, ctx, *args, **kwargs))
 
     return wrapper
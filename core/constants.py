@@ -14,6 +14,7 @@ class Regexs:
     SPHINX_ENTRY_REGEX: RePattern = re.compile(
         r"(?x)(.+?)\s+(\S*:\S*)\s+(-?\d+)\s+(\S+)\s+(.*)"
     )
+    USER_ID_REGEX: RePattern = re.compile(r'<@!?([0-9]{15,20})>$|([0-9]{15,20})$')
     URL_REGEX: RePattern = re.compile(
         r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*(),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
     )
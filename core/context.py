@@ -19,6 +19,11 @@ __all__ = ('BoboContext',)
 
 
 class BoboContext(commands.Context['BoboBot']):
+    # Set by the on_command listener, used for per-command latency.
+    started_at: float | None = None
+    # Whether send has created a reply for this invocation yet.
+    replied: bool = False
+
     async def confirm(
         self, content: str | None = None, timeout: int = 60, **kwargs: Any
     ) -> bool:
@@ -41,16 +46,17 @@ class BoboContext(commands.Context['BoboBot']):
         return str(await self.bot.mystbin.post(content))
 
     async def get_command_usage(self, command_name: str) -> int:
-        return await self.bot.db.fetchval(
+        uses = await self.bot.db.fetchval(
             'SELECT uses FROM commands_usage WHERE command = $1;',
             command_name,
         )
 
+        return (uses or 0) + self.bot.command_usage.pending(command_name)
+
     async def inicrease_command_usage(self, command_name: str) -> int:
-        return await self.bot.db.fetchval(
-            'INSERT INTO commands_usage VALUES ($1) ON CONFLICT (command) DO UPDATE SET uses = commands_usage.uses + 1 RETURNING uses;',
-            command_name,
-        )
+        self.bot.command_usage.record(command_name)
+
+        return await self.get_command_usage(command_name)
 
     async def send(self, content: str | None = None, **kwargs: Any) -> discord.Message:
         codeblock = kwargs.pop('codeblock', False)
@@ -80,6 +86,7 @@ class BoboContext(commands.Context['BoboBot']):
                     await self.bot.delete_message_manager.add_message(
                         self.message.id, m.id
                     )
+                    self.replied = True
 
                     return m
 
@@ -88,7 +95,13 @@ class BoboContext(commands.Context['BoboBot']):
                 return await m.edit(content=content, **kwargs)
 
         m = await super().send(content, **kwargs)
-        await self.bot.delete_message_manager.add_message(self.message.id, m.id)
+        # A message that was never edited has no replies from earlier invocations.
+        await self.bot.delete_message_manager.add_message(
+            self.message.id,
+            m.id,
+            first=not self.replied and not self.message.edited_at,
+        )
+        self.replied = True
 
         return m
 
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, ClassVar, NamedTuple
+
+if TYPE_CHECKING:
+    from redis.asyncio.client import Pipeline, Redis
+
+__all__ = ('GatewayEventStats', 'EventRates', 'sparkline')
+
+SPARKS = '▁▂▃▄▅▆▇█'
+
+# Adds ARGV[1] to the total in KEYS[1], or seeds it from the sum of the KEYS[2] hash if
+# it does not exist yet. One script, so no INCRBY can create the key between the sum
+# and the set and drop the history. Queued after the HINCRBYs, the sum includes them.
+INCREMENT_TOTAL = '''
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+
+local total = 0
+
+for _, count in ipairs(redis.call('HVALS', KEYS[2])) do
+    total = total + tonumber(count)
+end
+
+redis.call('SET', KEYS[1], total)
+
+return total
+'''
+
+
+def sparkline(series: list[int]) -> str:
+    if not series:
+        return ''
+
+    top = max(series) or 1
+
+    return ''.join(SPARKS[round(value / top * (len(SPARKS) - 1))] for value in series)
+
+
+class EventRates(NamedTuple):
+    """Events per second over the last minute, five minutes and hour."""
+
+    one_minute: float
+    five_minutes: float
+    one_hour: float
+
+
+class GatewayEventStats:
+    """
+    Gateway event counts, kept in Redis.
+
+    Lifetime counts per type live in the ``events`` hash and their sum in
+    ``events:total``, both updated by the same pipeline, so reading the total is O(1).
+    Each flush also adds its counts to a 10 second bucket, which backs the 1m and
+    5m windows, and to a minute bucket, which backs the 1h window and the series.
+    Only complete buckets are read, so rates do not dip at the start of a bucket.
+    """
+
+    __slots__ = ('redis',)
+
+    FINE: ClassVar[int] = 10
+    COARSE: ClassVar[int] = 60
+    FINE_BUCKETS: ClassVar[int] = 30
+    COARSE_BUCKETS: ClassVar[int] = 60
+    TOTAL_KEY: ClassVar[str] = 'events:total'
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+
+    async def ensure_total(self) -> None:
+        """
+        Seeds ``events:total`` from the ``events`` hash if it does not exist yet.
+        """
+        await self.redis.eval(INCREMENT_TOTAL, 2, self.TOTAL_KEY, 'events', 0)
+
+    async def total(self) -> int:
+        return int(await self.redis.get(self.TOTAL_KEY) or 0)
+
+    def add_to(self, pipe: Pipeline, counts: Counter[str], now: float | None = None) -> None:
+        """
+        Queues ``counts`` on a pipeline the caller executes.
+        """
+        now = now or time.time()
+
+        for event, count in counts.items():
+            pipe.hincrby('events', event, count)
+
+        pipe.eval(INCREMENT_TOTAL, 2, self.TOTAL_KEY, 'events', sum(counts.values()))
+
+        for width, buckets in (
+            (self.FINE, self.FINE_BUCKETS),
+            (self.COARSE, self.COARSE_BUCKETS),
+        ):
+            key = f'events:{width}:{int(now // width)}'
+
+            for event, count in counts.items():
+                pipe.hincrby(key, event, count)
+
+            # Kept one bucket longer than read, so the oldest read bucket is never half expired.
+            pipe.expire(key, width * (buckets + 2))
+
+    async def _buckets(
+        self, width: int, count: int, now: float | None = None
+    ) -> list[dict[str, int]]:
+        # Complete buckets only, oldest first.
+        current = int((now or time.time()) // width)
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for bucket in range(current - count, current):
+                pipe.hgetall(f'events:{width}:{bucket}')
+
+            results = await pipe.execute()
+
+        return [{k: int(v) for k, v in result.items()} for result in results]
+
+    @staticmethod
+    def _sum(buckets: list[dict[str, int]]) -> Counter[str]:
+        total: Counter[str] = Counter()
+
+        for bucket in buckets:
+            total.update(bucket)
+
+        return total
+
+    async def rates(self, now: float | None = None) -> dict[str, EventRates]:
+        """
+        Returns the rates of every event type seen in the last hour,
+        busiest first, including a ``'*'`` entry for all types together.
+        """
+        now = now or time.time()
+
+        fine = await self._buckets(self.FINE, self.FINE_BUCKETS, now)
+        coarse = await self._buckets(self.COARSE, self.COARSE_BUCKETS, now)
+
+        windows = (
+            (self._sum(fine[-self.COARSE // self.FINE :]), 60),
+            (self._sum(fine), self.FINE * self.FINE_BUCKETS),
+            (self._sum(coarse), self.COARSE * self.COARSE_BUCKETS),
+        )
+
+        for counts, _ in windows:
+            counts['*'] = sum(counts.values())
+
+        types = sorted(windows[-1][0], key=lambda event: -windows[-1][0][event])
+
+        return {
+            event: EventRates(*(counts[event] / seconds for counts, seconds in windows))
+            for event in types
+        }
+
+    async def series(
+        self,
+        event: str | None = None,
+        *,
+        minutes: int | None = None,
+        now: float | None = None,
+    ) -> list[int]:
+        """
+        Returns per-minute counts of ``event``, or of all events, oldest first.
+        """
+        buckets = await self._buckets(self.COARSE, minutes or self.COARSE_BUCKETS, now)
+
+        if event is None:
+            return [sum(bucket.values()) for bucket in buckets]
+
+        return [bucket.get(event, 0) for bucket in buckets]
+
+    async def peaks(self, now: float | None = None) -> dict[str, tuple[float, int]]:
+        """
+        Returns the busiest minute of the last hour for every event type,
+        as ``(unix timestamp, events)``.
+        """
+        now = now or time.time()
+        first = int(now // self.COARSE) - self.COARSE_BUCKETS
+
+        peaks: dict[str, tuple[float, int]] = {}
+
+        buckets = await self._buckets(self.COARSE, self.COARSE_BUCKETS, now)
+
+        for offset, bucket in enumerate(buckets):
+            timestamp = float((first + offset) * self.COARSE)
+
+            for event, count in (*bucket.items(), ('*', sum(bucket.values()))):
+                if count > peaks.get(event, (0, 0))[1]:
+                    peaks[event] = (timestamp, count)
+
+        return peaks
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict, defaultdict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, ClassVar, Hashable, TypeVar
+
+import discord
+
+from .cache_manager import CacheStats
+from .utils import SingleFlight
+
+if TYPE_CHECKING:
+    from discord.abc import Messageable
+
+    from .bot import BoboBot
+
+__all__ = ('ObjectCache',)
+
+T = TypeVar('T')
+
+
+class ObjectCache:
+    """
+    Gets Discord objects from the gateway cache, falling back to REST.
+
+    Fetched objects are kept for :attr:`TTL` seconds and 404s for
+    :attr:`NEGATIVE_TTL` seconds, in an LRU of :attr:`MAX_ENTRIES`.
+    Concurrent fetches of the same object share one request.
+    """
+
+    __slots__ = ('bot', '_entries', '_flight', 'stats')
+
+    TTL: ClassVar[float] = 300
+    NEGATIVE_TTL: ClassVar[float] = 60
+    MAX_ENTRIES: ClassVar[int] = 4096
+
+    def __init__(self, bot: BoboBot) -> None:
+        self.bot = bot
+
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[float, Any]] = OrderedDict()
+        self._flight: SingleFlight[Any] = SingleFlight()
+        self.stats: defaultdict[str, CacheStats] = defaultdict(CacheStats)
+
+    async def _getch(
+        self,
+        kind: str,
+        key: Hashable,
+        get: Callable[[], T | None],
+        fetch: Callable[[], Awaitable[T]],
+    ) -> T | None:
+        stats = self.stats[kind]
+
+        if (obj := get()) is not None:
+            stats.hits += 1
+
+            return obj
+
+        cache_key = (kind, key)
+
+        if entry := self._entries.get(cache_key):
+            expires_at, obj = entry
+
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(cache_key)
+                stats.hits += 1
+
+                return obj
+
+            del self._entries[cache_key]
+
+        stats.misses += 1
+
+        return await self._flight.do(cache_key, lambda: self._fetch(cache_key, fetch))
+
+    async def _fetch(
+        self, cache_key: tuple[str, Hashable], fetch: Callable[[], Awaitable[T]]
+    ) -> T | None:
+        try:
+            obj = await fetch()
+        except discord.NotFound:
+            obj = None
+
+        ttl = self.TTL if obj is not None else self.NEGATIVE_TTL
+        self._entries[cache_key] = (time.monotonic() + ttl, obj)
+
+        if len(self._entries) > self.MAX_ENTRIES:
+            self._entries.popitem(last=False)
+            self.stats[cache_key[0]].evictions += 1
+
+        return obj
+
+    def invalidate(self, kind: str, key: Hashable) -> None:
+        if self._entries.pop((kind, key), None) is not None:
+            self.stats[kind].invalidations += 1
+
+    async def user(self, user_id: int) -> discord.User | None:
+        return await self._getch(
+            'user',
+            user_id,
+            lambda: self.bot.get_user(user_id),
+            lambda: self.bot.fetch_user(user_id),
+        )
+
+    async def channel(self, channel_id: int) -> Any:
+        return await self._getch(
+            'channel',
+            channel_id,
+            lambda: self.bot.get_channel(channel_id),
+            lambda: self.bot.fetch_channel(channel_id),
+        )
+
+    async def guild(self, guild_id: int) -> discord.Guild | None:
+        return await self._getch(
+            'guild',
+            guild_id,
+            lambda: self.bot.get_guild(guild_id),
+            lambda: self.bot.fetch_guild(guild_id),
+        )
+
+    async def member(self, guild: discord.Guild, member_id: int) -> discord.Member | None:
+        return await self._getch(
+            'member',
+            (guild.id, member_id),
+            lambda: guild.get_member(member_id),
+            lambda: guild.fetch_member(member_id),
+        )
+
+    async def emoji(self, guild: discord.Guild, emoji_id: int) -> discord.Emoji | None:
+        return await self._getch(
+            'emoji',
+            emoji_id,
+            lambda: self.bot.get_emoji(emoji_id),
+            lambda: guild.fetch_emoji(emoji_id),
+        )
+
+    async def message(self, channel: Messageable, message_id: int) -> discord.Message | None:
+        return await self._getch(
+            'message',
+            message_id,
+            lambda: discord.utils.get(self.bot.cached_messages, id=message_id),
+            lambda: channel.fetch_message(message_id),
+        )
+
+    def to_dict(self) -> dict[str, dict[str, int | float]]:
+        return {kind: stats.to_dict() for kind, stats in self.stats.items()}
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import Counter, deque
+from typing import ClassVar, Iterator, NamedTuple
+
+__all__ = ('LatencySamples', 'LatencyPercentiles', 'LatencyHistogram')
+
+
+class LatencySamples:
+    """
+    Keeps the most recent latency samples, in milliseconds, for percentile reporting.
+    """
+
+    __slots__ = ('_samples',)
+
+    def __init__(self, size: int = 1024) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, millis: float) -> None:
+        self._samples.append(millis)
+
+    def percentile(self, percentile: float) -> float | None:
+        """
+        Returns the nearest-rank percentile of the samples, or ``None`` if there are none.
+        """
+        if not self._samples:
+            return None
+
+        ordered = sorted(self._samples)
+        rank = max(math.ceil(percentile / 100 * len(ordered)), 1)
+
+        return ordered[rank - 1]
+
+
+class LatencyPercentiles(NamedTuple):
+    p50: float
+    p95: float
+    p99: float
+
+
+class LatencyHistogram:
+    """
+    A rolling histogram of latencies, in milliseconds, with logarithmic buckets.
+
+    Each bucket is :attr:`PRECISION` wider than the one before, like an HDR
+    histogram, so percentiles stay within that relative error over any range
+    in a few hundred counters. Samples are kept in ``slots`` slices of the
+    ``window``, and the oldest slice is dropped as a new one starts.
+    """
+
+    __slots__ = ('_slot_seconds', '_slot_count', '_slots', 'count')
+
+    PRECISION: ClassVar[float] = 0.01
+    # Anything faster is recorded as this, so the bucket index stays finite.
+    MIN_VALUE: ClassVar[float] = 0.001
+
+    _LOG_BASE: ClassVar[float] = math.log1p(PRECISION)
+
+    def __init__(self, window: float = 600, slots: int = 10) -> None:
+        self._slot_seconds = window / slots
+        self._slot_count = slots
+        self._slots: deque[tuple[int, Counter[int]]] = deque()
+
+        self.count = 0
+
+    def _live_slots(self, now: float) -> Iterator[Counter[int]]:
+        oldest = int(now // self._slot_seconds) - self._slot_count
+
+        while self._slots and self._slots[0][0] <= oldest:
+            self._slots.popleft()
+
+        return (counts for _, counts in self._slots)
+
+    def record(self, millis: float, *, now: float | None = None) -> None:
+        if now is None:
+            now = time.monotonic()
+
+        slot = int(now // self._slot_seconds)
+
+        if not self._slots or self._slots[-1][0] != slot:
+            self._slots.append((slot, Counter()))
+            self._live_slots(now)
+
+        bucket = math.floor(math.log(max(millis, self.MIN_VALUE)) / self._LOG_BASE)
+        self._slots[-1][1][bucket] += 1
+        self.count += 1
+
+    def percentiles(
+        self, *percentiles: float, now: float | None = None
+    ) -> list[float] | None:
+        """
+        Returns the nearest-rank percentiles of the window, or ``None`` if it is empty.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        merged: Counter[int] = Counter()
+
+        for counts in self._live_slots(now):
+            merged.update(counts)
+
+        if not (total := sum(merged.values())):
+            return None
+
+        buckets = sorted(merged.items())
+        results = []
+
+        for percentile in percentiles:
+            rank = max(math.ceil(percentile / 100 * total), 1)
+            seen = 0
+
+            for bucket, count in buckets:
+                seen += count
+
+                if seen >= rank:
+                    # The middle of the bucket, within PRECISION / 2 of any value in it.
+                    results.append(math.exp((bucket + 0.5) * self._LOG_BASE))
+
+                    break
+
+        return results
+
+    def summary(self, *, now: float | None = None) -> LatencyPercentiles | None:
+        if (values := self.percentiles(50, 95, 99, now=now)) is None:
+            return None
+
+        return LatencyPercentiles(*(round(v, 2) for v in values))
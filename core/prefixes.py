@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from typing import TYPE_CHECKING, ClassVar, Iterable
+
+if TYPE_CHECKING:
+    from asyncpg import Pool
+    from redis.asyncio.client import PubSub, Redis
+
+__all__ = ('PrefixManager',)
+__log__ = logging.getLogger('BoboBot')
+
+
+class PrefixManager:
+    """
+    Per-guild command prefixes, served from memory.
+
+    Every guild's prefixes are loaded by :meth:`load` at startup, so :meth:`get`
+    never awaits. Changes are written to Postgres and announced on a Redis
+    channel, on which other processes reload that guild, call :meth:`start` to listen.
+    """
+
+    __slots__ = ('db', 'redis', '_prefixes', '_id', '_pubsub', '_listener')
+
+    CHANNEL: ClassVar[str] = 'prefix_invalidation'
+    MAX_PREFIXES: ClassVar[int] = 10
+    MAX_LENGTH: ClassVar[int] = 32
+
+    def __init__(self, db: Pool, redis: Redis) -> None:
+        self.db = db
+        self.redis = redis
+
+        self._prefixes: dict[int, tuple[str, ...]] = {}
+        self._id = uuid.uuid4().hex
+        self._pubsub: PubSub | None = None
+        self._listener: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._prefixes)
+
+    def get(self, guild_id: int) -> tuple[str, ...] | None:
+        """
+        Returns the prefixes of a guild, longest first, or ``None`` if it uses the default.
+        """
+        return self._prefixes.get(guild_id)
+
+    def _set(self, guild_id: int, prefixes: Iterable[str]) -> None:
+        # Longest first, otherwise `b` would match before `bobo ` and leave `obo ` behind.
+        if ordered := tuple(sorted(prefixes, key=len, reverse=True)):
+            self._prefixes[guild_id] = ordered
+        else:
+            self._prefixes.pop(guild_id, None)
+
+    async def load(self) -> None:
+        rows = await self.db.fetch(
+            'SELECT guild_id, array_agg(prefix) AS prefixes FROM guild_prefixes GROUP BY guild_id'
+        )
+
+        self._prefixes.clear()
+
+        for row in rows:
+            self._set(row['guild_id'], row['prefixes'])
+
+    async def _reload(self, guild_id: int) -> None:
+        rows = await self.db.fetch(
+            'SELECT prefix FROM guild_prefixes WHERE guild_id = $1', guild_id
+        )
+
+        self._set(guild_id, (row['prefix'] for row in rows))
+
+    async def start(self) -> None:
+        """
+        Subscribes to prefix changes made by other processes.
+        """
+        if self._listener:
+            return
+
+        self._pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.CHANNEL)
+
+        self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+
+        if self._pubsub:
+            await self._pubsub.close()
+            self._pubsub = None
+
+    async def _listen(self) -> None:
+        assert self._pubsub is not None
+
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    origin, _, guild_id = str(message['data']).partition(':')
+
+                    if origin != self._id:
+                        await self._reload(int(guild_id))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                __log__.warning(f'Prefix invalidation listener failed: {e}')
+
+                await asyncio.sleep(1)
+
+                # Changes published while the listener was down would be missed otherwise.
+                try:
+                    await self.load()
+                except Exception as e:
+                    __log__.warning(f'Unable to reload prefixes: {e}')
+
+    async def _changed(self, guild_id: int) -> tuple[str, ...]:
+        await self._reload(guild_id)
+        await self.redis.publish(self.CHANNEL, f'{self._id}:{guild_id}')
+
+        return self._prefixes.get(guild_id, ())
+
+    async def add(self, guild_id: int, prefix: str) -> tuple[str, ...]:
+        await self.db.execute(
+            'INSERT INTO guild_prefixes (guild_id, prefix) VALUES ($1, $2) ON CONFLICT DO NOTHING',
+            guild_id,
+            prefix,
+        )
+
+        return await self._changed(guild_id)
+
+    async def remove(self, guild_id: int, prefix: str) -> tuple[str, ...]:
+        await self.db.execute(
+            'DELETE FROM guild_prefixes WHERE guild_id = $1 AND prefix = $2',
+            guild_id,
+            prefix,
+        )
+
+        return await self._changed(guild_id)
+
+    async def reset(self, guild_id: int) -> None:
+        await self.db.execute('DELETE FROM guild_prefixes WHERE guild_id = $1', guild_id)
+        await self._changed(guild_id)
@@ -0,0 +1,442 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, ClassVar
+
+from discord.ext import commands
+from discord.ext.commands.cooldowns import MaxConcurrency
+
+if TYPE_CHECKING:
+    from discord import Message
+    from discord.ext.commands import BucketType, Context, Cooldown
+    from redis.asyncio.client import PubSub, Redis
+    from typing_extensions import Self
+
+__all__ = ('RateLimiter', 'RedisCooldownMapping', 'RedisMaxConcurrency')
+__log__ = logging.getLogger('BoboBot')
+
+# Refills the bucket from the Redis clock, then takes a token if there is one.
+# Returns {1 if taken else 0, tokens left}, and tells other processes the bucket changed.
+TOKEN_BUCKET = '''
+local rate = tonumber(ARGV[1])
+local per = tonumber(ARGV[2])
+
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or rate
+local ts = tonumber(state[2]) or now
+
+tokens = math.min(rate, tokens + (now - ts) * rate / per)
+
+if tokens < 1 then
+    return {0, tostring(tokens)}
+end
+
+tokens = tokens - 1
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+-- A missing bucket is a full one, and any bucket is full again after `per`.
+redis.call('PEXPIRE', KEYS[1], per)
+redis.call('PUBLISH', ARGV[4], ARGV[3] .. ':' .. KEYS[1])
+
+return {1, tostring(tokens)}
+'''
+
+# A semaphore as a sorted set of holders scored by when their hold expires,
+# so holders of a crashed process are dropped instead of leaking.
+# Returns {1 if the holder was added else 0, holders}.
+SEMAPHORE_ACQUIRE = '''
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+
+local count = redis.call('ZCARD', KEYS[1])
+
+if count >= tonumber(ARGV[1]) then
+    return {0, count}
+end
+
+local added = redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[2])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+
+if added == 1 then
+    redis.call('PUBLISH', ARGV[5], ARGV[4] .. ':' .. KEYS[1])
+end
+
+return {added, count + added}
+'''
+
+SEMAPHORE_RELEASE = '''
+local removed = redis.call('ZREM', KEYS[1], ARGV[1])
+
+if removed == 1 then
+    redis.call('PUBLISH', ARGV[3], ARGV[2] .. ':' .. KEYS[1])
+end
+
+return removed
+'''
+
+
+class RateLimiter:
+    """
+    Token bucket cooldowns and semaphores shared by every process through Redis.
+
+    Every Redis call leaves a local copy of the bucket or semaphore it touched,
+    and every change is published so other processes drop their copy. While a
+    copy is held, and for at most :attr:`LOCAL_TTL` seconds, the answer is
+    decided locally and written to Redis in the background. Only when two
+    processes decide on the same key within one publish can a limit be
+    exceeded, by one use. Call :meth:`start` to listen for changes.
+    """
+
+    __slots__ = (
+        'redis',
+        '_id',
+        '_token_bucket',
+        '_acquire',
+        '_release',
+        '_buckets',
+        '_semaphores',
+        '_held',
+        '_writes',
+        '_pending_holders',
+        '_pubsub',
+        '_listener',
+        'stats',
+    )
+
+    CHANNEL: ClassVar[str] = 'ratelimit_invalidation'
+    # Seconds a local copy is trusted, in case an invalidation was missed.
+    LOCAL_TTL: ClassVar[float] = 60
+    MAX_LOCAL: ClassVar[int] = 10_000
+    # Seconds a semaphore slot is held at most, in case its release never happens.
+    HOLD_TIMEOUT: ClassVar[float] = 600
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+
+        self._id = uuid.uuid4().hex
+        self._token_bucket = redis.register_script(TOKEN_BUCKET)
+        self._acquire = redis.register_script(SEMAPHORE_ACQUIRE)
+        self._release = redis.register_script(SEMAPHORE_RELEASE)
+
+        # Redis key -> (tokens, updated at, trusted until)
+        self._buckets: OrderedDict[str, tuple[float, float, float]] = OrderedDict()
+        # Redis key -> (holders in every process, trusted until)
+        self._semaphores: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._held: Counter[str] = Counter()
+        self._writes: set[asyncio.Task[Any]] = set()
+        # Holders whose ZADD is still being written, released only after it lands.
+        self._pending_holders: dict[str, asyncio.Task[Any]] = {}
+        self._pubsub: PubSub | None = None
+        self._listener: asyncio.Task[None] | None = None
+
+        self.stats: Counter[str] = Counter()
+
+    async def start(self) -> None:
+        """
+        Subscribes to changes made by other processes.
+        """
+        if self._listener:
+            return
+
+        self._pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.CHANNEL)
+
+        self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+
+        if self._pubsub:
+            await self._pubsub.close()
+            self._pubsub = None
+
+    async def _listen(self) -> None:
+        assert self._pubsub is not None
+
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    origin, _, key = str(message['data']).partition(':')
+
+                    if origin != self._id:
+                        self._buckets.pop(key, None)
+                        self._semaphores.pop(key, None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                __log__.warning(f'Rate limit invalidation listener failed: {e}')
+
+                # Changes may have been missed while the listener was down.
+                self._buckets.clear()
+                self._semaphores.clear()
+
+                await asyncio.sleep(1)
+
+    def _remember(self, local: OrderedDict[str, Any], key: str, value: Any) -> None:
+        local[key] = value
+        local.move_to_end(key)
+
+        if len(local) > self.MAX_LOCAL:
+            local.popitem(last=False)
+
+    def _write_behind(self, coro: Awaitable[Any]) -> asyncio.Task[Any]:
+        task = asyncio.create_task(coro)
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+        return task
+
+    async def hit(self, key: str, rate: int, per: float) -> float | None:
+        """
+        Takes a token for ``key``, returns the seconds to wait if there are none.
+        """
+        key = f'cooldown:{key}'
+        now = time.monotonic()
+
+        if (bucket := self._buckets.get(key)) and bucket[2] > now:
+            tokens, updated_at, trusted_until = bucket
+            tokens = min(rate, tokens + (now - updated_at) * rate / per)
+
+            if tokens < 1:
+                self.stats['local_rejected'] += 1
+
+                return (1 - tokens) * per / rate
+
+            self._buckets[key] = (tokens - 1, now, trusted_until)
+            self._write_behind(self._take(key, rate, per))
+            self.stats['local'] += 1
+
+            return None
+
+        self.stats['redis'] += 1
+        taken, tokens = await self._token_bucket(
+            keys=[key], args=[rate, int(per * 1000), self._id, self.CHANNEL]
+        )
+        tokens = float(tokens)
+
+        self._remember(self._buckets, key, (tokens, now, now + self.LOCAL_TTL))
+
+        return None if taken else (1 - tokens) * per / rate
+
+    async def _take(self, key: str, rate: int, per: float) -> None:
+        try:
+            taken, tokens = await self._token_bucket(
+                keys=[key], args=[rate, int(per * 1000), self._id, self.CHANNEL]
+            )
+        except Exception as e:
+            __log__.warning(f'Unable to write cooldown {key}: {e}')
+            self._buckets.pop(key, None)
+
+            return
+
+        if not taken:
+            # Another process took the token first, trust Redis from now on.
+            self.stats['conflicts'] += 1
+            now = time.monotonic()
+            self._remember(self._buckets, key, (float(tokens), now, now + self.LOCAL_TTL))
+
+    def new_holder(self) -> str:
+        # Unique per invocation, runs of the same message must not share a slot.
+        return f'{self._id}:{uuid.uuid4().hex}'
+
+    async def acquire(self, key: str, limit: int, holder: str) -> bool:
+        key = f'concurrency:{key}'
+        now = time.monotonic()
+
+        if self._held[key] >= limit:
+            return False
+
+        if (semaphore := self._semaphores.get(key)) and semaphore[1] > now:
+            count, trusted_until = semaphore
+
+            if count >= limit:
+                self.stats['local_rejected'] += 1
+
+                return False
+
+            self._semaphores[key] = (count + 1, trusted_until)
+            self._held[key] += 1
+            self.stats['local'] += 1
+
+            task = self._write_behind(self._add_holder(key, limit, holder))
+            self._pending_holders[holder] = task
+            task.add_done_callback(lambda _: self._pending_holders.pop(holder, None))
+
+            return True
+
+        self.stats['redis'] += 1
+        added, count = await self._acquire(
+            keys=[key],
+            args=[limit, holder, int(self.HOLD_TIMEOUT * 1000), self._id, self.CHANNEL],
+        )
+
+        self._remember(self._semaphores, key, (count, now + self.LOCAL_TTL))
+
+        # 0 when over the limit, and when the holder was already in the set.
+        if not added:
+            return False
+
+        self._held[key] += 1
+
+        return True
+
+    async def _add_holder(self, key: str, limit: int, holder: str) -> None:
+        try:
+            added, count = await self._acquire(
+                keys=[key],
+                args=[limit, holder, int(self.HOLD_TIMEOUT * 1000), self._id, self.CHANNEL],
+            )
+        except Exception as e:
+            __log__.warning(f'Unable to write concurrency {key}: {e}')
+            self._semaphores.pop(key, None)
+
+            return
+
+        if not added:
+            self.stats['conflicts'] += 1
+            self._remember(self._semaphores, key, (count, time.monotonic() + self.LOCAL_TTL))
+
+    async def release(self, key: str, holder: str) -> None:
+        key = f'concurrency:{key}'
+
+        if self._held[key] > 1:
+            self._held[key] -= 1
+        else:
+            self._held.pop(key, None)
+
+        if semaphore := self._semaphores.get(key):
+            self._semaphores[key] = (max(semaphore[0] - 1, 0), semaphore[1])
+
+        self._write_behind(self._remove_holder(key, holder))
+
+    async def _remove_holder(self, key: str, holder: str) -> None:
+        if pending := self._pending_holders.get(holder):
+            await asyncio.wait([pending])
+
+        try:
+            await self._release(keys=[key], args=[holder, self._id, self.CHANNEL])
+        except Exception as e:
+            __log__.warning(f'Unable to release concurrency {key}: {e}')
+            self._semaphores.pop(key, None)
+
+
+class RedisCooldownMapping(commands.CooldownMapping):
+    """
+    A cooldown applied by :class:`RateLimiter` instead of discord.py.
+
+    It is never ``valid``, so commands skip their in-process buckets. The
+    cooldown is either fixed or built per message by ``factory``.
+    """
+
+    def __init__(
+        self,
+        original: Cooldown | None,
+        type: BucketType,
+        factory: Callable[[Message], Cooldown | None] | None = None,
+    ) -> None:
+        super().__init__(original, type)
+
+        self._factory = factory
+
+    def copy(self) -> Self:
+        return self.__class__(self._cooldown, self._type, self._factory)
+
+    @property
+    def valid(self) -> bool:
+        return False
+
+    def cooldown_for(self, message: Message) -> Cooldown | None:
+        if self._cooldown is not None:
+            return self._cooldown
+
+        return self._factory(message) if self._factory else None
+
+    def key_for(self, message: Message) -> str:
+        key: Any = self._bucket_key(message)
+
+        return ':'.join(map(str, key)) if isinstance(key, tuple) else str(key)
+
+
+class RedisMaxConcurrency(MaxConcurrency):
+    """
+    A :class:`MaxConcurrency` counted across processes by :class:`RateLimiter`.
+
+    Waiting for a slot is only supported in process, so ``wait=True`` falls back to it.
+    """
+
+    __slots__ = ('limiter', 'name', '_holders')
+
+    def __init__(
+        self,
+        number: int,
+        *,
+        per: BucketType,
+        wait: bool,
+        limiter: RateLimiter,
+        name: str,
+    ) -> None:
+        super().__init__(number, per=per, wait=wait)
+
+        self.limiter = limiter
+        self.name = name
+
+        # discord.py releases with the message, not the context it acquired with,
+        # so the holders of each message are kept here until released.
+        self._holders: dict[tuple[str, int], list[str]] = {}
+
+    def copy(self) -> Self:
+        return self.__class__(
+            self.number, per=self.per, wait=self.wait, limiter=self.limiter, name=self.name
+        )
+
+    @staticmethod
+    def _message(origin: Context[Any] | Message) -> Message:
+        # Commands acquire with the context, but release with the message on success.
+        return origin.message if isinstance(origin, commands.Context) else origin
+
+    def _redis_key(self, message: Message) -> str:
+        return f'{self.name}:{self.get_key(message)}'
+
+    async def acquire(self, origin: Context[Any] | Message) -> None:
+        if self.wait:
+            return await super().acquire(origin)
+
+        message = self._message(origin)
+        key = self._redis_key(message)
+        holder = self.limiter.new_holder()
+
+        if not await self.limiter.acquire(key, self.number, holder):
+            raise commands.MaxConcurrencyReached(self.number, self.per)
+
+        self._holders.setdefault((key, message.id), []).append(holder)
+
+    async def release(self, origin: Context[Any] | Message) -> None:
+        if self.wait:
+            return await super().release(origin)
+
+        message = self._message(origin)
+        key = self._redis_key(message)
+
+        if not (holders := self._holders.get((key, message.id))):
+            return
+
+        holder = holders.pop()
+
+        if not holders:
+            del self._holders[key, message.id]
+
+        await self.limiter.release(key, holder)
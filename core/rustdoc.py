@@ -0,0 +1,537 @@
+from __future__ import annotations
+
+import base64
+import json
+import re
+import time
+from asyncio import to_thread
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, NamedTuple
+from urllib.parse import urljoin
+
+from .search import SearchIndex
+from .utils import SingleFlight
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+    from typing_extensions import Self
+
+__all__ = ('RustdocClient', 'RustdocIndex', 'RustdocItem', 'UnsupportedRustdocFormat')
+
+# Mirrors `itemTypes` in rustdoc's search.js, the index stores positions into it.
+# Older rustdoc used a different order, indexes it generated are not supported.
+ITEM_TYPES: tuple[str, ...] = (
+    'keyword',
+    'primitive',
+    'mod',
+    'externcrate',
+    'import',
+    'struct',
+    'enum',
+    'fn',
+    'type',
+    'static',
+    'trait',
+    'impl',
+    'tymethod',
+    'method',
+    'structfield',
+    'variant',
+    'macro',
+    'associatedtype',
+    'constant',
+    'associatedconstant',
+    'union',
+    'foreigntype',
+    'existential',
+    'attr',
+    'derive',
+    'traitalias',
+    'generic',
+    'attribute',
+)
+TY_MOD = ITEM_TYPES.index('mod')
+TY_PRIMITIVE = ITEM_TYPES.index('primitive')
+TY_KEYWORD = ITEM_TYPES.index('keyword')
+SKIPPED_TYPES = frozenset(
+    ITEM_TYPES.index(ty) for ty in ('externcrate', 'import', 'impl', 'generic')
+)
+
+JS_STRING_ESCAPE = re.compile(r'\\(.)', flags=re.DOTALL)
+JSON_PARSE_CALL = re.compile(r"JSON\.parse\('((?:[^'\\]|\\.)*)'\)", flags=re.DOTALL)
+RUSTDOC_VARS = re.compile(
+    r'data-(root-path|search-index-js|resource-suffix|stringdex-js)="([^"]*)"'
+)
+
+
+class UnsupportedRustdocFormat(RuntimeError):
+    """
+    Raised when a crate's documentation has no search index this module can read.
+    """
+
+
+class RustdocItem(NamedTuple):
+    crate: str
+    ty: int
+    name: str
+    path: str
+    parent: tuple[int, str] | None
+    has_desc: bool
+
+    @property
+    def full_path(self) -> str:
+        if self.parent:
+            return f'{self.path}::{self.parent[1]}::{self.name}'
+
+        return f'{self.path}::{self.name}'
+
+
+def _levenshtein(a: str, b: str, limit: int) -> int:
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+
+        if min(current) > limit:
+            return limit + 1
+
+        previous = current
+
+    return previous[-1]
+
+
+def _decode_vlq_hex(encoded: str) -> list[int]:
+    # rustdoc >= 1.78 encodes some integer columns as VLQ hex, see `VlqHexDecoder`.
+    values: list[int] = []
+    backrefs: list[int] = []
+    offset = 0
+
+    while offset < len(encoded):
+        char = ord(encoded[offset])
+
+        if 48 <= char < 64:
+            values.append(backrefs[char - 48])
+            offset += 1
+
+            continue
+
+        if char == 96:
+            values.append(0)
+            offset += 1
+
+            continue
+
+        number = 0
+
+        while char < 96:
+            number = (number << 4) | (char & 0xF)
+            offset += 1
+            char = ord(encoded[offset])
+
+        number = (number << 4) | (char & 0xF)
+        offset += 1
+
+        value = -(number >> 1) if number & 1 else number >> 1
+        values.append(value)
+
+        backrefs.insert(0, value)
+        del backrefs[16:]
+
+    return values
+
+
+def _decode_roaring_bitmap(encoded: str) -> set[int]:
+    # rustdoc >= 1.78 stores per-item flags as base64 Roaring bitmaps, see `RoaringBitmap`.
+    data = base64.b64decode(encoded)
+    has_runs = data[0] == 0x3B
+
+    if has_runs:
+        size = int.from_bytes(data[2:4], 'little') + 1
+        offset = 4
+        run_flags = data[offset : offset + (size + 7) // 8]
+        offset += len(run_flags)
+    else:
+        size = int.from_bytes(data[4:8], 'little')
+        offset = 8
+        run_flags = b''
+
+    headers = []
+
+    for _ in range(size):
+        key = int.from_bytes(data[offset : offset + 2], 'little')
+        cardinality = int.from_bytes(data[offset + 2 : offset + 4], 'little') + 1
+        headers.append((key, cardinality))
+        offset += 4
+
+    if not has_runs or size >= 4:
+        # Container offsets, not needed when reading sequentially.
+        offset += 4 * size
+
+    values: set[int] = set()
+
+    for container, (key, cardinality) in enumerate(headers):
+        high = key << 16
+
+        if container // 8 < len(run_flags) and run_flags[container // 8] & (1 << container % 8):
+            runs = int.from_bytes(data[offset : offset + 2], 'little')
+            offset += 2
+
+            for _ in range(runs):
+                start = int.from_bytes(data[offset : offset + 2], 'little')
+                length = int.from_bytes(data[offset + 2 : offset + 4], 'little')
+                values.update(range(high | start, (high | start) + length + 1))
+                offset += 4
+        elif cardinality >= 4096:
+            bits = int.from_bytes(data[offset : offset + 8192], 'little')
+            values.update(high | bit for bit in range(65536) if bits >> bit & 1)
+            offset += 8192
+        else:
+            for _ in range(cardinality):
+                values.add(high | int.from_bytes(data[offset : offset + 2], 'little'))
+                offset += 2
+
+    return values
+
+
+class RustdocIndex:
+    """
+    A local copy of rustdoc's ``search-index.js``, searchable without a browser.
+    """
+
+    __slots__ = ('root_url', 'items', 'paths', '_by_name')
+
+    MAX_RESULTS = 200
+
+    def __init__(self, root_url: str, items: list[RustdocItem]) -> None:
+        self.root_url = root_url
+        self.items = items
+        self._by_name: dict[str, list[RustdocItem]] = {}
+
+        for item in items:
+            self._by_name.setdefault(item.name.lower(), []).append(item)
+
+        # Used for prefix lookups, e.g. autocomplete.
+        self.paths = SearchIndex((item.full_path, self.href(item)) for item in items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __repr__(self) -> str:
+        return f'<RustdocIndex root_url={self.root_url!r} items={len(self.items)}>'
+
+    @staticmethod
+    def _load_crates(source: str) -> list[tuple[str, dict[str, Any]]]:
+        if not (match := JSON_PARSE_CALL.search(source)):
+            raise UnsupportedRustdocFormat('Unsupported rustdoc search index format')
+
+        literal = JS_STRING_ESCAPE.sub(
+            lambda m: '' if m.group(1) == '\n' else m.group(1), match.group(1)
+        )
+        data = json.loads(literal)
+
+        # rustdoc >= 1.76 wraps the crates in a Map instead of an object.
+        if isinstance(data, dict):
+            return list(data.items())
+
+        return [(crate, corpus) for crate, corpus in data]
+
+    @classmethod
+    def from_search_index_js(cls, source: str, root_url: str) -> Self:
+        """
+        Parses the contents of rustdoc's ``search-index.js``.
+        """
+        items: list[RustdocItem] = []
+
+        for crate, corpus in cls._load_crates(source):
+            types = corpus['t']
+
+            if isinstance(types, str):
+                types = [ord(char) - 65 for char in types]
+
+            names: list[str] = corpus['n']
+            descriptions: list[str] | None = corpus.get('d')
+            # Descriptions moved out of the index, only which ones are empty is left.
+            # Bit 0 is the crate itself.
+            empty_descriptions = _decode_roaring_bitmap(corpus['e']) if 'e' in corpus else set()
+            parents = corpus.get('i') or []
+
+            if isinstance(parents, str):
+                parents = _decode_vlq_hex(parents)
+
+            # Older rustdoc repeats '' for "same as the previous path",
+            # newer rustdoc only lists the indices where the path changes.
+            raw_paths = corpus.get('q') or []
+
+            if raw_paths and isinstance(raw_paths[0], list):
+                paths = {index: path for index, path in raw_paths}
+            else:
+                paths = {index: path for index, path in enumerate(raw_paths) if path}
+
+            parent_items = [(entry[0], entry[1]) for entry in corpus.get('p') or []]
+            path = crate
+            name = ''
+
+            for index, (ty, raw_name) in enumerate(zip(types, names)):
+                path = paths.get(index, path)
+                # '' means the same name as the previous item, e.g. trait impls on a type.
+                name = raw_name or name
+
+                if ty in SKIPPED_TYPES or not name:
+                    continue
+
+                parent_index = parents[index] if index < len(parents) else 0
+
+                if descriptions is not None:
+                    has_desc = index < len(descriptions) and bool(descriptions[index])
+                else:
+                    has_desc = index + 1 not in empty_descriptions
+
+                items.append(
+                    RustdocItem(
+                        crate,
+                        ty,
+                        name,
+                        path,
+                        parent_items[parent_index - 1] if parent_index else None,
+                        has_desc,
+                    )
+                )
+
+        return cls(root_url, items)
+
+    def href(self, item: RustdocItem) -> str:
+        """
+        Builds the documentation URL of an item, like rustdoc's ``buildHrefAndPath``.
+        """
+        ty = ITEM_TYPES[item.ty]
+        directory = self.root_url + item.path.replace('::', '/')
+
+        if item.ty == TY_MOD:
+            return f'{directory}/{item.name}/index.html'
+
+        if item.ty in (TY_PRIMITIVE, TY_KEYWORD):
+            return f'{self.root_url}{item.crate}/{ty}.{item.name}.html'
+
+        if item.parent:
+            parent_ty, parent_name = item.parent
+
+            return (
+                f'{directory}/{ITEM_TYPES[parent_ty]}.{parent_name}.html#{ty}.{item.name}'
+            )
+
+        return f'{directory}/{ty}.{item.name}.html'
+
+    def search(
+        self, query: str, *, preferred_crate: str | None = None
+    ) -> list[tuple[str, str]]:
+        """
+        Searches the index, ordering results the same way rustdoc's ``sortResults`` does.
+        """
+        *path_query, name_query = query.lower().strip().split('::')
+        path_query = [part for part in path_query if part]
+        max_distance = len(name_query) // 3
+
+        scored = []
+
+        for name, items in self._by_name.items():
+            position = name.find(name_query)
+
+            if position == -1:
+                distance = _levenshtein(name_query, name, max_distance)
+
+                if distance > max_distance:
+                    continue
+            else:
+                distance = 0
+
+            for item in items:
+                if path_query:
+                    segments = item.full_path.lower().split('::')[:-1]
+
+                    if not all(
+                        any(part in segment for segment in segments)
+                        for part in path_query
+                    ):
+                        continue
+
+                scored.append(
+                    (
+                        name != name_query,
+                        distance,
+                        item.crate != preferred_crate,
+                        len(name),
+                        name,
+                        position < 0,
+                        position,
+                        item.ty not in (TY_PRIMITIVE, TY_KEYWORD),
+                        not item.has_desc,
+                        item.ty,
+                        item.path,
+                        item,
+                    )
+                )
+
+        scored.sort(key=lambda entry: entry[:-1])
+
+        # Trait impls on the same type share a name and URL, only keep the first.
+        results: dict[tuple[str, str], None] = {}
+
+        for entry in scored:
+            results[(entry[-1].full_path, self.href(entry[-1]))] = None
+
+            if len(results) >= self.MAX_RESULTS:
+                break
+
+        return list(results)
+
+
+class RustdocClient:
+    """
+    Downloads rustdoc search indexes once per crate version and keeps them in memory.
+    """
+
+    __slots__ = ('session', '_indexes', '_locations', '_results', '_flight')
+
+    MAX_INDEXES = 16
+    MAX_CACHED_RESULTS = 256
+    LOCATION_TTL = 3600
+
+    def __init__(self, session: ClientSession) -> None:
+        self.session = session
+
+        self._indexes: OrderedDict[str, RustdocIndex] = OrderedDict()
+        self._locations: dict[str, tuple[float, str, str]] = {}
+        self._results: OrderedDict[
+            tuple[str, str, str | None], list[tuple[str, str]]
+        ] = OrderedDict()
+        # Concurrent misses for the same page or index share one request.
+        self._flight: SingleFlight[Any] = SingleFlight()
+
+    async def _locate(self, page_url: str) -> tuple[str, str] | None:
+        if cached := self._locations.get(page_url):
+            expires_at, root_url, index_url = cached
+
+            if time.monotonic() < expires_at:
+                return root_url, index_url
+
+        return await self._flight.do(
+            ('page', page_url), lambda: self._fetch_location(page_url)
+        )
+
+    async def _fetch_location(self, page_url: str) -> tuple[str, str] | None:
+        async with self.session.get(page_url) as resp:
+            if resp.status != 200:
+                return None
+
+            # docs.rs redirects `latest` to the actual version.
+            final_url = str(resp.url)
+            variables = dict(RUSTDOC_VARS.findall(await resp.text()))
+
+        if 'root-path' not in variables:
+            raise RuntimeError(f'{page_url} does not look like a rustdoc page')
+
+        root_url = urljoin(final_url, variables['root-path'])
+
+        if search_index := variables.get('search-index-js'):
+            index_url = urljoin(final_url, search_index)
+        elif 'stringdex-js' in variables:
+            # rustdoc >= 1.92 splits the index into a `search.index/` tree.
+            raise UnsupportedRustdocFormat(
+                f'{page_url} was documented by a rustdoc whose search index is not supported'
+            )
+        else:
+            index_url = f'{root_url}search-index{variables.get("resource-suffix", "")}.js'
+
+        self._locations[page_url] = (
+            time.monotonic() + self.LOCATION_TTL,
+            root_url,
+            index_url,
+        )
+
+        return root_url, index_url
+
+    def get_cached_index(self, page_url: str) -> RustdocIndex | None:
+        """
+        Returns the search index of the crate documented at ``page_url``
+        only if it is already in memory, without any I/O.
+        """
+        if not (location := self._locations.get(page_url)):
+            return None
+
+        return self._indexes.get(location[2])
+
+    async def get_index(self, page_url: str) -> RustdocIndex | None:
+        """
+        Returns the search index of the crate documented at ``page_url``,
+        or ``None`` if the page does not exist.
+        """
+        location = await self._locate(page_url)
+
+        if not location:
+            return None
+
+        root_url, index_url = location
+
+        if (index := self._indexes.get(index_url)) is not None:
+            self._indexes.move_to_end(index_url)
+
+            return index
+
+        return await self._flight.do(
+            ('index', index_url), lambda: self._fetch_index(index_url, root_url)
+        )
+
+    async def _fetch_index(self, index_url: str, root_url: str) -> RustdocIndex:
+        async with self.session.get(index_url) as resp:
+            if resp.status == 404:
+                raise UnsupportedRustdocFormat(f'No rustdoc search index at {index_url}')
+
+            resp.raise_for_status()
+            source = await resp.text()
+
+        index = await to_thread(RustdocIndex.from_search_index_js, source, root_url)
+
+        self._indexes[index_url] = index
+
+        if len(self._indexes) > self.MAX_INDEXES:
+            self._indexes.popitem(last=False)
+
+        return index
+
+    async def search(
+        self, page_url: str, query: str, *, preferred_crate: str | None = None
+    ) -> list[tuple[str, str]] | None:
+        """
+        Searches the crate documented at ``page_url``, or returns ``None`` if the page
+        does not exist. Raises :exc:`UnsupportedRustdocFormat` if its index can't be read.
+        """
+        if (index := await self.get_index(page_url)) is None:
+            return None
+
+        # Keyed by URL, ids of evicted indexes get reused.
+        key = (self._locations[page_url][2], query.lower().strip(), preferred_crate)
+
+        if (cached := self._results.get(key)) is not None:
+            self._results.move_to_end(key)
+
+            return cached
+
+        results = await to_thread(index.search, query, preferred_crate=preferred_crate)
+        self._results[key] = results
+
+        if len(self._results) > self.MAX_CACHED_RESULTS:
+            self._results.popitem(last=False)
+
+        return results
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from heapq import nsmallest
+from operator import itemgetter
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+__all__ = ('SearchIndex', 'fuzzy_score')
+
+SEGMENT_SEPARATORS = re.compile(r'[.:/]+')
+
+
+def fuzzy_score(query: str, text: str) -> tuple[int, int] | None:
+    """
+    Scores ``text`` against ``query`` the way :func:`core.utils.finder` does, returning
+    the length and start of the match (lower is better), or ``None`` if it does not match.
+    """
+    if not (match := re.search('.*?'.join(map(re.escape, query)), text, re.IGNORECASE)):
+        return None
+
+    return match.end() - match.start(), match.start()
+
+
+class SearchIndex:
+    """
+    An immutable in-memory index over ``(key, value)`` pairs.
+
+    :meth:`search` returns exactly what :func:`core.utils.finder` returns for the same
+    query and collection, but only scores the entries that contain every character of
+    the query, and reuses the results of a shorter query when one is cached.
+
+    :meth:`prefix` answers ranked prefix lookups against every dotted segment of a key,
+    which is what autocomplete wants.
+    """
+
+    __slots__ = (
+        '_entries',
+        '_lowered',
+        '_postings',
+        '_segments',
+        '_short_prefixes',
+        '_results',
+        '_max_cached_results',
+    )
+
+    SHORT_PREFIX_LENGTH = 2
+    PREFIX_LIMIT = 25
+
+    def __init__(
+        self, entries: Iterable[tuple[str, str]], *, max_cached_results: int = 128
+    ) -> None:
+        # finder breaks ties on the key, so ordering ids by key gives the same ordering.
+        self._entries: list[tuple[str, str]] = sorted(entries, key=itemgetter(0))
+        self._lowered: list[str] = [key.lower() for key, _ in self._entries]
+
+        postings: defaultdict[str, set[int]] = defaultdict(set)
+
+        for id_, key in enumerate(self._lowered):
+            for char in set(key):
+                postings[char].add(id_)
+
+        self._postings: dict[str, frozenset[int]] = {
+            char: frozenset(ids) for char, ids in postings.items()
+        }
+
+        # Shorter keys rank first in prefix lookups.
+        by_length = sorted(
+            range(len(self._entries)), key=lambda i: (len(self._lowered[i]), i)
+        )
+        rank = [0] * len(by_length)
+
+        for position, id_ in enumerate(by_length):
+            rank[id_] = position
+
+        segments: list[tuple[str, int, int]] = []
+
+        for id_, key in enumerate(self._lowered):
+            seen = set()
+
+            for match in SEGMENT_SEPARATORS.finditer(key):
+                suffix = key[match.end() :]
+
+                if suffix and suffix not in seen:
+                    seen.add(suffix)
+                    segments.append((suffix, rank[id_], id_))
+
+            if key not in seen:
+                segments.append((key, rank[id_], id_))
+
+        segments.sort()
+        self._segments = segments
+
+        short_prefixes: defaultdict[str, list[tuple[int, int]]] = defaultdict(list)
+
+        for suffix, rank_, id_ in segments:
+            for length in range(1, self.SHORT_PREFIX_LENGTH + 1):
+                if len(suffix) >= length:
+                    short_prefixes[suffix[:length]].append((rank_, id_))
+
+        self._short_prefixes: dict[str, array[int]] = {
+            prefix: array('I', self._top_ids(ranked, self.PREFIX_LIMIT))
+            for prefix, ranked in short_prefixes.items()
+        }
+
+        self._results: OrderedDict[str, array[int]] = OrderedDict()
+        self._max_cached_results = max_cached_results
+
+    @classmethod
+    def from_dict(cls, mapping: dict[str, str], **kwargs) -> Self:
+        return cls(mapping.items(), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f'<SearchIndex entries={len(self._entries)}>'
+
+    @staticmethod
+    def _top_ids(ranked: Iterable[tuple[int, int]], limit: int) -> list[int]:
+        # An entry shows up once per matching segment, always with the same rank.
+        return [id_ for _, id_ in nsmallest(limit, set(ranked))]
+
+    def _candidates(self, query: str) -> Iterable[int]:
+        for end in range(len(query) - 1, 0, -1):
+            if (cached := self._results.get(query[:end])) is not None:
+                # Every match of the query is also a match of its prefixes.
+                return cached
+
+        postings = []
+
+        for char in set(query):
+            ids = self._postings.get(char)
+
+            if ids is None:
+                return ()
+
+            postings.append(ids)
+
+        postings.sort(key=len)
+
+        return postings[0].intersection(*postings[1:])
+
+    def _search_ids(self, query: str) -> array[int]:
+        if (cached := self._results.get(query)) is not None:
+            self._results.move_to_end(query)
+
+            return cached
+
+        search = re.compile('.*?'.join(map(re.escape, query))).search
+        lowered = self._lowered
+
+        scored = [
+            (match.end() - match.start(), match.start(), id_)
+            for id_ in self._candidates(query)
+            if (match := search(lowered[id_]))
+        ]
+        scored.sort()
+        ids = array('I', [id_ for _, _, id_ in scored])
+
+        self._results[query] = ids
+
+        if len(self._results) > self._max_cached_results:
+            self._results.popitem(last=False)
+
+        return ids
+
+    def search(self, query: str) -> list[tuple[str, str]]:
+        """
+        Fuzzy searches the index, ranking results the same way :func:`core.utils.finder` does.
+        """
+        query = query.lower()
+
+        if not query:
+            return list(self._entries)
+
+        entries = self._entries
+
+        return [entries[id_] for id_ in self._search_ids(query)]
+
+    def prefix(self, text: str, *, limit: int = PREFIX_LIMIT) -> list[tuple[str, str]]:
+        """
+        Returns up to ``limit`` entries that have a segment starting with ``text``,
+        shortest keys first.
+        """
+        text = text.lower()
+        entries = self._entries
+
+        if not text:
+            return entries[:limit]
+
+        if len(text) <= self.SHORT_PREFIX_LENGTH and limit <= self.PREFIX_LIMIT:
+            return [entries[id_] for id_ in self._short_prefixes.get(text, ())[:limit]]
+
+        segments = self._segments
+        start = bisect_left(segments, (text,))
+        end = bisect_left(segments, (text + '\U0010ffff',), lo=start)
+
+        ranked = ((rank, id_) for _, rank, id_ in segments[start:end])
+
+        return [entries[id_] for id_ in self._top_ids(ranked, limit)]
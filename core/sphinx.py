@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import codecs
+import os
+import zlib
+
+from .constants import Regexs
+
+__all__ = ('SphinxInventoryParser',)
+
+
+class SphinxInventoryParser:
+    """
+    Incremental parser for Sphinx ``objects.inv`` files.
+
+    Raw bytes are fed in as they arrive from the network, and each call returns the
+    entries completed by that chunk. Only a single partial line is ever buffered, and
+    multi-byte characters that straddle a chunk boundary are decoded correctly.
+    """
+
+    __slots__ = (
+        'base_url',
+        '_header',
+        '_header_lines',
+        '_decompressor',
+        '_decoder',
+        '_pending',
+    )
+
+    HEADER_LINES = 4
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url
+
+        self._header = b''
+        self._header_lines = 0
+        self._decompressor = zlib.decompressobj()
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._pending = ''
+
+    def _parse_header(self, data: bytes) -> bytes:
+        self._header += data
+
+        while self._header_lines < self.HEADER_LINES:
+            line, sep, rest = self._header.partition(b'\n')
+
+            if not sep:
+                return b''
+
+            self._header = rest
+            self._header_lines += 1
+
+            if self._header_lines == 1:
+                sphinx_version = line.rstrip()[2:]
+
+                if sphinx_version != b'Sphinx inventory version 2':
+                    raise RuntimeError(
+                        f'Unsupported Sphinx version: {sphinx_version.decode()}'
+                    )
+
+            elif self._header_lines == self.HEADER_LINES and b'zlib' not in line:
+                raise RuntimeError('Unsupported compression method')
+
+        data, self._header = self._header, b''
+
+        return data
+
+    def _parse_lines(self, text: str) -> list[tuple[str, str]]:
+        *lines, self._pending = (self._pending + text).split('\n')
+
+        return [entry for line in lines if (entry := self._parse_line(line))]
+
+    def _parse_line(self, line: str) -> tuple[str, str] | None:
+        match = Regexs.SPHINX_ENTRY_REGEX.match(line)
+
+        if not match:
+            return None
+
+        name, directive, _, location, display = match.groups()
+
+        domain, _, subdirective = directive.partition(':')
+
+        if directive == 'std:doc':
+            subdirective = 'label'
+
+        if location.endswith('$'):
+            location = location[:-1] + name
+
+        key = name if display == '-' else display
+        prefix = f'{subdirective}:' if domain == 'std' else ''
+
+        return f'{prefix}{key}', os.path.join(self.base_url, location)
+
+    def feed(self, data: bytes) -> list[tuple[str, str]]:
+        """
+        Feeds a chunk of the raw file, returning the entries it completed.
+        """
+        if self._header_lines < self.HEADER_LINES:
+            data = self._parse_header(data)
+
+            if not data:
+                return []
+
+        decompressed = self._decompressor.decompress(data)
+
+        return self._parse_lines(self._decoder.decode(decompressed))
+
+    def close(self) -> list[tuple[str, str]]:
+        """
+        Flushes whatever is still buffered, returning the remaining entries.
+        """
+        if self._header_lines < self.HEADER_LINES:
+            raise RuntimeError('Truncated Sphinx inventory header')
+
+        text = self._decoder.decode(self._decompressor.flush(), final=True)
+
+        return self._parse_lines(text + '\n')
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple
+
+if TYPE_CHECKING:
+    from asyncpg import Pool
+
+__all__ = ('CommandUsageRecorder', 'CommandAnalytics', 'UsageSummary')
+__log__ = logging.getLogger('BoboBot')
+
+# (resolution, finer resolution rolled into it, age after which the finer buckets are rolled up)
+ROLLUPS: tuple[tuple[str, str, timedelta], ...] = (
+    ('hour', 'minute', timedelta(days=1)),
+    ('day', 'hour', timedelta(days=30)),
+)
+
+ROLLUP_QUERY = '''
+WITH moved AS (
+    DELETE FROM command_usage_buckets
+    WHERE resolution = $2 AND bucket < date_trunc($1, $3::TIMESTAMPTZ)
+    RETURNING *
+)
+INSERT INTO command_usage_buckets AS b
+    (resolution, bucket, command, guild_id, successes, failures, total_latency, max_latency)
+SELECT $1, date_trunc($1, bucket), command, guild_id,
+    SUM(successes), SUM(failures), SUM(total_latency), MAX(max_latency)
+FROM moved
+GROUP BY 2, 3, 4
+ON CONFLICT (resolution, bucket, command, guild_id) DO UPDATE SET
+    successes = b.successes + EXCLUDED.successes,
+    failures = b.failures + EXCLUDED.failures,
+    total_latency = b.total_latency + EXCLUDED.total_latency,
+    max_latency = GREATEST(b.max_latency, EXCLUDED.max_latency);
+'''
+
+
+def _minute(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp - timestamp % 60, tz=timezone.utc)
+
+
+class _Bucket:
+    __slots__ = ('successes', 'failures', 'total_latency', 'max_latency')
+
+    def __init__(self) -> None:
+        self.successes = 0
+        self.failures = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+
+class UsageSummary(NamedTuple):
+    uses: int
+    failures: int
+    average_latency: float | None
+    max_latency: float | None
+
+    @property
+    def error_rate(self) -> float:
+        return self.failures / self.uses if self.uses else 0.0
+
+
+class CommandUsageRecorder:
+    """
+    Counts command uses in memory and writes them to Postgres in batches.
+
+    Lifetime counts go to ``commands_usage`` and their sum to ``commands_usage_total``,
+    per-minute buckets of every invocation go to ``command_usage_buckets``. Every :attr:`INTERVAL` seconds the pending
+    counts are flushed in one transaction, and every :attr:`ROLLUP_INTERVAL` seconds
+    old buckets are merged into coarser ones. Call :meth:`start` to begin flushing
+    and :meth:`close` to flush the remaining counts on shutdown.
+    """
+
+    __slots__ = (
+        'db',
+        '_pending',
+        '_flushing',
+        '_buckets',
+        '_task',
+        '_lock',
+        '_last_rollup',
+    )
+
+    INTERVAL: ClassVar[float] = 5
+    ROLLUP_INTERVAL: ClassVar[float] = 3600
+
+    def __init__(self, db: Pool) -> None:
+        self.db = db
+
+        self._pending: Counter[str] = Counter()
+        self._flushing: Counter[str] = Counter()
+        self._buckets: dict[tuple[datetime, str, int], _Bucket] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+        self._last_rollup = 0.0
+
+    def record(self, command: str, uses: int = 1) -> None:
+        self._pending[command] += uses
+
+    def record_invocation(
+        self,
+        command: str,
+        *,
+        guild_id: int | None,
+        latency: float,
+        failed: bool = False,
+        timestamp: float | None = None,
+    ) -> None:
+        """
+        Adds one invocation, ``latency`` is in milliseconds, to its per-minute bucket.
+        """
+        key = (_minute(timestamp or time.time()), command, guild_id or 0)
+
+        if (bucket := self._buckets.get(key)) is None:
+            bucket = self._buckets[key] = _Bucket()
+
+        if failed:
+            bucket.failures += 1
+        else:
+            bucket.successes += 1
+
+        bucket.total_latency += latency
+        bucket.max_latency = max(bucket.max_latency, latency)
+
+    def pending(self, command: str) -> int:
+        """The uses of ``command`` that have not been written yet."""
+        return self._pending[command] + self._flushing[command]
+
+    @property
+    def pending_total(self) -> int:
+        return sum(self._pending.values()) + sum(self._flushing.values())
+
+    def start(self) -> None:
+        if not self._task:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.INTERVAL)
+
+            try:
+                await self.flush()
+
+                if time.monotonic() - self._last_rollup >= self.ROLLUP_INTERVAL:
+                    await self.rollup()
+            except Exception as e:
+                __log__.warning(f'Failed to flush command usage: {e}')
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._pending and not self._buckets:
+                return
+
+            # Swap before awaiting so uses recorded during the write land in the next batch.
+            pending, self._pending = self._pending, Counter()
+            buckets, self._buckets = self._buckets, {}
+            # Still counted by readers until the write is done.
+            self._flushing = pending
+
+            try:
+                async with self.db.acquire() as conn, conn.transaction():
+                    if pending:
+                        await conn.execute(
+                            'INSERT INTO commands_usage (command, uses) '
+                            'SELECT * FROM unnest($1::TEXT[], $2::BIGINT[]) '
+                            'ON CONFLICT (command) DO UPDATE SET uses = commands_usage.uses + EXCLUDED.uses;',
+                            list(pending.keys()),
+                            list(pending.values()),
+                        )
+                        await conn.execute(
+                            'INSERT INTO commands_usage_total (uses) VALUES ($1) '
+                            'ON CONFLICT (id) DO UPDATE SET uses = commands_usage_total.uses + EXCLUDED.uses;',
+                            sum(pending.values()),
+                        )
+
+                    if buckets:
+                        await self._write_buckets(conn, buckets)
+            except BaseException:
+                self._pending.update(pending)
+                self._restore_buckets(buckets)
+
+                raise
+            finally:
+                self._flushing = Counter()
+
+    @staticmethod
+    async def _write_buckets(
+        conn: Any, buckets: dict[tuple[datetime, str, int], _Bucket]
+    ) -> None:
+        await conn.execute(
+            '''
+            INSERT INTO command_usage_buckets AS b
+                (resolution, bucket, command, guild_id, successes, failures, total_latency, max_latency)
+            SELECT 'minute', * FROM unnest(
+                $1::TIMESTAMPTZ[], $2::TEXT[], $3::BIGINT[], $4::BIGINT[],
+                $5::BIGINT[], $6::DOUBLE PRECISION[], $7::DOUBLE PRECISION[]
+            )
+            ON CONFLICT (resolution, bucket, command, guild_id) DO UPDATE SET
+                successes = b.successes + EXCLUDED.successes,
+                failures = b.failures + EXCLUDED.failures,
+                total_latency = b.total_latency + EXCLUDED.total_latency,
+                max_latency = GREATEST(b.max_latency, EXCLUDED.max_latency);
+            ''',
+            [key[0] for key in buckets],
+            [key[1] for key in buckets],
+            [key[2] for key in buckets],
+            [bucket.successes for bucket in buckets.values()],
+            [bucket.failures for bucket in buckets.values()],
+            [bucket.total_latency for bucket in buckets.values()],
+            [bucket.max_latency for bucket in buckets.values()],
+        )
+
+    def _restore_buckets(self, buckets: dict[tuple[datetime, str, int], _Bucket]) -> None:
+        for key, bucket in buckets.items():
+            if (current := self._buckets.get(key)) is None:
+                self._buckets[key] = bucket
+
+                continue
+
+            current.successes += bucket.successes
+            current.failures += bucket.failures
+            current.total_latency += bucket.total_latency
+            current.max_latency = max(current.max_latency, bucket.max_latency)
+
+    async def rollup(self) -> None:
+        """
+        Merges minute buckets older than a day into hours,
+        and hour buckets older than 30 days into days.
+        """
+        self._last_rollup = time.monotonic()
+        now = datetime.now(timezone.utc)
+
+        async with self.db.acquire() as conn, conn.transaction():
+            for resolution, source, age in ROLLUPS:
+                await conn.execute(ROLLUP_QUERY, resolution, source, now - age)
+
+
+class CommandAnalytics:
+    """
+    Answers usage questions from ``command_usage_buckets`` without scanning raw rows.
+
+    Every invocation lives in exactly one bucket, so windows are summed across all
+    resolutions. Windows that start inside a rolled up bucket are rounded to it.
+    """
+
+    __slots__ = ('db',)
+
+    def __init__(self, db: Pool) -> None:
+        self.db = db
+
+    async def top_commands(
+        self, limit: int = 10, *, window: timedelta | None = None
+    ) -> list[tuple[str, int]]:
+        """
+        Returns the most used commands and their uses, over ``window`` or all time.
+        """
+        if window is None:
+            rows = await self.db.fetch(
+                'SELECT command, uses FROM commands_usage ORDER BY uses DESC LIMIT $1;',
+                limit,
+            )
+        else:
+            rows = await self.db.fetch(
+                '''
+                SELECT command, SUM(successes + failures) AS uses
+                FROM command_usage_buckets WHERE bucket >= $1
+                GROUP BY command ORDER BY uses DESC LIMIT $2;
+                ''',
+                datetime.now(timezone.utc) - window,
+                limit,
+            )
+
+        return [(row['command'], int(row['uses'])) for row in rows]
+
+    async def top_guilds(
+        self, limit: int = 1000, *, window: timedelta = timedelta(days=7)
+    ) -> list[tuple[int, int]]:
+        """
+        Returns the guild IDs with the most command uses over ``window``, and their uses.
+        """
+        rows = await self.db.fetch(
+            '''
+            SELECT guild_id, SUM(successes + failures) AS uses
+            FROM command_usage_buckets WHERE bucket >= $1 AND guild_id <> 0
+            GROUP BY guild_id ORDER BY uses DESC LIMIT $2;
+            ''',
+            datetime.now(timezone.utc) - window,
+            limit,
+        )
+
+        return [(row['guild_id'], int(row['uses'])) for row in rows]
+
+    async def total_uses(self) -> int:
+        # A single row kept in step with commands_usage, instead of summing every command.
+        return int(await self.db.fetchval('SELECT uses FROM commands_usage_total;') or 0)
+
+    async def summary(
+        self, window: timedelta, *, command: str | None = None, guild_id: int | None = None
+    ) -> UsageSummary:
+        row = await self.db.fetchrow(
+            '''
+            SELECT SUM(successes + failures) AS uses, SUM(failures) AS failures,
+                SUM(total_latency) AS total_latency, MAX(max_latency) AS max_latency
+            FROM command_usage_buckets
+            WHERE bucket >= $1
+                AND ($2::TEXT IS NULL OR command = $2)
+                AND ($3::BIGINT IS NULL OR guild_id = $3);
+            ''',
+            datetime.now(timezone.utc) - window,
+            command,
+            guild_id,
+        )
+
+        uses = int(row['uses'] or 0)
+
+        return UsageSummary(
+            uses,
+            int(row['failures'] or 0),
+            row['total_latency'] / uses if uses else None,
+            row['max_latency'],
+        )
+
+    async def rate(
+        self,
+        window: timedelta = timedelta(hours=1),
+        *,
+        command: str | None = None,
+        guild_id: int | None = None,
+    ) -> float:
+        """
+        Returns the average command uses per minute over ``window``.
+        """
+        summary = await self.summary(window, command=command, guild_id=guild_id)
+
+        return summary.uses / (window.total_seconds() / 60)
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import asyncio
 import functools
+import math
+import random
 import time
 import re
 
@@ -10,6 +12,8 @@ from typing import (
     Awaitable,
     Any,
     Callable,
+    Generic,
+    Hashable,
     TypeVar,
     ParamSpec,
     Iterable,
@@ -19,7 +23,14 @@ from typing import (
 if TYPE_CHECKING:
     from typing_extensions import Self
 
-__all__ = ('Instant', 'finder', 'async_executor', 'unique_list')
+__all__ = (
+    'Instant',
+    'SingleFlight',
+    'finder',
+    'async_executor',
+    'unique_list',
+    'should_refresh_early',
+)
 
 R = TypeVar('R')
 P = ParamSpec('P')
@@ -104,6 +115,62 @@ class Instant:
         return self._end - self._start
 
 
+class SingleFlight(Generic[T]):
+    """
+    Coalesces concurrent calls for the same key into one in-flight call.
+
+    Every caller waiting on a key gets the result (or exception) of the same call,
+    and the call keeps running even if the caller that started it is cancelled.
+    """
+
+    __slots__ = ('_calls',)
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task[T]] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def _forget(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved, waiters already got it.
+
+    def start(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> asyncio.Task[T]:
+        """
+        Starts ``func`` for ``key`` unless a call is already in flight, without waiting on it.
+        """
+        if (task := self._calls.get(key)) is not None:
+            return task
+
+        async def call() -> T:
+            return await func()
+
+        task = asyncio.create_task(call())
+        self._calls[key] = task
+        task.add_done_callback(functools.partial(self._forget, key))
+
+        return task
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        return await asyncio.shield(self.start(key, func))
+
+
+def should_refresh_early(
+    expires_at: float, delta: float, *, beta: float = 1.0, now: float | None = None
+) -> bool:
+    """
+    Probabilistic early expiration (XFetch): returns ``True`` more and more often as
+    ``expires_at`` approaches, scaled by ``delta``, the time a recompute takes.
+    """
+    if now is None:
+        now = time.time()
+
+    return now - delta * beta * math.log(1 - random.random()) >= expires_at
+
+
 # Shamelessly robbed from R. Danny
 def finder(
     text: str,
@@ -3,13 +3,15 @@ from __future__ import annotations
 from discord.http import Route
 from typing import TYPE_CHECKING, Literal, TypeAlias, cast
 
-from datetime import datetime
+from datetime import timedelta
 
 from quart import Quart, request
 from quart_cors import cors
 
 from config import client_secret
 from .bot import BoboBot
+from .cache_manager import TwoTierCacheManager
+from .events import EventRates
 
 
 if TYPE_CHECKING:
@@ -51,34 +53,63 @@ async def index():
 
 @app.get('/stats')
 async def stats():
-    async with app.bot.db.acquire() as conn:
-        total_command_uses = await conn.fetchval('SELECT SUM(uses) FROM commands_usage')
-        most_used_command = await conn.fetchval(
-            'SELECT command FROM commands_usage ORDER BY uses DESC LIMIT 1'
-        )
+    analytics = app.bot.command_analytics
 
-    latency = await app.bot.self_test()
+    total_command_uses = await analytics.total_uses()
+    most_used = await analytics.top_commands(1)
+    last_hour = await analytics.summary(timedelta(hours=1))
 
-    events = await app.bot.get_cog('Misc').get_event_counts()
+    latency = {
+        name: percentiles._asdict() if percentiles else None
+        for name, percentiles in app.bot.latency_summary().items()
+    }
+
+    events = await app.bot.gateway_events.total()
+    event_rates = (await app.bot.gateway_events.rates()).get('*', EventRates(0, 0, 0))
 
-    time_difference = (
-        float(datetime.now().timestamp())
-        - float(await app.bot.redis.get('events_start_time'))
-    ) / 60
+    counts = await app.bot.get_counts()
 
     return {
-        'Servers': len(app.bot.guilds),
-        'Users': len(app.bot.users),
-        'Channels': len(list(app.bot.get_all_channels())),
+        'Servers': counts['guilds'],
+        'Users': counts['users'],
+        'Channels': counts['channels'],
         'Commands': len(list(app.bot.walk_commands())),
-        'Total Command Uses': int(total_command_uses),
-        'Most Used Command': most_used_command,
-        'Postgres Latency': f'{latency.postgres} ms',
-        'Redis Latency': f'{latency.redis} ms',
-        'Discord REST Latency': f'{latency.discord_rest} ms',
-        'Discord WebSocket Latency': f'{latency.discord_ws} ms',
+        'Total Command Uses': total_command_uses + app.bot.command_usage.pending_total,
+        'Most Used Command': most_used[0][0] if most_used else None,
+        'Command Uses in the Last Hour': last_hour.uses,
+        'Command Error Rate': f'{last_hour.error_rate:.2%}',
+        'Average Command Latency': (
+            f'{last_hour.average_latency:.2f} ms'
+            if last_hour.average_latency is not None
+            else None
+        ),
+        'Postgres Latency (ms)': latency['postgres'],
+        'Redis Latency (ms)': latency['redis'],
+        'Discord REST Latency (ms)': latency['discord_rest'],
+        'Discord WebSocket Latency (ms)': latency['discord_ws'],
         'Total Gateway Events': f'{events:,}',
-        'Average Events per minute': f'{events // time_difference}',
+        'Events per Second (1m)': round(event_rates.one_minute, 2),
+        'Events per Second (5m)': round(event_rates.five_minutes, 2),
+        'Events per Second (1h)': round(event_rates.one_hour, 2),
+        'Events per Minute (1h)': await app.bot.gateway_events.series(),
+    }
+
+@app.get('/metrics')
+async def metrics():
+    return {
+        'caches': {
+            type(cache).__name__: {
+                **cache.stats.to_dict(),
+                'bytes': cache.size,
+            }
+            for cache in TwoTierCacheManager.instances
+        },
+        'getch': app.bot.object_cache.to_dict(),
+        'ratelimit': dict(app.bot.ratelimiter.stats),
+        'edits': dict(getattr(app.bot.get_cog('Listeners'), 'edit_stats', {})),
+        'chunking': app.bot.chunker.progress(),
+        'member_cache': app.bot.chunker.member_cache(),
+        'extension_load_times': app.bot.extension_load_times,
     }
 
 @app.post('/exchange-code')
@@ -1,9 +1,32 @@
 if __name__ == '__main__':
-    import uvloop
+    import argparse
 
-    uvloop.install()
-    del uvloop
+    parser = argparse.ArgumentParser()
+    parser.add_argument('mode', nargs='?', default='dev')
+    parser.add_argument(
+        '--clusters',
+        type=int,
+        default=0,
+        help='Run as this many processes, each with a range of shards.',
+    )
+    parser.add_argument(
+        '--shards',
+        type=int,
+        default=None,
+        help='Total shard count in cluster mode, defaults to the recommended count.',
+    )
+    args = parser.parse_args()
 
-    from core import BoboBot
+    if args.clusters:
+        from core.cluster import launch_clusters
 
-    BoboBot().run()
+        launch_clusters(args.mode, args.clusters, args.shards)
+    else:
+        import uvloop
+
+        uvloop.install()
+        del uvloop
+
+        from core import BoboBot
+
+        BoboBot().run(args.mode)
@@ -21,3 +21,36 @@ CREATE TABLE IF NOT EXISTS reaction_roles (
     emoji TEXT NOT NULL,
     PRIMARY KEY (message_id, guild_id, role_id)
 );
+
+CREATE TABLE IF NOT EXISTS guild_prefixes (
+    guild_id BIGINT NOT NULL,
+    prefix TEXT NOT NULL,
+    PRIMARY KEY (guild_id, prefix)
+);
+
+CREATE INDEX IF NOT EXISTS idx_commands_usage_uses ON commands_usage(uses DESC);
+
+-- SUM(commands_usage.uses) as a single row, updated with every usage flush.
+CREATE TABLE IF NOT EXISTS commands_usage_total (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    uses BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO commands_usage_total (uses)
+SELECT COALESCE(SUM(uses), 0) FROM commands_usage
+ON CONFLICT (id) DO NOTHING;
+
+-- Per-minute usage, rolled up into hours after a day and into days after 30 days.
+CREATE TABLE IF NOT EXISTS command_usage_buckets (
+    resolution TEXT NOT NULL,
+    bucket TIMESTAMPTZ NOT NULL,
+    command TEXT NOT NULL,
+    guild_id BIGINT NOT NULL DEFAULT 0,
+    successes BIGINT NOT NULL DEFAULT 0,
+    failures BIGINT NOT NULL DEFAULT 0,
+    total_latency DOUBLE PRECISION NOT NULL DEFAULT 0,
+    max_latency DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (resolution, bucket, command, guild_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_command_usage_buckets_bucket ON command_usage_buckets(bucket);
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import sys
+import types
+from typing import Any
+
+import discord
+from discord.ext import commands
+
+# config.py holds secrets and is not checked in, the tests only need its names.
+try:
+    import config  # noqa: F401
+except ImportError:
+    config = types.ModuleType('config')
+    config.token = config.prod_token = config.client_secret = config.cdn_authorization = ''
+    config.DbConnectionDetails = type(
+        'DbConnectionDetails', (), {'host': '', 'user': '', 'password': '', 'database': ''}
+    )
+    config.LavalinkConnectionDetails = type(
+        'LavalinkConnectionDetails', (), {'host': '', 'port': 0, 'password': ''}
+    )
+    config.Emojis = type('Emojis', (), {'Trash': ''})
+    sys.modules['config'] = config
+
+
+BOT_ID = 808485782067216434
+
+
+def make_bot(**options: Any) -> commands.Bot:
+    """
+    A bot that is never connected, with a user so get_context works.
+    """
+    bot = commands.Bot(command_prefix='bobo ', intents=discord.Intents.none(), **options)
+
+    state = bot._connection
+    state.user = discord.ClientUser(
+        state=state,
+        data={'id': BOT_ID, 'username': 'Bobo', 'discriminator': '0', 'avatar': None},
+    )
+
+    return bot
+
+
+def make_message(
+    bot: commands.Bot, content: str, *, message_id: int = 1, author_id: int = 1, guild_id: int = 1
+) -> discord.Message:
+    state = bot._connection
+    guild = discord.Guild(data={'id': guild_id, 'name': 'Guild'}, state=state)
+    channel = discord.TextChannel(
+        state=state,
+        guild=guild,
+        data={'id': guild_id, 'name': 'general', 'type': 0, 'position': 0},
+    )
+
+    return discord.Message(
+        state=state,
+        channel=channel,
+        data={
+            'id': message_id,
+            'channel_id': channel.id,
+            'author': {'id': author_id, 'username': 'User', 'discriminator': '0', 'avatar': None},
+            'content': content,
+            'timestamp': '2024-01-01T00:00:00+00:00',
+            'edited_timestamp': None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': [],
+            'pinned': False,
+            'type': 0,
+        },
+    )
@@ -0,0 +1,4 @@
+var searchIndex = new Map(JSON.parse('[["std",{"t":"TTTNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNCNNNNNNNNNNNNNNNNNNNNNNNNNNNANNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNQQNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNBNNNNNNNNNNNNNNNNNNNNNNNNECCFNNNNNNNNN","n":["BITS","MAX","MIN","abs_diff","add","","","","add_assign","","as_ascii","as_ascii_unchecked","backward","backward_checked","backward_unchecked","bit_width","bitand","","","","bitand_assign","","bitor","","","","","bitor_assign","","bitxor","","","","bitxor_assign","","borrow","borrow_mut","borrowing_sub","carrying_add","carrying_mul","carrying_mul_add","","cast_signed","checked_add","checked_add_signed","checked_div","checked_div_euclid","checked_exact_div","checked_ilog","checked_ilog10","checked_ilog2","checked_mul","checked_neg","checked_next_multiple_of","checked_next_power_of_two","checked_pow","checked_rem","checked_rem_euclid","checked_shl","checked_shr","checked_signed_diff","checked_sub","checked_sub_signed","clone","clone_to_uninit","cmp","collections","count_ones","count_zeros","default","disjoint_bitor","div","","","","","div_assign","","","div_ceil","div_euclid","div_floor","eq","eq_ignore_ascii_case","escape_ascii","exact_div","fmt","","","","","","","","fn","format_into","forward","forward_checked","forward_unchecked","from","","","","from_ascii","from_ascii_radix","from_be","from_be_bytes","from_le","from_le_bytes","from_ne_bytes","from_str","from_str_radix","ge","gt","hash","hash_slice","ilog","ilog10","ilog2","into","is_ascii","is_ascii_alphabetic","is_ascii_alphanumeric","is_ascii_control","is_ascii_digit","is_ascii_graphic","is_ascii_hexdigit","is_ascii_lowercase","is_ascii_octdigit","is_ascii_punctuation","is_ascii_uppercase","is_ascii_whitespace","is_multiple_of","is_power_of_two","isolate_least_significant_one","isolate_most_significant_one","isqrt","le","leading_ones","leading_zeros","lt","make_ascii_lowercase","make_ascii_uppercase","max_value","midpoint","min_value","mul","","","","mul_assign","","ne","next_multiple_of","next_power_of_two","not","","overflowing_add","overflowing_add_signed","overflowing_div","overflowing_div_euclid","overflowing_mul","overflowing_neg","overflowing_pow","overflowing_rem","overflowing_rem_euclid","overflowing_shl","overflowing_shr","overflowing_sub","overflowing_sub_signed","partial_cmp","pow","print","println","product","","rem","","","","","rem_assign","","","rem_euclid","reverse_bits","rotate_left","rotate_right","saturating_add","saturating_add_signed","saturating_div","saturating_mul","saturating_pow","saturating_sub","saturating_sub_signed","shl","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","shl_assign","","","","","","","","","","","","","","","","","","","","","","","","shr","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","","shr_assign","","","","","","","","","","","","","","","","","","","","","","","","steps_between","strict_add","strict_add_signed","strict_div","strict_div_euclid","strict_mul","strict_neg","strict_pow","strict_rem","strict_rem_euclid","strict_shl","strict_shr","strict_sub","strict_sub_signed","sub","","","","sub_assign","","sub_one","sum","","swap_bytes","to_ascii_lowercase","to_ascii_uppercase","to_be","to_be_bytes","to_le","to_le_bytes","to_ne_bytes","trailing_ones","trailing_zeros","try_from","","","","","","","","","","","","","try_into","type_id","u8","unbounded_shl","unbounded_shr","unchecked_add","unchecked_disjoint_bitor","unchecked_exact_div","unchecked_mul","unchecked_shl","unchecked_shr","unchecked_sub","widening_mul","wrapping_add","wrapping_add_signed","wrapping_div","wrapping_div_euclid","wrapping_mul","wrapping_neg","wrapping_next_power_of_two","wrapping_pow","wrapping_rem","wrapping_rem_euclid","wrapping_shl","wrapping_shr","wrapping_sub","wrapping_sub_signed","HashMap","hash","map","HashMap","borrow","borrow_mut","from","insert","into","remove","try_from","try_into","type_id"],"q":[[0,"std"],[412,"std::collections"],[414,"std::collections::hash"],[415,"std::collections::hash::map"],[425,"core::ascii::ascii_char"],[426,"core::option"],[427,"core::num::nonzero"],[428,"core::cmp"],[429,"core::ascii"],[430,"core::fmt"],[431,"core::result"],[432,"core::fmt::num_buffer"],[433,"core::num::error"],[434,"core::hash"],[435,"core::iter::traits::iterator"],[436,"core::any"]],"i":"Dj00000000000000000000000000000000000000000000000000000000000000000`000000000000000000000000000`00000000000000000000000000000000000000000000000000000000000000000000000000000``000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000`000000000000000000000000````Dh00000000","f":"```{{bb}b}0{{{d{b}}{d{b}}}}{{b{d{b}}}}{{{d{b}}b}}{{{d{fb}}b}h}{{{d{fb}}{d{b}}}h}{{{d{b}}}{{l{j}}}}{{{d{b}}}j}{{bn}b}{{bn}{{l{b}}}}1{bA`}7:98569{{{Ab{c}}}{}{}}98;678;9:67{d{{d{c}}}{}}{{{d{f}}}{{d{fc}}}{}}{{bbAd}{{Af{bAd}}}}0{{bbb}{{Af{bb}}}}{{bbbb}{{Af{bb}}}}0{bAh}{{bb}{{l{b}}}}{{bAh}{{l{b}}}}111{{bb}{{l{A`}}}}{b{{l{A`}}}}03{b{{l{b}}}}40{{bA`}{{l{b}}}}5500{{bb}{{l{Ah}}}}65{{{d{b}}}b}{{db}h}{{{d{b}}{d{b}}}Aj}`{bA`}0{{}b}{{bb}b}{{b{Ab{b}}}b}{{b{d{b}}}}2{{{d{b}}b}}{{{d{b}}{d{b}}}}{{{d{fb}}{d{b}}}h}{{{d{fb}}b}h}{{{d{fb}}{Ab{b}}}h}777{{{d{b}}{d{b}}}Ad}0{bAl}9{{{d{b}}{d{fAn}}}{{Bb{hB`}}}}0000000`{{b{d{f{Bd{b}}}}}{{d{Bf}}}}{{bn}b}{{bn}{{l{b}}}}1{jb}{cc{}}{{{Ab{c}}}c{}}{Adb}{{{d{{Bh{b}}}}}{{Bb{bBj}}}}{{{d{{Bh{b}}}}A`}{{Bb{bBj}}}}{bb}{{{Bl{b}}}b}100{{{d{Bf}}}{{Bb{bBj}}}}{{{d{Bf}}A`}{{Bb{bBj}}}}??{{{d{b}}{d{fc}}}hBn}{{{d{{Bh{b}}}}{d{fc}}}hBn}{{bb}A`}{bA`}0{{}c{}}{{{d{b}}}Ad}00000000000{{bb}Ad}{bAd};;;{{{d{b}}{d{b}}}Ad}550{{{d{fb}}}h}0{{}b}{{bb}b}1{{b{d{b}}}}1{{{d{b}}b}}{{{d{b}}{d{b}}}}{{{d{fb}}b}h}{{{d{fb}}{d{b}}}h}85{bb}{{{d{b}}}}1{{bb}{{Af{bAd}}}}{{bAh}{{Af{bAd}}}}111{b{{Af{bAd}}}}{{bA`}{{Af{bAd}}}}330032{{{d{b}}{d{b}}}{{l{Aj}}}}{{bA`}b}``{cb{{Cb{}{{C`{b}}}}}}{cb{{Cb{}{{C`{{d{b}}}}}}}}{{b{Ab{b}}}b}=?>{{bb}b}<{{{d{fb}}{Ab{b}}}h}>1<551{{bAh}b}22620{{b{d{Cd}}}}{{b{d{Cf}}}}{{{d{b}}b}}{{b{d{b}}}}{{{d{b}}{d{Ah}}}}{{bCd}b}{{{d{b}}{d{A`}}}}{{b{d{Ah}}}}{{{d{b}}Ah}}{{{d{b}}{d{b}}}}{{bCh}b}{{{d{b}}Cd}}{{{d{b}}Ch}}{{b{d{Ch}}}}{{{d{b}}{d{Ch}}}}{{bA`}b}{{bAh}b}{{{d{b}}{d{n}}}}{{b{d{n}}}}{{{d{b}}n}}{{bn}b}{{{d{b}}{d{Cj}}}}{{b{d{Cj}}}}{{{d{b}}Cj}}{{bCj}b}{{{d{b}}{d{Cl}}}}{{b{d{Cl}}}}{{{d{b}}Cl}}{{bCl}b}{{{d{b}}{d{Cn}}}}{{b{d{Cn}}}}{{{d{b}}Cn}}{{bCn}b}{{{d{b}}{d{D`}}}}{{b{d{D`}}}}{{{d{b}}D`}}{{bD`}b}{{bb}b}{{b{d{Db}}}}{{{d{b}}Db}}{{bDb}b}{{{d{b}}{d{Cd}}}}{{b{d{A`}}}}{{{d{b}}{d{Cf}}}}{{bCf}b}{{{d{b}}A`}}{{{d{b}}Cf}}{{{d{b}}{d{Db}}}}{{{d{fb}}{d{D`}}}h}{{{d{fb}}{d{Ah}}}h}{{{d{fb}}b}h}{{{d{fb}}{d{b}}}h}{{{d{fb}}Ch}h}{{{d{fb}}{d{Ch}}}h}{{{d{fb}}A`}h}{{{d{fb}}{d{A`}}}h}{{{d{fb}}{d{Cl}}}h}{{{d{fb}}{d{Cd}}}h}{{{d{fb}}{d{Cn}}}h}{{{d{fb}}Cn}h}{{{d{fb}}Cd}h}{{{d{fb}}D`}h}{{{d{fb}}{d{Db}}}h}{{{d{fb}}Db}h}{{{d{fb}}Cf}h}{{{d{fb}}{d{Cf}}}h}{{{d{fb}}Cj}h}{{{d{fb}}{d{Cj}}}h}{{{d{fb}}n}h}{{{d{fb}}{d{n}}}h}{{{d{fb}}Ah}h}{{{d{fb}}Cl}h}{{{d{b}}n}}{{b{d{Ch}}}}{{b{d{Ah}}}}{{{d{b}}Ah}}{{b{d{Cd}}}}{{{d{b}}{d{Ah}}}}{{bCd}b}{{{d{b}}{d{n}}}}{{b{d{n}}}}{{{d{b}}{d{Cd}}}}{{bn}b}{{{d{b}}{d{Cj}}}}{{b{d{Cj}}}}{{bDb}b}{{{d{b}}Cj}}{{bCj}b}{{{d{b}}{d{Cf}}}}{{{d{b}}Db}}{{b{d{Db}}}}{{b{d{Cf}}}}{{{d{b}}{d{Db}}}}{{bD`}b}{{{d{b}}Cf}}{{{d{b}}D`}}{{bCf}b}{{b{d{D`}}}}{{{d{b}}{d{D`}}}}{{{d{b}}{d{A`}}}}{{bCn}b}{{{d{b}}Cn}}{{b{d{Cn}}}}{{{d{b}}{d{Cn}}}}{{bCl}b}{{{d{b}}Cl}}{{b{d{Cl}}}}{{{d{b}}Cd}}{{{d{b}}{d{Cl}}}}{{bb}b}{{{d{b}}b}}{{b{d{b}}}}{{b{d{A`}}}}{{{d{b}}{d{b}}}}{{{d{b}}A`}}{{bCh}b}{{{d{b}}Ch}}{{bA`}b}{{{d{b}}{d{Ch}}}}{{bAh}b}{{{d{fb}}b}h}{{{d{fb}}D`}h}{{{d{fb}}{d{Cf}}}h}{{{d{fb}}Cj}h}{{{d{fb}}{d{Cl}}}h}{{{d{fb}}{d{Cj}}}h}{{{d{fb}}{d{A`}}}h}{{{d{fb}}A`}h}{{{d{fb}}{d{Ch}}}h}{{{d{fb}}n}h}{{{d{fb}}Ch}h}{{{d{fb}}{d{b}}}h}{{{d{fb}}Cl}h}{{{d{fb}}Cf}h}{{{d{fb}}{d{Cn}}}h}{{{d{fb}}Ah}h}{{{d{fb}}Cn}h}{{{d{fb}}{d{Ah}}}h}{{{d{fb}}Cd}h}{{{d{fb}}{d{D`}}}h}{{{d{fb}}{d{Cd}}}h}{{{d{fb}}Db}h}{{{d{fb}}{d{Db}}}h}{{{d{fb}}{d{n}}}h}{{{d{b}}{d{b}}}{{Af{n{l{n}}}}}}{{bb}b}{{bAh}b}111{bb}{{bA`}b}330032{{b{d{b}}}}{{{d{b}}b}}5{{{d{b}}{d{b}}}}{{{d{fb}}b}h}{{{d{fb}}{d{b}}}h}6{cb{{Cb{}{{C`{{d{b}}}}}}}}{cb{{Cb{}{{C`{b}}}}}}8{{{d{b}}}b}09{b{{Bl{b}}}}:00{bA`}0{n{{Bb{b}}}}{Cj{{Bb{b}}}}{A`{{Bb{b}}}}{Cf{{Bb{b}}}}{Ah{{Bb{b}}}}{Cl{{Bb{b}}}}{c{{Bb{e}}}{}{}}{Cn{{Bb{b}}}}{Cd{{Bb{b}}}}{Db{{Bb{b}}}}{D`{{Bb{b}}}}{Dd{{Bb{b}}}}{Ch{{Bb{b}}}}{{}{{Bb{c}}}{}}{dDf}`{{bA`}b}0{{bb}b}000110{{bb}{{Af{bb}}}}1{{bAh}b}222{bb}04334431````{d{{d{c}}}{}}{{{d{f}}}{{d{fc}}}{}}{cc{}}{{{d{fDh}}}h}{{}c{}}1{c{{Bb{e}}}{}{}}<;","D":"AFj","p":[[1,"u8"],[1,"reference",null,null,1],[0,"mut"],[1,"unit"],[6,"AsciiChar",425],[6,"Option",426,null,1],[1,"usize"],[1,"u32"],[5,"NonZero",427],[1,"bool"],[1,"tuple",null,null,1],[1,"i8"],[6,"Ordering",428],[5,"EscapeDefault",429],[5,"Formatter",430],[5,"Error",430],[6,"Result",431,null,1],[5,"NumBuffer",432],[1,"str"],[1,"slice"],[5,"ParseIntError",433],[1,"array"],[10,"Hasher",434],[17,"Item"],[10,"Iterator",435],[1,"i16"],[1,"u64"],[1,"u16"],[1,"u128"],[1,"isize"],[1,"i128"],[1,"i64"],[1,"i32"],[1,"char"],[5,"TypeId",436],[5,"HashMap",415],[1,"u8",0]],"r":[[412,415]],"b":[[4,"impl-Add-for-u8"],[5,"impl-Add%3C%26u8%3E-for-%26u8"],[6,"impl-Add%3C%26u8%3E-for-u8"],[7,"impl-Add%3Cu8%3E-for-%26u8"],[8,"impl-AddAssign-for-u8"],[9,"impl-AddAssign%3C%26u8%3E-for-u8"],[16,"impl-BitAnd%3Cu8%3E-for-%26u8"],[17,"impl-BitAnd-for-u8"],[18,"impl-BitAnd%3C%26u8%3E-for-%26u8"],[19,"impl-BitAnd%3C%26u8%3E-for-u8"],[20,"impl-BitAndAssign%3C%26u8%3E-for-u8"],[21,"impl-BitAndAssign-for-u8"],[22,"impl-BitOr%3C%26u8%3E-for-%26u8"],[24,"impl-BitOr%3C%26u8%3E-for-u8"],[25,"impl-BitOr%3Cu8%3E-for-%26u8"],[26,"impl-BitOr-for-u8"],[27,"impl-BitOrAssign%3C%26u8%3E-for-u8"],[28,"impl-BitOrAssign-for-u8"],[29,"impl-BitXor%3Cu8%3E-for-%26u8"],[30,"impl-BitXor-for-u8"],[31,"impl-BitXor%3C%26u8%3E-for-u8"],[32,"impl-BitXor%3C%26u8%3E-for-%26u8"],[33,"impl-BitXorAssign%3C%26u8%3E-for-u8"],[34,"impl-BitXorAssign-for-u8"],[40,"impl-u8"],[41,"impl-CarryingMulAdd-for-u8"],[71,"impl-Div%3CNonZero%3Cu8%3E%3E-for-u8"],[72,"impl-Div%3C%26u8%3E-for-u8"],[73,"impl-Div-for-u8"],[74,"impl-Div%3Cu8%3E-for-%26u8"],[75,"impl-Div%3C%26u8%3E-for-%26u8"],[76,"impl-DivAssign%3C%26u8%3E-for-u8"],[77,"impl-DivAssign-for-u8"],[78,"impl-DivAssign%3CNonZero%3Cu8%3E%3E-for-u8"],[86,"impl-UpperHex-for-u8"],[87,"impl-LowerHex-for-u8"],[88,"impl-Debug-for-u8"],[89,"impl-Octal-for-u8"],[90,"impl-Binary-for-u8"],[91,"impl-UpperExp-for-u8"],[92,"impl-Display-for-u8"],[93,"impl-LowerExp-for-u8"],[99,"impl-From%3CChar%3E-for-u8"],[102,"impl-From%3Cbool%3E-for-u8"],[146,"impl-Mul%3C%26u8%3E-for-u8"],[147,"impl-Mul-for-u8"],[148,"impl-Mul%3Cu8%3E-for-%26u8"],[149,"impl-Mul%3C%26u8%3E-for-%26u8"],[150,"impl-MulAssign-for-u8"],[151,"impl-MulAssign%3C%26u8%3E-for-u8"],[155,"impl-Not-for-%26u8"],[156,"impl-Not-for-u8"],[174,"impl-Product-for-u8"],[175,"impl-Product%3C%26u8%3E-for-u8"],[176,"impl-Rem%3CNonZero%3Cu8%3E%3E-for-u8"],[177,"impl-Rem%3C%26u8%3E-for-%26u8"],[178,"impl-Rem%3C%26u8%3E-for-u8"],[179,"impl-Rem%3Cu8%3E-for-%26u8"],[180,"impl-Rem-for-u8"],[181,"impl-RemAssign%3C%26u8%3E-for-u8"],[182,"impl-RemAssign%3CNonZero%3Cu8%3E%3E-for-u8"],[183,"impl-RemAssign-for-u8"],[195,"impl-Shl%3C%26i16%3E-for-u8"],[196,"impl-Shl%3C%26u64%3E-for-u8"],[197,"impl-Shl%3Cu8%3E-for-%26u8"],[198,"impl-Shl%3C%26u8%3E-for-u8"],[199,"impl-Shl%3C%26i8%3E-for-%26u8"],[200,"impl-Shl%3Ci16%3E-for-u8"],[201,"impl-Shl%3C%26u32%3E-for-%26u8"],[202,"impl-Shl%3C%26i8%3E-for-u8"],[203,"impl-Shl%3Ci8%3E-for-%26u8"],[204,"impl-Shl%3C%26u8%3E-for-%26u8"],[205,"impl-Shl%3Cu16%3E-for-u8"],[206,"impl-Shl%3Ci16%3E-for-%26u8"],[207,"impl-Shl%3Cu16%3E-for-%26u8"],[208,"impl-Shl%3C%26u16%3E-for-u8"],[209,"impl-Shl%3C%26u16%3E-for-%26u8"],[210,"impl-Shl%3Cu32%3E-for-u8"],[211,"impl-Shl%3Ci8%3E-for-u8"],[212,"impl-Shl%3C%26usize%3E-for-%26u8"],[213,"impl-Shl%3C%26usize%3E-for-u8"],[214,"impl-Shl%3Cusize%3E-for-%26u8"],[215,"impl-Shl%3Cusize%3E-for-u8"],[216,"impl-Shl%3C%26u128%3E-for-%26u8"],[217,"impl-Shl%3C%26u128%3E-for-u8"],[218,"impl-Shl%3Cu128%3E-for-%26u8"],[219,"impl-Shl%3Cu128%3E-for-u8"],[220,"impl-Shl%3C%26isize%3E-for-%26u8"],[221,"impl-Shl%3C%26isize%3E-for-u8"],[222,"impl-Shl%3Cisize%3E-for-%26u8"],[223,"impl-Shl%3Cisize%3E-for-u8"],[224,"impl-Shl%3C%26i128%3E-for-%26u8"],[225,"impl-Shl%3C%26i128%3E-for-u8"],[226,"impl-Shl%3Ci128%3E-for-%26u8"],[227,"impl-Shl%3Ci128%3E-for-u8"],[228,"impl-Shl%3C%26i64%3E-for-%26u8"],[229,"impl-Shl%3C%26i64%3E-for-u8"],[230,"impl-Shl%3Ci64%3E-for-%26u8"],[231,"impl-Shl%3Ci64%3E-for-u8"],[232,"impl-Shl-for-u8"],[233,"impl-Shl%3C%26i32%3E-for-u8"],[234,"impl-Shl%3Ci32%3E-for-%26u8"],[235,"impl-Shl%3Ci32%3E-for-u8"],[236,"impl-Shl%3C%26i16%3E-for-%26u8"],[237,"impl-Shl%3C%26u32%3E-for-u8"],[238,"impl-Shl%3C%26u64%3E-for-%26u8"],[239,"impl-Shl%3Cu64%3E-for-u8"],[240,"impl-Shl%3Cu32%3E-for-%26u8"],[241,"impl-Shl%3Cu64%3E-for-%26u8"],[242,"impl-Shl%3C%26i32%3E-for-%26u8"],[243,"impl-ShlAssign%3C%26i64%3E-for-u8"],[244,"impl-ShlAssign%3C%26i8%3E-for-u8"],[245,"impl-ShlAssign-for-u8"],[246,"impl-ShlAssign%3C%26u8%3E-for-u8"],[247,"impl-ShlAssign%3Cu16%3E-for-u8"],[248,"impl-ShlAssign%3C%26u16%3E-for-u8"],[249,"impl-ShlAssign%3Cu32%3E-for-u8"],[250,"impl-ShlAssign%3C%26u32%3E-for-u8"],[251,"impl-ShlAssign%3C%26isize%3E-for-u8"],[252,"impl-ShlAssign%3C%26i16%3E-for-u8"],[253,"impl-ShlAssign%3C%26i128%3E-for-u8"],[254,"impl-ShlAssign%3Ci128%3E-for-u8"],[255,"impl-ShlAssign%3Ci16%3E-for-u8"],[256,"impl-ShlAssign%3Ci64%3E-for-u8"],[257,"impl-ShlAssign%3C%26i32%3E-for-u8"],[258,"impl-ShlAssign%3Ci32%3E-for-u8"],[259,"impl-ShlAssign%3Cu64%3E-for-u8"],[260,"impl-ShlAssign%3C%26u64%3E-for-u8"],[261,"impl-ShlAssign%3Cu128%3E-for-u8"],[262,"impl-ShlAssign%3C%26u128%3E-for-u8"],[263,"impl-ShlAssign%3Cusize%3E-for-u8"],[264,"impl-ShlAssign%3C%26usize%3E-for-u8"],[265,"impl-ShlAssign%3Ci8%3E-for-u8"],[266,"impl-ShlAssign%3Cisize%3E-for-u8"],[267,"impl-Shr%3Cusize%3E-for-%26u8"],[268,"impl-Shr%3C%26u16%3E-for-u8"],[269,"impl-Shr%3C%26i8%3E-for-u8"],[270,"impl-Shr%3Ci8%3E-for-%26u8"],[271,"impl-Shr%3C%26i16%3E-for-u8"],[272,"impl-Shr%3C%26i8%3E-for-%26u8"],[273,"impl-Shr%3Ci16%3E-for-u8"],[274,"impl-Shr%3C%26usize%3E-for-%26u8"],[275,"impl-Shr%3C%26usize%3E-for-u8"],[276,"impl-Shr%3C%26i16%3E-for-%26u8"],[277,"impl-Shr%3Cusize%3E-for-u8"],[278,"impl-Shr%3C%26u128%3E-for-%26u8"],[279,"impl-Shr%3C%26u128%3E-for-u8"],[280,"impl-Shr%3Ci32%3E-for-u8"],[281,"impl-Shr%3Cu128%3E-for-%26u8"],[282,"impl-Shr%3Cu128%3E-for-u8"],[283,"impl-Shr%3C%26u64%3E-for-%26u8"],[284,"impl-Shr%3Ci32%3E-for-%26u8"],[285,"impl-Shr%3C%26i32%3E-for-u8"],[286,"impl-Shr%3C%26u64%3E-for-u8"],[287,"impl-Shr%3C%26i32%3E-for-%26u8"],[288,"impl-Shr%3Ci64%3E-for-u8"],[289,"impl-Shr%3Cu64%3E-for-%26u8"],[290,"impl-Shr%3Ci64%3E-for-%26u8"],[291,"impl-Shr%3Cu64%3E-for-u8"],[292,"impl-Shr%3C%26i64%3E-for-u8"],[293,"impl-Shr%3C%26i64%3E-for-%26u8"],[294,"impl-Shr%3C%26u32%3E-for-%26u8"],[295,"impl-Shr%3Ci128%3E-for-u8"],[296,"impl-Shr%3Ci128%3E-for-%26u8"],[297,"impl-Shr%3C%26i128%3E-for-u8"],[298,"impl-Shr%3C%26i128%3E-for-%26u8"],[299,"impl-Shr%3Cisize%3E-for-u8"],[300,"impl-Shr%3Cisize%3E-for-%26u8"],[301,"impl-Shr%3C%26isize%3E-for-u8"],[302,"impl-Shr%3Ci16%3E-for-%26u8"],[303,"impl-Shr%3C%26isize%3E-for-%26u8"],[304,"impl-Shr-for-u8"],[305,"impl-Shr%3Cu8%3E-for-%26u8"],[306,"impl-Shr%3C%26u8%3E-for-u8"],[307,"impl-Shr%3C%26u32%3E-for-u8"],[308,"impl-Shr%3C%26u8%3E-for-%26u8"],[309,"impl-Shr%3Cu32%3E-for-%26u8"],[310,"impl-Shr%3Cu16%3E-for-u8"],[311,"impl-Shr%3Cu16%3E-for-%26u8"],[312,"impl-Shr%3Cu32%3E-for-u8"],[313,"impl-Shr%3C%26u16%3E-for-%26u8"],[314,"impl-Shr%3Ci8%3E-for-u8"],[315,"impl-ShrAssign-for-u8"],[316,"impl-ShrAssign%3Ci64%3E-for-u8"],[317,"impl-ShrAssign%3C%26u64%3E-for-u8"],[318,"impl-ShrAssign%3Cu128%3E-for-u8"],[319,"impl-ShrAssign%3C%26isize%3E-for-u8"],[320,"impl-ShrAssign%3C%26u128%3E-for-u8"],[321,"impl-ShrAssign%3C%26u32%3E-for-u8"],[322,"impl-ShrAssign%3Cu32%3E-for-u8"],[323,"impl-ShrAssign%3C%26u16%3E-for-u8"],[324,"impl-ShrAssign%3Cusize%3E-for-u8"],[325,"impl-ShrAssign%3Cu16%3E-for-u8"],[326,"impl-ShrAssign%3C%26u8%3E-for-u8"],[327,"impl-ShrAssign%3Cisize%3E-for-u8"],[328,"impl-ShrAssign%3Cu64%3E-for-u8"],[329,"impl-ShrAssign%3C%26i128%3E-for-u8"],[330,"impl-ShrAssign%3Ci8%3E-for-u8"],[331,"impl-ShrAssign%3Ci128%3E-for-u8"],[332,"impl-ShrAssign%3C%26i8%3E-for-u8"],[333,"impl-ShrAssign%3Ci16%3E-for-u8"],[334,"impl-ShrAssign%3C%26i64%3E-for-u8"],[335,"impl-ShrAssign%3C%26i16%3E-for-u8"],[336,"impl-ShrAssign%3Ci32%3E-for-u8"],[337,"impl-ShrAssign%3C%26i32%3E-for-u8"],[338,"impl-ShrAssign%3C%26usize%3E-for-u8"],[353,"impl-Sub%3C%26u8%3E-for-u8"],[354,"impl-Sub%3Cu8%3E-for-%26u8"],[355,"impl-Sub-for-u8"],[356,"impl-Sub%3C%26u8%3E-for-%26u8"],[357,"impl-SubAssign-for-u8"],[358,"impl-SubAssign%3C%26u8%3E-for-u8"],[360,"impl-Sum%3C%26u8%3E-for-u8"],[361,"impl-Sum-for-u8"],[372,"impl-TryFrom%3Cusize%3E-for-u8"],[373,"impl-TryFrom%3Cu128%3E-for-u8"],[374,"impl-TryFrom%3Cu32%3E-for-u8"],[375,"impl-TryFrom%3Cu64%3E-for-u8"],[376,"impl-TryFrom%3Ci8%3E-for-u8"],[377,"impl-TryFrom%3Cisize%3E-for-u8"],[379,"impl-TryFrom%3Ci128%3E-for-u8"],[380,"impl-TryFrom%3Ci16%3E-for-u8"],[381,"impl-TryFrom%3Ci32%3E-for-u8"],[382,"impl-TryFrom%3Ci64%3E-for-u8"],[383,"impl-TryFrom%3Cchar%3E-for-u8"],[384,"impl-TryFrom%3Cu16%3E-for-u8"]],"c":"OjAAAAEAAAAAAAEAEAAAAJAAkgA=","e":"OzAAAAEAAPQAGwAFAAUADQACABEAFAAqAAAAQAACAEcAAABJAAUAUwAAAFcABwBhAAMAZgAAAHEAAwCKAAAAjQAAAJMABgCcAAEAqwAAAK8AAQCyAAQAuAAAAMQAkABiAQgAewEAAIIBAQCdAQIAoQEBAKYBAwA=","P":[[23,"T"],[24,""],[35,"T"],[37,""],[100,"T"],[102,""],[114,"H"],[116,""],[119,"U"],[120,""],[174,"I"],[176,""],[360,"I"],[362,""],[378,"U,T"],[379,""],[385,"U"],[386,""],[416,"T"],[419,""],[420,"U"],[421,""],[422,"U,T"],[423,"U"],[424,""]],"a":{"mod":[184],"unchecked_div":[71],"popcnt":[67],"popcount":[67],"modulo":[184],"average_floor":[144],"average":[144]}}]]'));
+if (typeof exports !== 'undefined') exports.searchIndex = searchIndex;
+else if (window.initSearch) window.initSearch(searchIndex);
+//{"start":39,"fragment_lengths":[18238]}
\ No newline at end of file
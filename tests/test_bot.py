@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any
+
+import fakeredis
+import pytest
+
+from core.bot import BoboBot
+from core.cache_manager import DeleteMessageManager
+from core.metrics import LatencyHistogram
+
+EXTENSION = '''
+unloaded = []
+
+
+async def setup(bot):
+    ...
+
+
+async def teardown(bot):
+    unloaded.append(__name__)
+'''
+
+
+def test_unload_all_extensions_only_unloads_loaded_ones(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / 'bobo_test_extension.py').write_text(EXTENSION)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    async def main() -> None:
+        bot = BoboBot()
+
+        await bot.load_extension('bobo_test_extension')
+        module = sys.modules['bobo_test_extension']
+
+        # jishaku and the cogs never loaded.
+        await bot.unload_all_extensions()
+
+        assert module.unloaded == ['bobo_test_extension']
+        assert not bot.extensions
+
+    asyncio.run(main())
+
+
+class Closeable:
+    def __init__(self, closed: list[str], name: str) -> None:
+        self.closed = closed
+        self.name = name
+
+    async def close(self) -> None:
+        self.closed.append(self.name)
+
+
+def test_close_flushes_buffered_deletes_before_redis_closes() -> None:
+    async def main() -> None:
+        bot: Any = BoboBot()
+        closed: list[str] = []
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        lengths = []
+
+        async def close_redis() -> None:
+            lengths.append(await redis.llen('delete_messages:1'))
+            closed.append('redis')
+
+        for name in ('command_usage', 'ratelimiter', 'chunker', 'prefixes', 'db', 'session'):
+            setattr(bot, name, Closeable(closed, name))
+
+        bot.redis = Closeable(closed, 'redis')
+        bot.redis.close = close_redis
+        bot.delete_message_manager = DeleteMessageManager(redis)
+        bot.serves_web = False
+
+        await bot.delete_message_manager.add_message(1, 2)
+        await bot.close()
+
+        assert lengths == [1]
+        assert closed.index('prefixes') < closed.index('redis')
+
+    asyncio.run(main())
+
+
+def test_close_before_setup_hook_ran() -> None:
+    async def main() -> None:
+        bot = BoboBot()
+
+        await bot.close()
+
+        assert bot.is_closed()
+
+    asyncio.run(main())
+
+
+def test_failed_probes_are_recorded_as_the_timeout() -> None:
+    async def main() -> None:
+        bot = BoboBot()
+        bot.latencies = {'redis': LatencyHistogram()}
+
+        async def refused() -> None:
+            raise ConnectionRefusedError()
+
+        assert await bot._probe('redis', refused()) is None
+
+        summary = bot.latencies['redis'].summary()
+        assert summary is not None
+        assert summary.p50 == pytest.approx(bot.PROBE_TIMEOUT * 1000, rel=0.01)
+
+    asyncio.run(main())
+
+
+def test_cluster_closes_before_ipc_is_set_up(monkeypatch: pytest.MonkeyPatch) -> None:
+    from core.cluster import ClusteredBoboBot
+
+    closed = []
+
+    async def close(self: BoboBot) -> None:
+        closed.append(self)
+
+    monkeypatch.setattr(BoboBot, 'close', close)
+
+    bot = ClusteredBoboBot(cluster_id=1, cluster_count=2, shard_ids=[1], shard_count=2)
+
+    assert not bot.primary and not bot.serves_web
+
+    asyncio.run(bot.close())
+
+    assert closed == [bot]
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import fakeredis
+
+from core.cache_manager import DeleteMessageManager, ReactionRoleManager, RTFMCacheManager
+
+
+def make_redis() -> fakeredis.FakeAsyncRedis:
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+def test_load_racing_a_write_does_not_fill_the_local_tier() -> None:
+    async def main() -> None:
+        manager = ReactionRoleManager(make_redis())
+        loading = asyncio.Event()
+        written = asyncio.Event()
+
+        async def stale_load() -> dict[str, int]:
+            loading.set()
+            await written.wait()
+
+            # What Redis returned before the write below.
+            return {}
+
+        task = asyncio.create_task(manager._get_or_load('reaction_roles:1', stale_load))
+        await loading.wait()
+
+        await manager.add(1, 2, '👍')
+        written.set()
+
+        assert await task == {}
+        assert await manager.get_message(1) == {'👍': 2}
+        assert not manager._generations and not manager._loads
+
+    asyncio.run(main())
+
+
+def test_callers_get_copies_of_local_entries() -> None:
+    async def main() -> None:
+        manager = ReactionRoleManager(make_redis())
+        await manager.add(1, 2, '👍')
+
+        (await manager.get_message(1)).clear()
+
+        assert await manager.get_message(1) == {'👍': 2}
+        assert manager.stats.hits == 1
+
+    asyncio.run(main())
+
+
+def test_reply_added_during_a_load_is_not_lost() -> None:
+    async def main() -> None:
+        manager = DeleteMessageManager(make_redis())
+        await manager.redis.lpush('delete_messages:1', 10)
+
+        lrange = manager.redis.lrange
+
+        async def slow_lrange(*args: object) -> list[str]:
+            result = await lrange(*args)
+
+            # A reply is sent while the read is on its way back.
+            await manager.add_message(1, 11)
+
+            return result
+
+        manager.redis.lrange = slow_lrange  # type: ignore
+
+        assert await manager.get_messages(1) == [10]
+
+        manager.redis.lrange = lrange  # type: ignore
+
+        assert await manager.get_messages(1) == [11, 10]
+        await manager.close()
+
+    asyncio.run(main())
+
+
+def test_get_many_drops_loads_that_raced_a_delete() -> None:
+    async def main() -> None:
+        manager = DeleteMessageManager(make_redis())
+        await manager.redis.lpush('delete_messages:1', 10)
+
+        make_pipeline = fakeredis.FakeAsyncRedis.pipeline
+
+        def pipeline(*args: object, **kwargs: object) -> object:
+            pipe = make_pipeline(manager.redis, *args, **kwargs)
+            original = pipe.execute
+
+            async def slow_execute() -> list[object]:
+                result = await original()
+                manager._written('delete_messages:1')
+
+                return result
+
+            pipe.execute = slow_execute  # type: ignore
+
+            return pipe
+
+        manager.redis.pipeline = pipeline  # type: ignore
+
+        assert await manager.get_many([1]) == {1: [10]}
+        assert 'delete_messages:1' not in manager._local
+
+    asyncio.run(main())
+
+
+def test_rtfm_refreshes_keys_close_to_expiring() -> None:
+    async def main() -> None:
+        manager = RTFMCacheManager(make_redis())
+        fetches = 0
+
+        async def fetch() -> dict[str, str]:
+            nonlocal fetches
+            fetches += 1
+
+            return {'str': 'https://docs.python.org/3/library/stdtypes.html#str'}
+
+        manager.refresh_early('python', '', fetch)
+        assert fetches == 0
+
+        await manager.get_or_fetch('python', '', fetch)
+        assert fetches == 1
+
+        manager._expiries['rtfm:python:'] = time.time()
+        manager.refresh_early('python', '', fetch)
+        await asyncio.sleep(0.01)
+
+        assert fetches == 2
+        assert manager._expiries['rtfm:python:'] > time.time()
+
+    asyncio.run(main())
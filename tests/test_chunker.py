@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import discord
+import pytest
+
+import config
+from conftest import BOT_ID, make_bot
+from core.bot import BoboBot
+from core.chunker import GuildChunker
+
+
+def member(user_id: int) -> dict[str, Any]:
+    return {
+        'user': {'id': user_id, 'username': f'user{user_id}', 'discriminator': '0', 'avatar': None},
+        'roles': [],
+        'joined_at': '2024-01-01T00:00:00+00:00',
+        'deaf': False,
+        'mute': False,
+        'flags': 0,
+    }
+
+
+class Guild(discord.Guild):
+    __slots__ = ('member_ids',)
+
+    async def chunk(self, *, cache: bool = True) -> list[discord.Member]:  # type: ignore
+        for user_id in self.member_ids:
+            self._add_member(discord.Member(data=member(user_id), guild=self, state=self._state))
+
+        return self.members
+
+
+def make_guild(bot: Any, guild_id: int, member_ids: list[int]) -> Guild:
+    guild = Guild(
+        data={'id': guild_id, 'name': 'Guild', 'member_count': len(member_ids) + 1},
+        state=bot._connection,
+    )
+    guild.member_ids = member_ids
+
+    return guild
+
+
+def make_chunker(bot: Any, *guilds: discord.Guild) -> GuildChunker:
+    by_id = {guild.id: guild for guild in guilds}
+
+    return GuildChunker(SimpleNamespace(get_guild=by_id.get, user=bot.user, guilds=guilds))  # type: ignore
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(GuildChunker, 'REQUESTS_PER_MINUTE', 60_000)
+
+
+def test_drifting_member_count_does_not_chunk_again() -> None:
+    async def main() -> None:
+        bot = make_bot()
+        # One member, the bot, is never in the chunk, so Guild.chunked stays false.
+        guild = make_guild(bot, 1, [2, 3])
+        chunker = make_chunker(bot, guild)
+
+        await chunker.ensure(guild)
+        await chunker.ensure(guild)
+
+        assert not guild.chunked
+        assert chunker.is_chunked(guild)
+        assert chunker.total == 1
+
+        await chunker.close()
+
+    asyncio.run(main())
+
+
+def test_eviction_keeps_the_bot_and_chunks_again(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(GuildChunker, 'MAX_GUILDS', 1)
+
+    async def main() -> None:
+        bot = make_bot()
+        first = make_guild(bot, 1, [BOT_ID, 2])
+        second = make_guild(bot, 2, [BOT_ID, 3])
+        chunker = make_chunker(bot, first, second)
+
+        await chunker.ensure(first)
+        await chunker.ensure(second)
+
+        assert [m.id for m in first.members] == [BOT_ID]
+        assert not chunker.is_chunked(first)
+        assert chunker.evicted == 1
+
+        await chunker.ensure(first)
+        assert sorted(m.id for m in first.members) == [2, BOT_ID]
+
+        await chunker.close()
+
+    asyncio.run(main())
+
+
+def test_lazy_chunking_needs_joined(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(BoboBot, 'LAZY_CHUNKING', True)
+    monkeypatch.setattr(config, 'member_cache_flags', {'joined': False, 'voice': True}, raising=False)
+
+    with pytest.raises(RuntimeError):
+        BoboBot()
+
+    monkeypatch.setattr(config, 'member_cache_flags', {'joined': True}, raising=False)
+    BoboBot()
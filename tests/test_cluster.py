@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import fakeredis
+
+from core.cluster import ClusterIPC
+
+
+def test_failed_answers_do_not_wait_for_the_timeout() -> None:
+    async def main() -> None:
+        server = fakeredis.FakeServer()
+        clusters = [
+            ClusterIPC(fakeredis.FakeAsyncRedis(server=server, decode_responses=True), i, 2)
+            for i in range(2)
+        ]
+
+        async def counts() -> dict[str, int]:
+            return {'guilds': 1}
+
+        async def broken() -> dict[str, int]:
+            raise RuntimeError('not ready')
+
+        clusters[0].add_handler('counts', counts)
+        clusters[1].add_handler('counts', broken)
+
+        for cluster in clusters:
+            await cluster.start()
+
+        start = time.perf_counter()
+        responses = await clusters[0].request('counts', timeout=5)
+
+        assert responses == {0: {'guilds': 1}}
+        assert time.perf_counter() - start < 1
+
+        for cluster in clusters:
+            await cluster.close()
+
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import discord
+from discord.ext import commands
+
+from conftest import make_bot, make_message
+from core.command import command, needs_members
+
+
+class FakeChunker:
+    def __init__(self) -> None:
+        self.ensured: list[int] = []
+
+    async def ensure(self, guild: discord.Guild) -> None:
+        self.ensured.append(guild.id)
+
+
+class Members(commands.Cog):
+    @command()
+    @needs_members()
+    async def members(self, ctx: commands.Context[Any]) -> None:
+        ...
+
+
+def test_needs_members_chunks_when_the_command_runs_not_when_checked() -> None:
+    async def main() -> None:
+        bot: Any = make_bot()
+        bot.chunker = FakeChunker()
+        await bot.add_cog(Members())
+
+        ctx = await bot.get_context(make_message(bot, 'bobo members', guild_id=5))
+        members = bot.get_command('members')
+
+        # What help does for every command it lists.
+        assert await members.can_run(ctx)
+        assert bot.chunker.ensured == []
+
+        await members.invoke(ctx)
+        assert bot.chunker.ensured == [5]
+
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+
+import fakeredis
+
+from core.events import GatewayEventStats
+
+
+def test_a_flush_before_the_seed_keeps_the_history() -> None:
+    async def main() -> None:
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        stats = GatewayEventStats(redis)
+
+        # Counted before events:total existed.
+        await redis.hset('events', mapping={'MESSAGE_CREATE': 100, 'TYPING_START': 20})
+
+        # Another cluster flushes before this one seeded the total.
+        async with redis.pipeline() as pipe:
+            stats.add_to(pipe, Counter({'MESSAGE_CREATE': 5}))
+            await pipe.execute()
+
+        await stats.ensure_total()
+
+        assert await stats.total() == 125
+
+        async with redis.pipeline() as pipe:
+            stats.add_to(pipe, Counter({'TYPING_START': 3}))
+            await pipe.execute()
+
+        assert await stats.total() == 128
+
+    asyncio.run(main())
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+import fakeredis
+import pytest
+from discord.ext import commands
+
+from conftest import make_bot, make_message
+from core.bot import BoboBot
+from core.context import BoboContext
+from core.prefixes import PrefixManager
+from core.ratelimit import RateLimiter, RedisMaxConcurrency
+
+
+def run(test: Callable[[RateLimiter], Awaitable[Any]]) -> Any:
+    async def main() -> Any:
+        return await test(RateLimiter(fakeredis.FakeAsyncRedis(decode_responses=True)))
+
+    return asyncio.run(main())
+
+
+def make_command(limiter: RateLimiter, number: int = 2) -> tuple[commands.Bot, commands.Command]:
+    bot = make_bot()
+
+    @bot.command()
+    async def ping(ctx: commands.Context[Any]) -> None:
+        ...
+
+    ping._max_concurrency = RedisMaxConcurrency(
+        number, per=commands.BucketType.user, wait=False, limiter=limiter, name='ping'
+    )
+
+    return bot, ping
+
+
+def test_prepare_acquires_with_context() -> None:
+    async def test(limiter: RateLimiter) -> None:
+        bot, ping = make_command(limiter)
+        ctx = await bot.get_context(make_message(bot, 'bobo ping'))
+
+        await ping.prepare(ctx)
+
+        assert await limiter.redis.zcard('concurrency:ping:1') == 1
+
+        # What discord.py releases with once the command is done.
+        await ping._max_concurrency.release(ctx.message)
+        await limiter.close()
+
+        assert await limiter.redis.zcard('concurrency:ping:1') == 0
+        assert not limiter._held
+
+    run(test)
+
+
+def test_prepare_releases_with_context_on_failure() -> None:
+    async def test(limiter: RateLimiter) -> None:
+        bot, ping = make_command(limiter)
+
+        @ping.before_invoke
+        async def fail(ctx: commands.Context[Any]) -> None:
+            raise commands.CheckFailure()
+
+        ctx = await bot.get_context(make_message(bot, 'bobo ping'))
+
+        with pytest.raises(commands.CheckFailure):
+            await ping.prepare(ctx)
+
+        await limiter.close()
+
+        assert await limiter.redis.zcard('concurrency:ping:1') == 0
+        assert not limiter._held
+
+    run(test)
+
+
+def test_same_message_runs_hold_separate_slots() -> None:
+    async def test(limiter: RateLimiter) -> None:
+        bot, ping = make_command(limiter)
+        message = make_message(bot, 'bobo ping')
+
+        # An edit re-run while the original run is still going.
+        first = await bot.get_context(message)
+        second = await bot.get_context(message)
+
+        await ping.prepare(first)
+        await ping.prepare(second)
+
+        with pytest.raises(commands.MaxConcurrencyReached):
+            await ping.prepare(await bot.get_context(message))
+
+        await ping._max_concurrency.release(message)
+        await ping._max_concurrency.release(message)
+        await limiter.close()
+
+        assert not limiter._held
+        assert await limiter.redis.zcard('concurrency:ping:1') == 0
+
+        await ping.prepare(await bot.get_context(message))
+
+    run(test)
+
+
+def test_duplicate_holder_is_not_counted_twice() -> None:
+    async def test(limiter: RateLimiter) -> None:
+        assert await limiter.acquire('key', 2, 'holder')
+
+        # Forget the local copy, so the second acquire goes to Redis.
+        limiter._semaphores.clear()
+
+        assert not await limiter.acquire('key', 2, 'holder')
+        assert limiter._held['concurrency:key'] == 1
+
+        await limiter.release('key', 'holder')
+        await limiter.close()
+
+        assert not limiter._held
+        assert await limiter.redis.zcard('concurrency:key') == 0
+
+    run(test)
+
+
+def test_cooldown_is_decided_locally_after_the_first_hit() -> None:
+    async def test(limiter: RateLimiter) -> None:
+        assert await limiter.hit('key', 1, 0.1) is None
+        assert limiter.stats['redis'] == 1
+
+        retry_after = await limiter.hit('key', 1, 0.1)
+        assert retry_after is not None and 0 < retry_after <= 0.1
+
+        await asyncio.sleep(0.1)
+
+        assert await limiter.hit('key', 1, 0.1) is None
+        await limiter.close()
+
+        assert limiter.stats['redis'] == 1
+        assert limiter.stats['local'] == 1
+        assert limiter.stats['local_rejected'] == 1
+        # The local use was written to Redis in the background.
+        assert float(await limiter.redis.hget('cooldown:key', 'tokens')) < 1
+
+    run(test)
+
+
+def test_changes_from_other_processes_drop_the_local_copy() -> None:
+    async def main() -> None:
+        server = fakeredis.FakeServer()
+        first = RateLimiter(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+        second = RateLimiter(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+
+        await first.start()
+        await second.start()
+
+        assert await first.hit('key', 1, 0.2) is None
+        assert await second.hit('key', 1, 0.2) is not None
+
+        await asyncio.sleep(0.2)
+
+        # Refilled, second decides locally and publishes the change.
+        assert await second.hit('key', 1, 0.2) is None
+        await asyncio.sleep(0.05)
+
+        assert 'cooldown:key' not in first._buckets
+        assert await first.hit('key', 1, 0.2) is not None
+        assert first.stats['redis'] == 2
+
+        await first.close()
+        await second.close()
+
+    asyncio.run(main())
+
+
+def test_concurrency_is_decided_locally_and_written_behind() -> None:
+    async def test(limiter: RateLimiter) -> None:
+        assert await limiter.acquire('key', 2, 'a')
+        assert await limiter.acquire('key', 2, 'b')
+        assert not await limiter.acquire('key', 2, 'c')
+
+        await limiter.release('key', 'b')
+        await limiter.release('key', 'a')
+        await limiter.close()
+
+        assert limiter.stats['redis'] == 1
+        assert not limiter._held
+        assert await limiter.redis.zcard('concurrency:key') == 0
+
+    run(test)
+
+
+def test_cooldown_runs_after_argument_parsing() -> None:
+    async def test(limiter: RateLimiter) -> None:
+        bot: Any = BoboBot()
+        bot._connection.user = make_bot()._connection.user
+        bot.context = BoboContext
+        bot.prefixes = PrefixManager(None, None)  # type: ignore
+        bot.ratelimiter = limiter
+        bot.before_invoke(bot.check_cooldown)
+
+        @commands.command()
+        async def echo(ctx: commands.Context[Any], number: int) -> None:
+            ...
+
+        bot.add_command(echo)
+
+        async def prepare(content: str) -> None:
+            await echo.prepare(await bot.get_context(make_message(bot, content)))
+
+        with pytest.raises(commands.BadArgument):
+            await prepare('bobo echo one')
+
+        # The bad argument did not use up the cooldown.
+        await prepare('bobo echo 1')
+
+        with pytest.raises(commands.CommandOnCooldown):
+            await prepare('bobo echo 2')
+
+        await limiter.close()
+
+        # Failing on cooldown released max concurrency.
+        assert limiter._held == {'concurrency:echo:1': 1}
+
+    run(test)
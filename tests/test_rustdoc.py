@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from core.rustdoc import (
+    ITEM_TYPES,
+    RustdocClient,
+    RustdocIndex,
+    UnsupportedRustdocFormat,
+)
+
+ROOT_URL = 'https://doc.rust-lang.org/'
+# Generated by rustdoc 1.90 from a small crate named std, see the test names for what is in it.
+FIXTURE = Path(__file__).parent / 'fixtures' / 'search-index.js'
+
+
+@pytest.fixture(scope='module')
+def index() -> RustdocIndex:
+    return RustdocIndex.from_search_index_js(FIXTURE.read_text(), ROOT_URL)
+
+
+def first_url(index: RustdocIndex, query: str) -> str:
+    return index.search(query, preferred_crate='std')[0][1]
+
+
+def test_item_types_match_rustdoc() -> None:
+    assert ITEM_TYPES[:3] == ('keyword', 'primitive', 'mod')
+    assert ITEM_TYPES.index('macro') == 16
+
+
+def test_struct_url(index: RustdocIndex) -> None:
+    assert first_url(index, 'HashMap') == (
+        ROOT_URL + 'std/collections/hash/map/struct.HashMap.html'
+    )
+
+
+def test_macro_url(index: RustdocIndex) -> None:
+    assert first_url(index, 'println') == ROOT_URL + 'std/macro.println.html'
+
+
+def test_primitive_and_keyword_urls(index: RustdocIndex) -> None:
+    assert first_url(index, 'u8') == ROOT_URL + 'std/primitive.u8.html'
+    assert first_url(index, 'fn') == ROOT_URL + 'std/keyword.fn.html'
+
+
+def test_method_url(index: RustdocIndex) -> None:
+    assert index.search('HashMap::insert')[0] == (
+        'std::collections::hash::map::HashMap::insert',
+        ROOT_URL + 'std/collections/hash/map/struct.HashMap.html#method.insert',
+    )
+
+
+def test_repeated_names_are_kept_once(index: RustdocIndex) -> None:
+    # u8 implements Shl for every integer type, each impl repeats the name as ''.
+    assert sum(item.name == 'shl' for item in index.items) > 1
+
+    results = index.search('shl')
+
+    assert results[0] == ('std::u8::shl', ROOT_URL + 'std/primitive.u8.html#method.shl')
+    assert len(results) == len(set(results))
+
+
+def test_descriptions_come_from_the_empty_bitmap(index: RustdocIndex) -> None:
+    by_name = {item.name: item for item in index.items if item.parent == (5, 'HashMap')}
+
+    assert by_name['insert'].has_desc
+    assert not by_name['remove'].has_desc
+
+
+class FakeResponse:
+    def __init__(self, url: str, status: int, body: str) -> None:
+        self.url = url
+        self.status = status
+        self.body = body
+
+    async def __aenter__(self) -> FakeResponse:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        ...
+
+    async def text(self) -> str:
+        return self.body
+
+    def raise_for_status(self) -> None:
+        assert self.status == 200
+
+
+class FakeSession:
+    def __init__(self, pages: dict[str, str]) -> None:
+        self.pages = pages
+        self.requests: list[str] = []
+
+    def get(self, url: str) -> FakeResponse:
+        self.requests.append(url)
+
+        if url in self.pages:
+            return FakeResponse(url, 200, self.pages[url])
+
+        return FakeResponse(url, 404, '')
+
+
+def doc_page(**variables: str) -> str:
+    attributes = ' '.join(f'data-{key}="{value}"' for key, value in variables.items())
+
+    return f'<div id="rustdoc-vars" {attributes}></div>'
+
+
+def test_client_finds_the_index_from_the_resource_suffix() -> None:
+    session = FakeSession(
+        {
+            ROOT_URL + 'std/': doc_page(**{'root-path': '../', 'resource-suffix': '1.90.0'}),
+            ROOT_URL + 'search-index1.90.0.js': FIXTURE.read_text(),
+        }
+    )
+    client = RustdocClient(session)  # type: ignore
+
+    async def main() -> None:
+        results = await client.search(ROOT_URL + 'std/', 'println')
+        assert results and results[0][1] == ROOT_URL + 'std/macro.println.html'
+
+        # Served from the results cache.
+        assert await client.search(ROOT_URL + 'std/', 'println') == results
+        assert session.requests.count(ROOT_URL + 'search-index1.90.0.js') == 1
+
+    asyncio.run(main())
+
+
+def test_client_rejects_the_split_index() -> None:
+    session = FakeSession(
+        {
+            ROOT_URL + 'std/': doc_page(
+                **{'root-path': '../', 'resource-suffix': '1.92.0', 'stringdex-js': 'x.js'}
+            )
+        }
+    )
+    client = RustdocClient(session)  # type: ignore
+
+    with pytest.raises(UnsupportedRustdocFormat):
+        asyncio.run(client.search(ROOT_URL + 'std/', 'println'))
+
+
+def test_client_treats_a_missing_index_as_unsupported() -> None:
+    session = FakeSession({ROOT_URL + 'std/': doc_page(**{'root-path': '../'})})
+    client = RustdocClient(session)  # type: ignore
+
+    with pytest.raises(UnsupportedRustdocFormat):
+        asyncio.run(client.search(ROOT_URL + 'std/', 'println'))
+
+    assert session.requests[-1] == ROOT_URL + 'search-index.js'